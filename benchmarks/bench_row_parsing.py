@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+原始数据表行解析基准测试
+
+对比两种把查询行转换为期刊信息对象的方式：
+1. SELECT * + 每行 dict(zip(列名, 行)) + 按列映射取值构造 dataclass（原始实现）
+2. 按列映射生成 SELECT 列表 + 每表编译一次的行转换函数，按位置构造 JournalInfo 元组
+
+分别统计耗时与 tracemalloc 记录的内存分配（分配块数、峰值字节数、结果占用字节数）。
+"""
+import argparse
+import sqlite3
+import statistics
+import time
+import tracemalloc
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Union
+
+from jcr_mcp.catalog import SchemaCatalog
+from jcr_mcp.config import get_database_path
+
+
+@dataclass
+class LegacyJournalInfo:
+    """原始实现中的期刊信息 dataclass（仅用于对比）"""
+    journal_name: str
+    impact_factor: Optional[Union[float, str]] = None
+    partition: Optional[str] = None
+    category: Optional[str] = None
+    warning_status: Optional[str] = None
+    ccf_level: Optional[str] = None
+    year: Optional[str] = None
+    journal_id: Optional[int] = None
+
+
+def parse_dict(conn, schemas):
+    """原始实现：SELECT * 后逐行构建字典再取值"""
+    results = []
+    for schema in schemas:
+        cursor = conn.execute(f'SELECT * FROM "{schema.name}"')
+        column_names = [description[0] for description in cursor.description]
+        mapping = schema.mapping
+        for row in cursor.fetchall():
+            row_dict = dict(zip(column_names, row))
+            results.append(LegacyJournalInfo(
+                journal_name=row_dict.get(mapping['journal_name'], ''),
+                impact_factor=row_dict.get(mapping.get('impact_factor')),
+                partition=row_dict.get(mapping.get('partition')),
+                category=row_dict.get(mapping.get('category')),
+                warning_status=row_dict.get(mapping.get('warning_status')),
+                ccf_level=row_dict.get(mapping.get('ccf_level')),
+                year=str(schema.year),
+            ))
+    return results
+
+
+def parse_positional(conn, schemas):
+    """当前实现：只读取需要的列，按位置构造 JournalInfo"""
+    results = []
+    for schema in schemas:
+        cursor = conn.execute(f'SELECT {schema.select_list()} FROM "{schema.name}"')
+        results.extend(map(schema.row_mapper(), cursor.fetchall()))
+    return results
+
+
+def measure(func, conn, schemas, repeat):
+    """返回 (每次耗时列表ms, 分配块数, 峰值字节数, 结果占用字节数, 行数)"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(conn, schemas)
+        timings.append((time.perf_counter() - start) * 1000)
+
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    tracemalloc.reset_peak()
+    results = func(conn, schemas)
+    _, peak = tracemalloc.get_traced_memory()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    stats = after.compare_to(before, "filename")
+    blocks = sum(stat.count_diff for stat in stats)
+    retained = sum(stat.size_diff for stat in stats)
+    return timings, blocks, peak, retained, len(results)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="原始数据表行解析基准测试")
+    parser.add_argument("--db", default=get_database_path(), help="数据库文件路径")
+    parser.add_argument("--repeat", type=int, default=10, help="计时重复次数")
+    args = parser.parse_args()
+
+    conn = sqlite3.connect(Path(args.db).resolve().as_uri() + "?mode=ro", uri=True)
+    schemas = SchemaCatalog.load(conn).journal_tables()
+
+    print(f"📊 数据库: {args.db}")
+    print(f"📋 数据表数: {len(schemas)}")
+    print(f"\n{'解析方式':<16} {'行数':>8} {'平均(ms)':>10} {'p50(ms)':>10} "
+          f"{'分配块数':>10} {'峰值(KiB)':>10} {'结果(KiB)':>10}")
+    print("-" * 82)
+
+    results = {}
+    for label, func in [("字典+dataclass", parse_dict), ("按位置元组", parse_positional)]:
+        timings, blocks, peak, retained, rows = measure(func, conn, schemas, args.repeat)
+        results[label] = (statistics.mean(timings), blocks, peak, retained)
+        print(f"{label:<16} {rows:>8} {results[label][0]:>10.3f} {statistics.median(timings):>10.3f} "
+              f"{blocks:>10} {peak / 1024:>10.1f} {retained / 1024:>10.1f}")
+
+    old, new = results["字典+dataclass"], results["按位置元组"]
+    print(f"\n⚡ 解析加速: {old[0] / new[0]:.1f}x")
+    print(f"🧮 峰值内存减少: {(1 - new[2] / old[2]) * 100:.0f}%，"
+          f"结果占用减少: {(1 - new[3] / old[3]) * 100:.0f}%")
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+期刊名称子串搜索基准测试
+
+对比三种查询路径在完整 ShowJCR 数据集上的耗时：
+1. 逐表 LIKE 扫描（原始实现）
+2. journal_records 统一表上的 LIKE 扫描
+3. journal_records_fts 三元组全文索引
+"""
+import argparse
+import sqlite3
+import statistics
+import time
+from pathlib import Path
+
+from jcr_mcp.catalog import FTS_TABLE, RECORDS_TABLE, SchemaCatalog
+from jcr_mcp.config import get_database_path
+from jcr_mcp.normalize import normalize_name
+
+
+DEFAULT_QUERIES = [
+    "Nature",
+    "Science",
+    "Cell",
+    "Journal of Chemical Physics",
+    "IEEE Transactions",
+    "Lancet",
+    "Materials",
+    "Physical Review",
+]
+
+
+def bench(func, queries, repeat):
+    """多次运行查询函数，返回每次调用的耗时（毫秒）"""
+    timings = []
+    for _ in range(repeat):
+        for query in queries:
+            start = time.perf_counter()
+            func(query)
+            timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="期刊名称子串搜索基准测试")
+    parser.add_argument("--db", default=get_database_path(), help="数据库文件路径")
+    parser.add_argument("--repeat", type=int, default=20, help="每个查询的重复次数")
+    parser.add_argument("queries", nargs="*", help="查询词（默认使用内置列表）")
+    args = parser.parse_args()
+
+    queries = args.queries or DEFAULT_QUERIES
+    conn = sqlite3.connect(Path(args.db).resolve().as_uri() + "?mode=ro", uri=True)
+    catalog = SchemaCatalog.load(conn)
+
+    if not catalog.has_fts:
+        print("❌ 数据库中没有FTS5索引，请先运行 jcr-mcp-sync 重建统一索引表")
+        return
+
+    def per_table_like(query):
+        rows = []
+        for schema in catalog.journal_tables():
+            rows += conn.execute(
+                f'SELECT * FROM "{schema.name}" WHERE Journal LIKE ? COLLATE NOCASE',
+                (f"%{query}%",),
+            ).fetchall()
+        return rows
+
+    def records_like(query):
+        return conn.execute(
+            f"SELECT * FROM {RECORDS_TABLE} WHERE normalized_name LIKE ?",
+            (f"%{normalize_name(query)}%",),
+        ).fetchall()
+
+    def records_fts(query):
+        return conn.execute(
+            f"SELECT * FROM {RECORDS_TABLE} WHERE rowid IN "
+            f"(SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH ?)",
+            ('"' + normalize_name(query).replace('"', '""') + '"',),
+        ).fetchall()
+
+    # 校验两条统一表路径返回相同的行数
+    for query in queries:
+        like_count, fts_count = len(records_like(query)), len(records_fts(query))
+        if like_count != fts_count:
+            print(f"⚠️ 结果不一致: {query!r} LIKE={like_count} FTS={fts_count}")
+
+    print(f"📊 数据库: {args.db}")
+    print(f"🔍 查询数: {len(queries)} × {args.repeat}")
+    print(f"\n{'查询路径':<20} {'平均(ms)':>10} {'p50(ms)':>10} {'p99(ms)':>10}")
+    print("-" * 54)
+
+    results = {}
+    for label, func in [
+        ("逐表LIKE扫描", per_table_like),
+        ("统一表LIKE扫描", records_like),
+        ("FTS5三元组索引", records_fts),
+    ]:
+        timings = sorted(bench(func, queries, args.repeat))
+        results[label] = statistics.mean(timings)
+        p99 = timings[min(len(timings) - 1, int(len(timings) * 0.99))]
+        print(f"{label:<20} {results[label]:>10.3f} {statistics.median(timings):>10.3f} {p99:>10.3f}")
+
+    baseline = results["逐表LIKE扫描"]
+    print(f"\n⚡ FTS5 相对逐表扫描加速: {baseline / results['FTS5三元组索引']:.1f}x")
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+多进程HTTP服务负载测试
+
+依次以不同的工作进程数启动 streamable-http 服务器（jcr-mcp-server --workers N），
+用多个客户端进程在固定时长内持续调用同一个工具，统计吞吐量与延迟，
+观察吞吐量随工作进程数的变化。
+
+客户端与服务器运行在同一台机器上，会争用CPU；工作进程数超过CPU核数后吞吐量不再增长。
+"""
+import argparse
+import http.client
+import json
+import multiprocessing
+import os
+import shutil
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from jcr_mcp.config import get_database_path
+
+
+DEFAULT_QUERIES = ["Nature", "Science", "Cell", "IEEE Transactions", "Lancet", "Physical Review"]
+
+HEADERS = {
+    "Content-Type": "application/json",
+    "Accept": "application/json, text/event-stream",
+}
+
+
+def _post(conn, payload, session_id=None):
+    """发送一条 JSON-RPC 消息，返回 (响应头中的会话ID, 响应消息)"""
+    headers = dict(HEADERS)
+    if session_id:
+        headers["Mcp-Session-Id"] = session_id
+    conn.request("POST", "/mcp", body=json.dumps(payload), headers=headers)
+    response = conn.getresponse()
+    body = response.read().decode("utf-8")
+    if response.status >= 400:
+        raise RuntimeError(f"HTTP {response.status}: {body[:200]}")
+
+    message = None
+    if body.lstrip().startswith("{"):
+        message = json.loads(body)
+    else:
+        # text/event-stream：取最后一个 data 行
+        for line in body.splitlines():
+            if line.startswith("data:"):
+                message = json.loads(line[5:])
+    return response.getheader("mcp-session-id") or session_id, message
+
+
+def client_loop(port, tool, queries, duration, start_at, results):
+    """客户端进程：建立MCP会话后在 duration 秒内循环调用工具"""
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+    session_id, _ = _post(conn, {
+        "jsonrpc": "2.0", "id": 0, "method": "initialize",
+        "params": {
+            "protocolVersion": "2025-03-26", "capabilities": {},
+            "clientInfo": {"name": "bench_workers", "version": "1.0"},
+        },
+    })
+    _post(conn, {"jsonrpc": "2.0", "method": "notifications/initialized"}, session_id)
+
+    while time.time() < start_at:
+        time.sleep(0.01)
+
+    latencies, errors, request_id = [], 0, 1
+    deadline = start_at + duration
+    while time.time() < deadline:
+        query = queries[request_id % len(queries)]
+        start = time.perf_counter()
+        try:
+            _, message = _post(conn, {
+                "jsonrpc": "2.0", "id": request_id, "method": "tools/call",
+                "params": {"name": tool, "arguments": {"journal_name": query}},
+            }, session_id)
+            if not message or "error" in message:
+                errors += 1
+            else:
+                latencies.append((time.perf_counter() - start) * 1000)
+        except (OSError, http.client.HTTPException, RuntimeError):
+            errors += 1
+            conn.close()
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+        request_id += 1
+    results.put((latencies, errors))
+
+
+def wait_for_port(port, timeout=30.0):
+    """等待服务器开始监听"""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.5):
+                return True
+        except OSError:
+            time.sleep(0.2)
+    return False
+
+
+def run_level(workers, args, env):
+    """以指定工作进程数启动服务器并施加负载，返回 (吞吐量, 延迟列表, 错误数)"""
+    server = subprocess.Popen(
+        [sys.executable, "-m", "jcr_mcp", "streamable-http", "--workers", str(workers)],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        if not wait_for_port(args.port):
+            raise RuntimeError("服务器启动超时")
+
+        # 预热：每个工作进程首次查询时才建立数据库连接和表结构目录
+        results = multiprocessing.Queue()
+        client_loop(args.port, args.tool, args.queries, 1.0, time.time(), results)
+        results.get()
+
+        start_at = time.time() + 1.0
+        clients = [
+            multiprocessing.Process(
+                target=client_loop,
+                args=(args.port, args.tool, args.queries, args.duration, start_at, results),
+            )
+            for _ in range(args.clients)
+        ]
+        for client in clients:
+            client.start()
+        collected = [results.get() for _ in clients]
+        for client in clients:
+            client.join()
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+    latencies = sorted(x for batch, _ in collected for x in batch)
+    errors = sum(count for _, count in collected)
+    return len(latencies) / args.duration, latencies, errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description="多进程HTTP服务负载测试")
+    parser.add_argument("--db", default=get_database_path(), help="数据库文件路径")
+    parser.add_argument("--workers", default="1,2,4", help="依次测试的工作进程数（逗号分隔）")
+    parser.add_argument("--clients", type=int, default=16, help="并发客户端进程数")
+    parser.add_argument("--duration", type=float, default=10.0, help="每轮负载持续时间（秒）")
+    parser.add_argument("--port", type=int, default=18080, help="测试服务器端口")
+    parser.add_argument("--tool", default="search_journal", help="调用的工具名称")
+    parser.add_argument("queries", nargs="*", help="查询词（默认使用内置列表）")
+    args = parser.parse_args()
+    args.queries = args.queries or DEFAULT_QUERIES
+
+    # 服务器从 ~/.jcr_mcp/jcr.db 读取数据，用临时 HOME 指向待测数据库
+    home = tempfile.mkdtemp(prefix="jcr_bench_")
+    data_dir = Path(home) / ".jcr_mcp"
+    data_dir.mkdir()
+    os.symlink(Path(args.db).resolve(), data_dir / "jcr.db")
+    env = dict(os.environ, HOME=home, JCR_MCP_HOST="127.0.0.1", JCR_MCP_PORT=str(args.port))
+
+    print(f"📊 数据库: {args.db}")
+    print(f"🖥️ CPU核数: {os.cpu_count()}，客户端进程: {args.clients}，每轮 {args.duration:.0f} 秒")
+    print(f"\n{'工作进程':>8} {'吞吐(req/s)':>12} {'p50(ms)':>10} {'p99(ms)':>10} {'错误':>6} {'加速':>6}")
+    print("-" * 58)
+
+    baseline = None
+    try:
+        for workers in [int(x) for x in args.workers.split(",") if x.strip()]:
+            throughput, latencies, errors = run_level(workers, args, env)
+            baseline = baseline or throughput
+            p50 = statistics.median(latencies) if latencies else 0.0
+            p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] if latencies else 0.0
+            print(f"{workers:>8} {throughput:>12.1f} {p50:>10.2f} {p99:>10.2f} {errors:>6} "
+                  f"{throughput / baseline if baseline else 0:>5.1f}x")
+    finally:
+        shutil.rmtree(home, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
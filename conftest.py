@@ -0,0 +1,69 @@
+"""
+测试公共夹具：在临时目录中写入少量原始数据表并构建统一表
+
+JCR 分区存为 "Q1"，中科院分区表存为 "1 [3/45]" 与 "1区" 两种格式，
+用于验证依赖同步时解析的类型化列的查询。
+"""
+import sqlite3
+
+import pytest
+
+from jcr_mcp.database import JCRDatabase
+from jcr_mcp.sync import DataSyncer
+
+
+RAW_TABLES = {
+    "JCR2023": (
+        ("Journal", "IF", "Quartile", "Category", "ISSN"),
+        [
+            ("Alpha Journal", 10.0, "Q2", "COMPUTER SCIENCE", "1111-1111"),
+            ("Beta Letters", 3.5, "Q2", "COMPUTER SCIENCE", "2222-2222"),
+        ],
+    ),
+    "JCR2024": (
+        ("Journal", "IF", "Quartile", "Category", "ISSN"),
+        [
+            ("Alpha Journal", 12.5, "Q1", "COMPUTER SCIENCE", "1111-1111"),
+            ("Alpha Journal", 12.5, "Q3", "MATHEMATICS", "1111-1111"),
+            ("Beta Letters", 3.2, "Q2", "COMPUTER SCIENCE", "2222-2222"),
+            ("Gamma Reviews", "<0.1", "Q4", "CHEMISTRY", "3333-3333"),
+            ("Omega CS", 6.0, "Q1", "ENGINEERING", "4444-4444"),
+        ],
+    ),
+    "FQBJCR2025": (
+        ("Journal", "大类分区", "学科", "Top"),
+        [
+            ("Alpha Journal", "1 [3/45]", "计算机科学", "是"),
+            ("Beta Letters", "2 [10/45]", "计算机科学", "否"),
+            ("Delta Acta", "1区", "物理与天体物理", "否"),
+            ("Omega CS", "2 [20/45]", "计算机科学", "否"),
+        ],
+    ),
+    "GJQKYJMD2024": (
+        ("Journal", "预警等级", "预警原因"),
+        [("Gamma Reviews", "高", "论文工厂")],
+    ),
+}
+
+
+@pytest.fixture(scope="module")
+def db_path(tmp_path_factory):
+    """写入原始数据表并构建统一表，返回数据库路径"""
+    path = str(tmp_path_factory.mktemp("jcr") / "jcr.db")
+    syncer = DataSyncer(path)
+    syncer.create_database_tables()
+    with sqlite3.connect(path) as conn:
+        for table, (columns, rows) in RAW_TABLES.items():
+            column_list = ", ".join(f'"{column}"' for column in columns)
+            conn.execute(f'CREATE TABLE "{table}" ({column_list})')
+            conn.executemany(f'INSERT INTO "{table}" VALUES ({", ".join("?" for _ in columns)})', rows)
+    syncer.build_journal_records()
+    return path
+
+
+@pytest.fixture(scope="module")
+def database(db_path):
+    """已同步的临时数据库（不缓存查询结果）"""
+    database = JCRDatabase(db_path, cache_size=0)
+    yield database
+    database.close()
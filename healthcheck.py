@@ -2,15 +2,73 @@
 """
 JCR MCP服务器健康检查脚本
 用于Docker健康检查和监控
+
+用法:
+    python healthcheck.py [ready|live]
+
+    ready（默认）: 读取服务器的就绪探针，数据库可用且已同步数据时通过
+    live: 读取服务器的存活探针，进程在运行即通过
+
+探针由服务器进程内的本地HTTP端点提供（JCR_MCP_PROBE_HOST:JCR_MCP_PROBE_PORT），
+结果在服务器中缓存，本脚本不打开数据库。探针端点被禁用（JCR_MCP_PROBE_PORT=0）时
+回退为直接检查数据库文件。
 """
+import json
+import os
 import sys
 import sqlite3
+import urllib.error
+import urllib.request
 from pathlib import Path
 
 
+PROBE_HOST = os.getenv("JCR_MCP_PROBE_HOST", "127.0.0.1")
+PROBE_PORT = int(os.getenv("JCR_MCP_PROBE_PORT", "8081"))
+PROBE_PATHS = {"ready": "/readyz", "live": "/livez"}
+
+
+def check_probe(mode: str = "ready"):
+    """
+    读取服务器的探针端点
+    
+    Args:
+        mode: ready 或 live
+    
+    Returns:
+        bool: 健康检查是否通过
+    """
+    host = "127.0.0.1" if PROBE_HOST in ("0.0.0.0", "") else PROBE_HOST
+    url = f"http://{host}:{PROBE_PORT}{PROBE_PATHS[mode]}"
+    try:
+        with urllib.request.urlopen(url, timeout=2) as response:
+            report = json.loads(response.read().decode("utf-8"))
+    except urllib.error.HTTPError as e:
+        # 未就绪时探针返回503，响应体中列出原因
+        try:
+            report = json.loads(e.read().decode("utf-8"))
+        except ValueError:
+            report = {}
+        for problem in report.get("problems", [f"HTTP {e.code}"]):
+            print(f"❌ {problem}")
+        return False
+    except Exception as e:
+        print(f"❌ 无法访问探针端点 {url}: {e}")
+        return False
+    
+    if mode == "live":
+        print(f"✅ 服务器进程存活 (pid {report['pid']}, 已运行 {report['uptime_s']} 秒)")
+        return True
+    
+    sources = ", ".join(f"{source} {year}" for source, year in report.get("sources", {}).items())
+    print(f"✅ 服务器已就绪 (数据: {sources or '无'})")
+    if report.get("data_age_days") is not None:
+        print(f"📅 距最后同步 {report['data_age_days']} 天")
+    return True
+
+
 def check_database():
     """
-    检查数据库是否可访问
+    检查数据库是否可访问（探针端点禁用时使用）
     
     健康检查策略:
     - 如果数据库文件不存在: 失败
@@ -53,12 +111,19 @@ def check_database():
 
 def main():
     """主函数"""
+    mode = sys.argv[1] if len(sys.argv) > 1 else "ready"
+    if mode not in PROBE_PATHS:
+        print(f"用法: {sys.argv[0]} [ready|live]")
+        sys.exit(2)
+    
     print("🏥 JCR MCP服务器健康检查")
     
-    # 检查数据库
-    db_ok = check_database()
+    if PROBE_PORT > 0:
+        ok = check_probe(mode)
+    else:
+        ok = check_database()
     
-    if db_ok:
+    if ok:
         print("\n✅ 服务器健康")
         sys.exit(0)
     else:
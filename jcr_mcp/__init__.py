@@ -9,12 +9,13 @@ __version__ = "0.1.0"
 __author__ = "JCR MCP Contributors"
 __license__ = "MIT"
 
-from .database import JCRDatabase, JournalInfo
+from .database import JCRDatabase, JournalInfo, SearchResult
 from .config import get_data_dir, get_database_path
 
 __all__ = [
     "JCRDatabase", 
     "JournalInfo", 
+    "SearchResult",
     "get_data_dir",
     "get_database_path",
     "__version__"
@@ -0,0 +1,141 @@
+"""
+查询结果缓存模块
+
+按 (查询类型, 规范化参数, 年份) 缓存查询结果，按条目数和估算字节数做LRU淘汰，
+并支持可选的TTL。数据代次变化（同步任务重建数据）时整体失效。
+"""
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+
+def estimate_size(value: Any) -> int:
+    """粗略估算缓存值占用的字节数（递归统计容器与对象属性）"""
+    size = sys.getsizeof(value)
+    if isinstance(value, (str, bytes, int, float, type(None))):
+        return size
+    if isinstance(value, dict):
+        return size + sum(estimate_size(k) + estimate_size(v) for k, v in value.items())
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return size + sum(estimate_size(item) for item in value)
+    if hasattr(value, "__dict__"):
+        return size + estimate_size(vars(value))
+    return size
+
+
+class ResultCache:
+    """
+    线程安全的LRU查询结果缓存
+
+    条目数或估算字节数超出上限时淘汰最久未使用的条目；ttl 大于0时条目过期后视为未命中。
+    """
+
+    def __init__(self, max_entries: int = 1024, max_bytes: int = 32 * 1024 * 1024, ttl: float = 0):
+        """
+        初始化缓存
+
+        Args:
+            max_entries: 最多缓存的条目数，为0时禁用缓存
+            max_bytes: 缓存值估算总字节数上限
+            ttl: 条目存活时间（秒），为0时不过期
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+
+        # key -> (value, size, expires_at)
+        self._entries: "OrderedDict[Hashable, Tuple[Any, int, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self.generation: Optional[Tuple] = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    def _check_generation(self, generation: Tuple):
+        """数据代次变化时清空缓存（调用方持有锁）"""
+        if generation != self.generation:
+            if self._entries:
+                self.invalidations += 1
+            self._entries.clear()
+            self._bytes = 0
+            self.generation = generation
+
+    def get(self, key: Hashable, generation: Tuple) -> Tuple[bool, Any]:
+        """
+        查询缓存
+
+        Returns:
+            (是否命中, 缓存值)
+        """
+        if not self.enabled:
+            return False, None
+
+        with self._lock:
+            self._check_generation(generation)
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return False, None
+
+            value, size, expires_at = entry
+            if expires_at and expires_at <= time.monotonic():
+                del self._entries[key]
+                self._bytes -= size
+                self.expirations += 1
+                self.misses += 1
+                return False, None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, value
+
+    def put(self, key: Hashable, value: Any, generation: Tuple):
+        """写入缓存，超过上限时按LRU顺序淘汰"""
+        if not self.enabled:
+            return
+
+        size = estimate_size(value)
+        if size > self.max_bytes:
+            return
+        expires_at = time.monotonic() + self.ttl if self.ttl > 0 else 0.0
+
+        with self._lock:
+            self._check_generation(generation)
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._entries[key] = (value, size, expires_at)
+            self._bytes += size
+
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, (_, evicted_size, _) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self.evictions += 1
+
+    def clear(self):
+        """清空缓存"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        """获取缓存统计信息"""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+            }
@@ -0,0 +1,335 @@
+"""
+数据表结构目录模块
+
+记录每张原始数据表的来源类型、年份及列映射，避免每次查询都读取
+sqlite_master 和 PRAGMA table_info。
+"""
+import re
+import sqlite3
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from .models import JournalInfo
+from .trends import TREND_VERSION
+
+
+# 数据来源类型（按匹配优先级排列，FQBJCR/CCFT 必须先于 JCR/CCF）
+SOURCE_TYPES = ("FQBJCR", "GJQKYJMD", "CCFT", "CCF", "JCR")
+
+_TABLE_NAME_RE = re.compile(r"^(FQBJCR|GJQKYJMD|CCFT|CCF|JCR)(\d{4})$")
+
+# 各来源的字段 -> 候选列名（按优先级排列）
+# 候选名同时匹配带年份后缀的列，如 "IF" 匹配 "IF(2024)"
+COLUMN_CANDIDATES: Dict[str, Dict[str, Tuple[str, ...]]] = {
+    "JCR": {
+        "impact_factor": ("IF", "Impact Factor"),
+        "partition": ("Quartile", "分区", "IF Quartile"),
+        "category": ("Category", "类别"),
+        "issn": ("ISSN",),
+        "eissn": ("eISSN", "EISSN"),
+    },
+    "FQBJCR": {
+        "partition": ("大类分区", "Partition"),
+        "category": ("学科", "Subject", "大类"),
+        "is_top": ("Top", "TOP", "是否Top"),
+        "issn": ("ISSN/EISSN", "ISSN"),
+    },
+    "GJQKYJMD": {
+        "warning_status": ("预警等级", "Warning Level"),
+        "warning_reason": ("预警原因", "Warning Reason"),
+        "issn": ("ISSN",),
+    },
+    "CCF": {
+        "ccf_level": ("CCF推荐类型", "CCF Level"),
+        "category": ("领域", "Field"),
+    },
+    "CCFT": {
+        "ccf_level": ("等级", "分级", "CCF推荐类型", "CCF Level"),
+        "category": ("领域", "Field"),
+    },
+}
+
+JOURNAL_COLUMN = "Journal"
+
+# 原始数据表提供的 JournalInfo 字段（顺序与 JournalInfo 一致）
+INFO_FIELDS = (
+    "journal_name", "impact_factor", "partition", "category", "warning_status", "ccf_level",
+)
+
+# 同步任务生成的统一长表、期刊名称三元组全文索引、ISSN索引表、学科影响因子排名表及期刊趋势文档表
+RECORDS_TABLE = "journal_records"
+FTS_TABLE = "journal_records_fts"
+ISSN_TABLE = "journal_issns"
+RANKINGS_TABLE = "category_rankings"
+TRENDS_TABLE = "journal_trends"
+
+
+def parse_table_name(table_name: str) -> Optional[Tuple[str, int]]:
+    """
+    解析表名中的来源类型和年份
+
+    Args:
+        table_name: 表名，如 "FQBJCR2025"
+
+    Returns:
+        (来源类型, 年份)，无法识别时返回None
+    """
+    match = _TABLE_NAME_RE.match(table_name)
+    if not match:
+        return None
+    return match.group(1), int(match.group(2))
+
+
+def resolve_column(columns: List[str], candidates: Tuple[str, ...]) -> Optional[str]:
+    """按候选列表在实际列名中查找匹配列"""
+    for candidate in candidates:
+        if candidate in columns:
+            return candidate
+    for candidate in candidates:
+        prefix = candidate + "("
+        for column in columns:
+            if column.startswith(prefix):
+                return column
+    return None
+
+
+@dataclass(frozen=True)
+class YearFilter:
+    """
+    年份过滤条件
+
+    支持单个年份（"2024"）、闭区间（"2022-2024"）以及各来源的最新年份（"latest"）。
+    """
+    start: Optional[int] = None
+    end: Optional[int] = None
+    latest: bool = False
+
+    @classmethod
+    def parse(cls, year: Optional[str]) -> Optional["YearFilter"]:
+        """
+        解析年份参数
+
+        Args:
+            year: 年份参数，为空时表示不过滤
+
+        Returns:
+            年份过滤条件，不过滤时返回None
+
+        Raises:
+            ValueError: 年份格式无效
+        """
+        if year is None:
+            return None
+        text = str(year).strip().lower()
+        if not text:
+            return None
+        if text == "latest":
+            return cls(latest=True)
+
+        match = re.match(r"^(\d{4})(?:\s*[-~至]\s*(\d{4}))?$", text)
+        if not match:
+            raise ValueError(f"无效的年份 '{year}'，应为如 2024、2022-2024 或 latest")
+        start = int(match.group(1))
+        end = int(match.group(2) or start)
+        if start > end:
+            start, end = end, start
+        return cls(start=start, end=end)
+
+    def matches(self, source: str, year: int, latest_years: Dict[str, int]) -> bool:
+        """判断某一来源、年份是否满足过滤条件"""
+        if self.latest:
+            return latest_years.get(source) == year
+        return self.start <= year <= self.end
+
+    def sql(self, latest_years: Dict[str, int], prefix: str = "") -> Tuple[str, list]:
+        """
+        构建 journal_records 上的年份过滤条件
+
+        Args:
+            latest_years: 各来源的最新年份
+            prefix: 列名前缀（表别名加 "."，或 "+" 以禁止SQLite为年份条件选用索引）
+        """
+        if not self.latest:
+            return f"{prefix}year BETWEEN ? AND ?", [self.start, self.end]
+        if not latest_years:
+            return "0", []
+        conditions = " OR ".join(f"({prefix}source = ? AND {prefix}year = ?)" for _ in latest_years)
+        params = [value for item in sorted(latest_years.items()) for value in item]
+        return f"({conditions})", params
+
+
+@dataclass
+class TableSchema:
+    """单张原始数据表的结构信息"""
+    name: str
+    source: str
+    year: int
+    columns: Tuple[str, ...]
+    mapping: Dict[str, str] = field(default_factory=dict)
+    _mapper: Optional[Callable[[tuple], JournalInfo]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    def select_list(self, fields: Iterable[str] = INFO_FIELDS) -> str:
+        """按字段顺序构建 SELECT 列表，本表没有的字段取 NULL"""
+        return ", ".join(
+            f'"{self.mapping[name]}"' if name in self.mapping else "NULL" for name in fields
+        )
+
+    def row_mapper(self) -> Callable[[tuple], JournalInfo]:
+        """
+        获取本表的行转换函数（每张表只编译一次）
+
+        配合 select_list() 使用：查询行的前 len(INFO_FIELDS) 列按位置对应 JournalInfo 字段，
+        年份为本表常量，转换时只做一次元组拼接，不构建字典。
+        """
+        if self._mapper is None:
+            width = len(INFO_FIELDS)
+            tail = (str(self.year), None)
+
+            def mapper(row: tuple, _new=tuple.__new__, _cls=JournalInfo) -> JournalInfo:
+                if len(row) != width:
+                    row = row[:width]
+                return _new(_cls, row + tail)
+
+            self._mapper = mapper
+        return self._mapper
+
+
+def read_generation(conn: sqlite3.Connection) -> Tuple:
+    """
+    读取数据库当前的数据代次标识
+
+    由 schema_version 与 sync_metadata 的记录数/最后更新时间组成，
+    同步任务重建任一数据表后都会变化。
+    """
+    schema_version = conn.execute("PRAGMA schema_version").fetchone()[0]
+    try:
+        sync_state = conn.execute(
+            "SELECT COUNT(*), MAX(last_updated) FROM sync_metadata"
+        ).fetchone()
+    except sqlite3.OperationalError:
+        sync_state = (0, None)
+    return (schema_version,) + tuple(sync_state)
+
+
+class SchemaCatalog:
+    """数据表结构目录"""
+
+    def __init__(
+        self,
+        tables: Dict[str, TableSchema],
+        generation: Tuple = (),
+        has_records: bool = False,
+        has_fts: bool = False,
+        has_issn: bool = False,
+        has_rankings: bool = False,
+        has_trends: bool = False,
+        has_typed_columns: bool = False,
+        has_warning_reason: bool = False,
+    ):
+        self.tables = tables
+        self.generation = generation
+        # 是否存在同步任务生成的 journal_records 统一表及其全文索引、ISSN索引、学科排名表、趋势文档表
+        self.has_records = has_records
+        self.has_fts = has_records and has_fts
+        self.has_issn = has_records and has_issn
+        self.has_rankings = has_records and has_rankings
+        self.has_trends = has_records and has_trends
+        # 统一表是否包含同步时解析出的类型化列（if_value、partition_rank、is_top、quartile）
+        self.has_typed_columns = has_records and has_typed_columns
+        # 统一表是否包含预警原因列（warning_reason）
+        self.has_warning_reason = has_records and has_warning_reason
+
+    @classmethod
+    def load(cls, conn: sqlite3.Connection, generation: Tuple = ()) -> "SchemaCatalog":
+        """从数据库读取所有原始数据表的结构"""
+        cursor = conn.cursor()
+        cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
+        table_names = [row[0] for row in cursor.fetchall()]
+
+        tables = {}
+        for table_name in table_names:
+            parsed = parse_table_name(table_name)
+            if parsed is None:
+                continue
+            source, year = parsed
+
+            cursor.execute(f'PRAGMA table_info("{table_name}")')
+            columns = [col[1] for col in cursor.fetchall()]
+            if JOURNAL_COLUMN not in columns:
+                continue
+
+            mapping = {"journal_name": JOURNAL_COLUMN}
+            for field_name, candidates in COLUMN_CANDIDATES[source].items():
+                column = resolve_column(columns, candidates)
+                if column is not None:
+                    mapping[field_name] = column
+
+            tables[table_name] = TableSchema(
+                name=table_name,
+                source=source,
+                year=year,
+                columns=tuple(columns),
+                mapping=mapping,
+            )
+
+        # 趋势文档表由旧版本同步生成（文档格式不同）时视为不存在，查询回退为从原始数据表现场生成
+        has_trends = False
+        if TRENDS_TABLE in table_names:
+            row = cursor.execute(
+                f"SELECT json_extract(document, '$.version') FROM {TRENDS_TABLE} LIMIT 1"
+            ).fetchone()
+            has_trends = row is not None and row[0] == TREND_VERSION
+
+        record_columns = []
+        if RECORDS_TABLE in table_names:
+            cursor.execute(f"PRAGMA table_info({RECORDS_TABLE})")
+            record_columns = [col[1] for col in cursor.fetchall()]
+
+        return cls(
+            tables,
+            generation,
+            has_records=RECORDS_TABLE in table_names,
+            has_fts=FTS_TABLE in table_names,
+            has_issn=ISSN_TABLE in table_names,
+            has_rankings=RANKINGS_TABLE in table_names,
+            has_trends=has_trends,
+            has_typed_columns="if_value" in record_columns,
+            has_warning_reason="warning_reason" in record_columns,
+        )
+
+    def journal_tables(
+        self, source: Optional[str] = None, years: Optional[YearFilter] = None
+    ) -> List[TableSchema]:
+        """
+        获取期刊数据表
+
+        Args:
+            source: 来源类型（可选），如 "GJQKYJMD"
+            years: 年份过滤条件（可选），不满足条件的表被剪枝
+
+        Returns:
+            按表名排序的数据表结构列表
+        """
+        latest_years = self.latest_years() if years is not None and years.latest else {}
+        return [
+            schema for name, schema in sorted(self.tables.items())
+            if (source is None or schema.source == source)
+            and (years is None or years.matches(schema.source, schema.year, latest_years))
+        ]
+
+    def latest_years(self) -> Dict[str, int]:
+        """获取每个来源的最新年份"""
+        latest: Dict[str, int] = {}
+        for schema in self.tables.values():
+            if schema.year > latest.get(schema.source, 0):
+                latest[schema.source] = schema.year
+        return latest
+
+    def years(self, source: str) -> List[int]:
+        """获取某一来源的所有年份（降序）"""
+        return sorted(
+            (schema.year for schema in self.tables.values() if schema.source == source),
+            reverse=True,
+        )
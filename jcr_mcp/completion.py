@@ -0,0 +1,84 @@
+"""
+期刊名称前缀补全模块
+
+每个数据代次构建一次按名称匹配键排序的数组，查询时二分定位前缀区间，
+再按顺序取出前 k 个期刊，附带各期刊最新年份的分区与影响因子。
+"""
+from bisect import bisect_left
+from typing import Dict, Hashable, Iterable, List, Tuple
+
+from .models import Completion, JournalInfo
+from .normalize import name_key
+
+
+class CompletionIndex:
+    """期刊名称前缀补全索引（只读，按数据代次整体替换）"""
+
+    def __init__(self, records: Iterable[Tuple[str, JournalInfo]], generation: Tuple = ()):
+        """
+        构建索引
+
+        Args:
+            records: (名称匹配键, 期刊记录)，须按年份降序排列；
+                     有 journal_id 的记录按 journal_id 归并，否则按名称匹配键归并
+            generation: 数据代次标识
+        """
+        self.generation = generation
+        self.entries: List[Completion] = []
+
+        groups: Dict[Hashable, int] = {}
+        fields: List[list] = []
+        pairs = set()
+        # 记录按年份降序排列，每个字段取到的第一个非空值即最新值
+        for key, info in records:
+            if not key:
+                continue
+            group = info.journal_id if info.journal_id is not None else key
+            entry_id = groups.get(group)
+            if entry_id is None:
+                entry_id = groups[group] = len(fields)
+                fields.append([str(info.journal_name).strip(), None, None, None, None, info.journal_id])
+            entry = fields[entry_id]
+            if entry[1] is None and info.partition not in (None, ""):
+                entry[1], entry[2] = info.partition, info.year
+            if entry[3] is None and info.impact_factor not in (None, ""):
+                entry[3], entry[4] = info.impact_factor, info.year
+            pairs.add((key, entry_id))
+
+        self.entries = [Completion(*entry) for entry in fields]
+        ordered = sorted(pairs)
+        self.keys: List[str] = [key for key, _ in ordered]
+        self.entry_ids: List[int] = [entry_id for _, entry_id in ordered]
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def complete(self, prefix: str, limit: int = 10) -> List[Completion]:
+        """
+        按前缀补全期刊名称
+
+        Args:
+            prefix: 期刊名称开头部分（忽略大小写、标点、"&"/"and" 及开头的 "The"）
+            limit: 最多返回的期刊数
+
+        Returns:
+            补全结果列表，按名称匹配键的字典序排列（完全相同的名称排在最前）
+        """
+        needle = name_key(prefix)
+        if not needle or limit <= 0:
+            return []
+
+        keys, entry_ids = self.keys, self.entry_ids
+        results: List[Completion] = []
+        seen = set()
+        for position in range(bisect_left(keys, needle), len(keys)):
+            if not keys[position].startswith(needle):
+                break
+            entry_id = entry_ids[position]
+            if entry_id in seen:
+                continue
+            seen.add(entry_id)
+            results.append(self.entries[entry_id])
+            if len(results) >= limit:
+                break
+        return results
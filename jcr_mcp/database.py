@@ -1,134 +1,1407 @@
 """
 JCR数据库管理模块
 """
+import json
 import sqlite3
 import os
-from typing import Optional, Dict, List
-from dataclasses import dataclass
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import replace
+from typing import Optional, Dict, List, Iterable, Iterator, Set, Tuple, Union
 
+from .cache import ResultCache
+from .completion import CompletionIndex
 from .config import get_database_path
+from .fuzzy import FuzzyIndex
+from .memory import MemorySnapshot
+from .models import (
+    Completion, DatabaseInfo, JournalInfo, RankedJournal, Ranking, SearchResult, TableInfo, MATCH_EXACT,
+    MATCH_SUBSTRING,
+)
+from .catalog import (
+    FTS_TABLE, INFO_FIELDS, ISSN_TABLE, RANKINGS_TABLE, RECORDS_TABLE, TRENDS_TABLE, SchemaCatalog,
+    TableSchema, YearFilter, read_generation,
+)
+from .normalize import (
+    is_top_partition, match_rank, name_key, normalize_issn, normalize_name, parse_impact_factor,
+    partition_rank, split_issns,
+)
+from .pool import ConnectionPool, PooledConnection
+from .query import NUMERIC_FIELDS, PROBE_RATIO, TEXT_FIELDS, Condition, FilterStats, RowCondition, parse_sort
+from .rankings import CategoryIndex
+from .trends import build_trend
+from .warning_index import WarningIndex
 
 
-@dataclass
-class JournalInfo:
-    """期刊信息数据类"""
-    journal_name: str
-    impact_factor: Optional[float] = None
-    partition: Optional[str] = None
-    category: Optional[str] = None
-    warning_status: Optional[str] = None
-    ccf_level: Optional[str] = None
-    year: Optional[str] = None
+# journal_records 查询列（顺序与 JournalInfo 字段一致，查询行可直接构造 JournalInfo）
+_RECORD_COLUMN_NAMES = (
+    "journal_name", "impact_factor", "partition", "category",
+    "warning", "ccf_level", "year", "journal_id",
+)
+
+
+def _record_columns(alias: str = "") -> str:
+    """构建 journal_records 查询列（可带表别名），年份转为文本与 JournalInfo.year 一致"""
+    prefix = f"{alias}." if alias else ""
+    return ", ".join(
+        f"CAST({prefix}{column} AS TEXT) AS year" if column == "year" else prefix + column
+        for column in _RECORD_COLUMN_NAMES
+    )
+
+
+_RECORD_COLUMNS = _record_columns()
+
+# journal_records 查询行 -> JournalInfo
+_record_to_info = JournalInfo._make
+
+
+def _escape_like(text: str) -> str:
+    """转义LIKE通配符（配合 ESCAPE '\\' 使用）"""
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _like_pattern(text: str) -> str:
+    """构建子串匹配的LIKE模式"""
+    return f"%{_escape_like(text)}%"
+
+
+def _rank_expression(journal_name: str) -> Tuple[str, list]:
+    """构建名称匹配等级表达式：0 完全相同，1 前缀匹配，2 子串匹配"""
+    normalized = normalize_name(journal_name)
+    return (
+        "CASE WHEN normalized_name = ? THEN 0 "
+        "WHEN normalized_name LIKE ? ESCAPE '\\' THEN 1 ELSE 2 END",
+        [normalized, _escape_like(normalized) + "%"],
+    )
+
+
+def _page_bounds(limit: Optional[int], offset: int) -> Tuple[int, int]:
+    """
+    校验分页参数并转换为SQL的 LIMIT/OFFSET（不限制时 LIMIT 为 -1）
+    
+    Raises:
+        ValueError: limit 或 offset 为负数
+    """
+    if offset < 0:
+        raise ValueError(f"无效的 offset {offset}，不能为负数")
+    if limit is None:
+        return -1, offset
+    if limit < 0:
+        raise ValueError(f"无效的 limit {limit}，不能为负数")
+    return limit, offset
+
+
+def _rank_groups(
+    infos: List[JournalInfo], journal_name: str, limit: Optional[int] = None, offset: int = 0
+) -> SearchResult:
+    """
+    对原始数据表的子串匹配结果按期刊名称分组排序并分页（未构建统一表时的兼容路径）
+    
+    排序与统一表一致：匹配等级 > 规范化名称。
+    """
+    needle = normalize_name(journal_name)
+    groups: Dict[str, List[JournalInfo]] = {}
+    for info in infos:
+        groups.setdefault(normalize_name(info.journal_name), []).append(info)
+    
+    ordered = sorted(groups, key=lambda name: (match_rank(name, needle), name))
+    end = None if limit is None else offset + limit
+    journals = [info for name in ordered[offset:end] for info in groups[name]]
+    return SearchResult(journals, MATCH_SUBSTRING, len(groups))
+
+
+def _fts_phrase(text: str) -> str:
+    """构建FTS5短语查询（trigram分词下等价于子串匹配）"""
+    return '"' + text.replace('"', '""') + '"'
+
+
+def _name_condition(catalog: SchemaCatalog, journal_name: str) -> Tuple[str, list]:
+    """
+    构建统一表上的名称子串匹配条件
+    
+    存在FTS5三元组索引且查询不少于3个字符时走全文索引，否则回退到LIKE扫描。
+    """
+    normalized = normalize_name(journal_name)
+    if catalog.has_fts and len(normalized) >= 3:
+        return (
+            f"rowid IN (SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH ?)",
+            [_fts_phrase(normalized)],
+        )
+    return "normalized_name LIKE ? ESCAPE '\\'", [_like_pattern(normalized)]
+
+
+def _year_condition(
+    catalog: SchemaCatalog, years: Optional[YearFilter], prefix: str = ""
+) -> Tuple[str, list]:
+    """构建统一表上的年份过滤条件，不过滤时返回恒真条件"""
+    if years is None:
+        return "1", []
+    return years.sql(catalog.latest_years(), prefix)
+
+
+# 可选的查询引擎
+ENGINE_SQLITE = "sqlite"
+ENGINE_MEMORY = "memory"
+
+# 每个连接的内存映射大小默认值（MiB）：普通模式 / 只读不可变模式
+DEFAULT_MMAP_MB = 256
+IMMUTABLE_MMAP_MB = 1024
 
 
 class JCRDatabase:
     """JCR数据库管理类"""
     
-    def __init__(self, db_path: Optional[str] = None):
+    # 内存引擎检查数据代次的最小间隔（秒），间隔内的查询完全不访问SQLite
+    generation_check_interval = 1.0
+    
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        pool_size: int = 8,
+        engine: Optional[str] = None,
+        cache_size: Optional[int] = None,
+        cache_ttl: Optional[float] = None,
+        immutable: Optional[bool] = None,
+    ):
         """
         初始化数据库连接
         
         Args:
             db_path: 数据库文件路径，如果为None则使用默认路径
+            pool_size: 连接池中保留的空闲只读连接数
+            engine: 查询引擎，"sqlite"（默认）或 "memory"（内存列式快照），
+                为None时读取环境变量 JCR_MCP_ENGINE
+            cache_size: 查询结果缓存的最大条目数（0 表示禁用），
+                为None时读取环境变量 JCR_MCP_CACHE_SIZE（默认1024）
+            cache_ttl: 缓存条目存活时间（秒，0 表示不过期），
+                为None时读取环境变量 JCR_MCP_CACHE_TTL（默认0）
+            immutable: 只读不可变模式（数据库文件在服务期间不会被修改，不加锁、不检查数据更新），
+                为None时读取环境变量 JCR_MCP_IMMUTABLE（默认关闭）
         """
         if db_path is None:
             db_path = get_database_path()
         
+        if engine is None:
+            engine = os.getenv("JCR_MCP_ENGINE", ENGINE_SQLITE)
+        if engine not in (ENGINE_SQLITE, ENGINE_MEMORY):
+            raise ValueError(f"不支持的查询引擎 '{engine}'，可选值: {ENGINE_SQLITE}, {ENGINE_MEMORY}")
+        
+        if immutable is None:
+            immutable = os.getenv("JCR_MCP_IMMUTABLE", "").lower() in ("1", "true", "yes", "on")
+        
         self.db_path = db_path
+        self.engine = engine
+        self.immutable = immutable
+        if cache_size is None:
+            cache_size = int(os.getenv("JCR_MCP_CACHE_SIZE", "1024"))
+        if cache_ttl is None:
+            cache_ttl = float(os.getenv("JCR_MCP_CACHE_TTL", "0"))
+        cache_bytes = int(float(os.getenv("JCR_MCP_CACHE_MB", "32")) * 1024 * 1024)
+        # 查询结果缓存（仅用于 sqlite 引擎，内存引擎本身已在内存中完成查询）
+        self.cache = ResultCache(cache_size, cache_bytes, cache_ttl)
         self.init_database()
+        mmap_mb = float(os.getenv(
+            "JCR_MCP_MMAP_MB", str(IMMUTABLE_MMAP_MB if immutable else DEFAULT_MMAP_MB)
+        ))
+        self.pool = ConnectionPool(
+            db_path, max_idle=pool_size, mmap_size=int(mmap_mb * 1024 * 1024), immutable=immutable
+        )
+        self._catalog: Optional[SchemaCatalog] = None
+        self._catalog_lock = threading.Lock()
+        self._match_counts = Counter()
+        self._stats_lock = threading.Lock()
+        self._snapshot: Optional[MemorySnapshot] = None
+        self._snapshot_checked = 0.0
+        self._fuzzy: Optional[FuzzyIndex] = None
+        self._completion: Optional[CompletionIndex] = None
+        self._filter_stats: Optional[FilterStats] = None
+        self._categories: Optional[CategoryIndex] = None
+        self._warnings: Optional[WarningIndex] = None
+        self._info: Optional[DatabaseInfo] = None
+        # 模糊匹配的时间预算（秒）
+        self.fuzzy_budget = float(os.getenv("JCR_MCP_FUZZY_BUDGET_MS", "200")) / 1000
     
     def init_database(self):
         """初始化数据库"""
+        if self.immutable:
+            # 只读不可变模式不创建任何文件，数据库须由 jcr-mcp-sync 预先生成
+            if not os.path.isfile(self.db_path):
+                raise FileNotFoundError(
+                    f"数据库文件不存在: {self.db_path}（只读不可变模式不会创建数据库，请先运行 jcr-mcp-sync）"
+                )
+            return
+        
         if not os.path.exists(self.db_path):
             # 如果数据库不存在，创建基本表结构
             conn = sqlite3.connect(self.db_path)
             conn.close()
     
+    @contextmanager
+    def connection(self) -> Iterator[PooledConnection]:
+        """从连接池借用一个只读连接"""
+        with self.pool.connection() as conn:
+            yield conn
+    
+    def pool_stats(self) -> Dict[str, int]:
+        """获取连接池命中/未命中统计"""
+        return self.pool.stats()
+    
+    def cache_stats(self) -> Dict[str, int]:
+        """获取查询结果缓存的命中/未命中/淘汰统计"""
+        return self.cache.stats()
+    
+    def close(self):
+        """关闭连接池中的所有连接"""
+        self.pool.close()
+    
+    def _generation(self, conn: PooledConnection) -> Tuple:
+        """
+        获取数据代次标识
+        
+        仅当该连接观察到 PRAGMA data_version 变化（即其他连接提交了写入）时
+        才重新读取 sync_metadata，否则直接复用连接上缓存的结果。
+        只读不可变模式下文件内容视为不变，每个连接只读取一次。
+        """
+        if self.immutable:
+            if conn.generation is None:
+                conn.generation = read_generation(conn)
+            return conn.generation
+        
+        data_version = conn.execute("PRAGMA data_version").fetchone()[0]
+        if conn.generation is None or conn.data_version != data_version:
+            conn.generation = read_generation(conn)
+            conn.data_version = data_version
+        return conn.generation
+    
+    def generation(self) -> Tuple:
+        """获取数据库当前的数据代次标识"""
+        with self.connection() as conn:
+            return self._generation(conn)
+    
+    def _get_catalog(self, conn: PooledConnection) -> SchemaCatalog:
+        """获取表结构目录，数据代次变化时重建"""
+        generation = self._generation(conn)
+        catalog = self._catalog
+        if catalog is not None and catalog.generation == generation:
+            return catalog
+        
+        with self._catalog_lock:
+            if self._catalog is None or self._catalog.generation != generation:
+                self._catalog = SchemaCatalog.load(conn, generation)
+            return self._catalog
+    
+    def _get_snapshot(self) -> MemorySnapshot:
+        """
+        获取内存快照，数据代次变化时重新加载
+        
+        距上次检查不足 generation_check_interval 秒时直接返回当前快照；
+        只读不可变模式下快照加载后不再检查。
+        """
+        snapshot = self._snapshot
+        now = time.monotonic()
+        if snapshot is not None and (
+            self.immutable or now - self._snapshot_checked < self.generation_check_interval
+        ):
+            return snapshot
+        
+        with self.connection() as conn:
+            catalog = self._get_catalog(conn)
+            if snapshot is None or snapshot.generation != catalog.generation:
+                with self._catalog_lock:
+                    snapshot = self._snapshot
+                    if snapshot is None or snapshot.generation != catalog.generation:
+                        snapshot = MemorySnapshot.load(conn, catalog, catalog.generation)
+                        self._snapshot = snapshot
+        
+        self._snapshot_checked = now
+        return snapshot
+    
+    def _is_current(self, index) -> bool:
+        """
+        内存引擎下按快照的数据代次判断按代次缓存的索引是否仍然有效
+        
+        快照按 generation_check_interval 检查数据更新，判断时不借用连接；
+        sqlite 引擎（或索引已过期）时返回 False，由调用方借用连接检查数据代次并重建。
+        """
+        return (
+            index is not None and self.engine == ENGINE_MEMORY
+            and index.generation == self._get_snapshot().generation
+        )
+    
+    def get_catalog(self) -> SchemaCatalog:
+        """获取表结构目录（内存引擎取自快照）"""
+        if self.engine == ENGINE_MEMORY:
+            return self._get_snapshot().catalog
+        with self.connection() as conn:
+            return self._get_catalog(conn)
+    
+    def database_info(self, verify: bool = False) -> DatabaseInfo:
+        """
+        获取数据库概况
+        
+        记录数与更新时间取自同步元数据，来源年份取自表结构目录，按数据代次缓存，
+        不扫描任何数据表。
+        
+        Args:
+            verify: 为 True 时逐表执行 COUNT(*) 重新统计记录数（全表扫描，不缓存）
+        """
+        with self.connection() as conn:
+            catalog = self._get_catalog(conn)
+            info = self._info
+            if info is None or info.generation != catalog.generation:
+                with self._catalog_lock:
+                    if self._info is None or self._info.generation != catalog.generation:
+                        self._info = self._build_database_info(conn, catalog)
+                    info = self._info
+            if not verify:
+                return info
+            
+            tables = [
+                table._replace(counted=conn.execute(f'SELECT COUNT(*) FROM "{table.name}"').fetchone()[0])
+                for table in info.tables
+            ]
+        return replace(info, tables=tables, verified=True)
+    
+    def _build_database_info(self, conn: PooledConnection, catalog: SchemaCatalog) -> DatabaseInfo:
+        """读取同步元数据、表清单与页数构建数据库概况"""
+        try:
+            metadata = {
+                name: (count, updated) for name, updated, count in conn.execute(
+                    "SELECT table_name, last_updated, record_count FROM sync_metadata"
+                )
+            }
+        except sqlite3.OperationalError:
+            metadata = {}
+        
+        # FTS5 的内部影子表不单独列出
+        names = [
+            row[0] for row in conn.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'table' "
+                "AND name NOT LIKE 'sqlite\\_%' ESCAPE '\\' AND name NOT LIKE ? ESCAPE '\\'",
+                (_escape_like(FTS_TABLE) + "\\_%",),
+            )
+        ]
+        tables = [TableInfo(name, *metadata.get(name, (None, None))) for name in sorted(names)]
+        
+        source_years: Dict[str, List[int]] = {}
+        for schema in catalog.journal_tables():
+            source_years.setdefault(schema.source, []).append(schema.year)
+        page_count = conn.execute("PRAGMA page_count").fetchone()[0]
+        page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+        
+        return DatabaseInfo(
+            db_path=self.db_path,
+            size_bytes=page_count * page_size,
+            tables=tables,
+            source_years={source: sorted(years, reverse=True) for source, years in source_years.items()},
+            last_updated=max((updated for _, updated in metadata.values() if updated), default=None),
+            generation=catalog.generation,
+        )
+    
     def search_journal(self, journal_name: str, year: Optional[str] = None) -> List[JournalInfo]:
         """搜索期刊信息"""
-        conn = sqlite3.connect(self.db_path)
+        return self.search(journal_name, year).journals
+    
+    def search(
+        self,
+        journal_name: str,
+        year: Optional[str] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+    ) -> SearchResult:
+        """
+        搜索期刊信息并返回匹配路径
+        
+        先按规范化名称键做一次索引等值查询，未命中时才回退到子串搜索。
+        子串匹配的期刊按匹配等级（完全相同 > 前缀 > 子串）和名称排序，分页在SQL中完成。
+        sqlite 引擎下结果按 (规范化名称, 年份, 分页) 缓存，数据代次变化时整体失效。
+        
+        Args:
+            journal_name: 期刊名称
+            year: 年份过滤（可选），如 "2024"、"2022-2024" 或 "latest"（各来源最新年份）
+            limit: 最多返回的期刊数（按期刊而非记录计数），为None时不限制
+            offset: 跳过的期刊数
+        
+        Returns:
+            搜索结果，包含当前页的期刊记录、实际使用的匹配路径及命中期刊总数
+        
+        Raises:
+            ValueError: 年份格式或分页参数无效
+        """
+        years = YearFilter.parse(year)
+        _page_bounds(limit, offset)
+        
+        if self.engine == ENGINE_MEMORY:
+            result = self._get_snapshot().search(journal_name, years, limit, offset)
+            with self._stats_lock:
+                self._match_counts[result.match_type] += 1
+            return result
+        
+        cache_key = ("search", normalize_name(journal_name), years, limit, offset)
+        with self.connection() as conn:
+            catalog = self._get_catalog(conn)
+            hit, result = self.cache.get(cache_key, catalog.generation)
+            if not hit:
+                result = self._search_uncached(conn, catalog, journal_name, years, limit, offset)
+                self.cache.put(cache_key, result, catalog.generation)
+        
+        with self._stats_lock:
+            self._match_counts[result.match_type] += 1
+        return SearchResult(list(result.journals), result.match_type, result.total)
+    
+    def _search_uncached(
+        self,
+        conn: PooledConnection,
+        catalog: SchemaCatalog,
+        journal_name: str,
+        years: Optional[YearFilter] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+    ) -> SearchResult:
+        """执行单个期刊的搜索（不经过缓存）"""
+        if not catalog.has_records:
+            infos = self._search_tables(conn, catalog, journal_name, years)
+            return _rank_groups(infos, journal_name, limit, offset)
+        
+        result = self._search_exact(conn, catalog, journal_name, years, limit, offset)
+        if not result.total:
+            result = self._search_records(conn, catalog, journal_name, years, limit, offset)
+        return result
+    
+    def search_many(
+        self, journal_names: Iterable[str], year: Optional[str] = None
+    ) -> Dict[str, List[JournalInfo]]:
+        """
+        批量搜索多个期刊
+        
+        所有名称先合并为一次名称键等值查询，未精确命中的名称再合并为一次子串查询；
+        未构建统一表时每张原始数据表只扫描一遍。
+        
+        Args:
+            journal_names: 期刊名称列表
+            year: 年份过滤（可选），格式同 search
+        
+        Returns:
+            以输入名称为键的期刊记录列表，未命中时为空列表
+        
+        Raises:
+            ValueError: 年份格式无效
+        """
+        years = YearFilter.parse(year)
+        names = list(dict.fromkeys(journal_names))
+        
+        if self.engine == ENGINE_MEMORY:
+            snapshot = self._get_snapshot()
+            results = {name: snapshot.search(name, years) for name in names}
+        else:
+            results = {}
+            with self.connection() as conn:
+                catalog = self._get_catalog(conn)
+                for name in names:
+                    hit, result = self.cache.get(
+                        ("search", normalize_name(name), years, None, 0), catalog.generation
+                    )
+                    if hit:
+                        results[name] = result
+                
+                pending = [name for name in names if name not in results]
+                if pending:
+                    fetched = self._search_many_uncached(conn, catalog, pending, years)
+                    for name, result in fetched.items():
+                        self.cache.put(
+                            ("search", normalize_name(name), years, None, 0), result, catalog.generation
+                        )
+                    results.update(fetched)
+        
+        with self._stats_lock:
+            for result in results.values():
+                self._match_counts[result.match_type] += 1
+        return {name: list(results[name].journals) for name in names}
+    
+    def _search_many_uncached(
+        self,
+        conn: PooledConnection,
+        catalog: SchemaCatalog,
+        journal_names: List[str],
+        years: Optional[YearFilter] = None,
+    ) -> Dict[str, SearchResult]:
+        """批量执行多个期刊的搜索（不经过缓存）"""
+        if not catalog.has_records:
+            return self._search_tables_many(conn, catalog, journal_names, years)
+        
+        results = self._search_exact_many(conn, catalog, journal_names, years)
+        misses = [name for name in journal_names if not results[name].journals]
+        if misses:
+            results.update(self._search_records_many(conn, catalog, misses, years))
+        return results
+    
+    def suggest(
+        self, journal_name: str, limit: int = 5, min_score: float = 0.8
+    ) -> List[Tuple[str, float]]:
+        """
+        模糊匹配期刊名称，给出 "您是否要找" 建议
+        
+        Args:
+            journal_name: 期刊名称（可含拼写错误或不同的缩写写法）
+            limit: 最多返回的建议数
+            min_score: 最低相似度（Jaro-Winkler，0~1）
+        
+        Returns:
+            (期刊名称, 相似度) 列表，按相似度降序排列
+        """
+        return self._get_fuzzy_index().suggest(journal_name, limit, min_score, self.fuzzy_budget)
+    
+    def _get_fuzzy_index(self) -> FuzzyIndex:
+        """获取名称模糊匹配索引，数据代次变化时重建"""
+        index = self._fuzzy
+        if self._is_current(index):
+            return index
+        with self.connection() as conn:
+            catalog = self._get_catalog(conn)
+            index = self._fuzzy
+            if index is not None and index.generation == catalog.generation:
+                return index
+            
+            with self._catalog_lock:
+                if self._fuzzy is None or self._fuzzy.generation != catalog.generation:
+                    self._fuzzy = FuzzyIndex(self._iter_journal_names(conn, catalog), catalog.generation)
+                return self._fuzzy
+    
+    @staticmethod
+    def _iter_journal_names(conn: PooledConnection, catalog: SchemaCatalog) -> Iterator[str]:
+        """遍历所有期刊名称（统一表中每个期刊优先取最新年份的写法）"""
+        if catalog.has_records:
+            cursor = conn.execute(
+                f"SELECT journal_name FROM {RECORDS_TABLE} ORDER BY journal_id, year DESC, source"
+            )
+            for (journal_name,) in cursor:
+                yield journal_name
+            return
+        
+        for schema in catalog.journal_tables():
+            for (journal_name,) in conn.execute(f'SELECT Journal FROM "{schema.name}"'):
+                if journal_name:
+                    yield journal_name
+    
+    def autocomplete(self, prefix: str, limit: int = 10) -> List[Completion]:
+        """
+        按名称前缀补全期刊
+        
+        Args:
+            prefix: 期刊名称开头部分
+            limit: 最多返回的期刊数
+        
+        Returns:
+            补全结果列表，附带各期刊最新的分区与影响因子
+        """
+        return self._get_completion_index().complete(prefix, limit)
+    
+    def _get_completion_index(self) -> CompletionIndex:
+        """获取名称前缀补全索引，数据代次变化时重建"""
+        index = self._completion
+        if self._is_current(index):
+            return index
+        with self.connection() as conn:
+            catalog = self._get_catalog(conn)
+            index = self._completion
+            if index is not None and index.generation == catalog.generation:
+                return index
+            
+            with self._catalog_lock:
+                if self._completion is None or self._completion.generation != catalog.generation:
+                    self._completion = CompletionIndex(
+                        self._iter_journal_records(conn, catalog), catalog.generation
+                    )
+                return self._completion
+    
+    def _iter_journal_records(
+        self, conn: PooledConnection, catalog: SchemaCatalog
+    ) -> Iterator[Tuple[str, JournalInfo]]:
+        """按年份降序遍历所有期刊记录及其名称匹配键（优先读取统一表）"""
+        if catalog.has_records:
+            cursor = conn.execute(
+                f"SELECT name_key, {_RECORD_COLUMNS} FROM {RECORDS_TABLE} ORDER BY year DESC"
+            )
+            for row in cursor:
+                yield row[0], _record_to_info(row[1:])
+            return
+        
         cursor = conn.cursor()
+        for schema in sorted(catalog.journal_tables(), key=lambda schema: -schema.year):
+            for info in self._read_table(cursor, schema):
+                yield name_key(info.journal_name), info
+    
+    def match_stats(self) -> Dict[str, int]:
+        """获取各匹配路径服务的查询次数"""
+        with self._stats_lock:
+            return {
+                MATCH_EXACT: self._match_counts[MATCH_EXACT],
+                MATCH_SUBSTRING: self._match_counts[MATCH_SUBSTRING],
+            }
+    
+    def _search_exact(
+        self,
+        conn: PooledConnection,
+        catalog: SchemaCatalog,
+        journal_name: str,
+        years: Optional[YearFilter] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+    ) -> SearchResult:
+        """
+        按规范化名称键精确查找，返回命中期刊在各来源、年份下的记录
+        
+        精确命中的期刊通常只有一个，直接取回全部记录后按期刊分页。
+        """
+        key = name_key(journal_name)
+        if not key:
+            return SearchResult(match_type=MATCH_EXACT, total=0)
         
+        year_condition, year_params = _year_condition(catalog, years)
+        cursor = conn.execute(
+            f"SELECT {_RECORD_COLUMNS} FROM {RECORDS_TABLE} "
+            f"WHERE journal_id IN (SELECT journal_id FROM {RECORDS_TABLE} WHERE name_key = ?) "
+            f"AND {year_condition} "
+            "ORDER BY journal_id, year, source",
+            [key] + year_params,
+        )
+        infos = list(map(_record_to_info, cursor.fetchall()))
+        journal_ids = list(dict.fromkeys(info.journal_id for info in infos))
+        if limit is not None or offset:
+            end = None if limit is None else offset + limit
+            page = set(journal_ids[offset:end])
+            infos = [info for info in infos if info.journal_id in page]
+        return SearchResult(infos, MATCH_EXACT, len(journal_ids))
+    
+    def _search_records(
+        self,
+        conn: PooledConnection,
+        catalog: SchemaCatalog,
+        journal_name: str,
+        years: Optional[YearFilter] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+    ) -> SearchResult:
+        """
+        在 journal_records 统一表上执行一次子串查询
+        
+        年份条件下推到SQL，短查询回退LIKE时可走 (year, normalized_name) 复合索引。
+        命中期刊的排序、分页与总数统计都在SQL中完成，只有当前页的记录被取回。
+        """
+        condition, params = _name_condition(catalog, journal_name)
+        year_condition, year_params = _year_condition(catalog, years)
+        rank, rank_params = _rank_expression(journal_name)
+        page_limit, page_offset = _page_bounds(limit, offset)
+        
+        hits = (
+            f"hits AS (SELECT rowid AS record_id, journal_id, normalized_name FROM {RECORDS_TABLE} "
+            f"WHERE {condition} AND {year_condition}), "
+            f"ranked AS (SELECT journal_id, MIN({rank}) AS match_rank, "
+            "MIN(normalized_name) AS sort_name FROM hits GROUP BY journal_id)"
+        )
+        hit_params = params + year_params + rank_params
+        cursor = conn.execute(
+            f"WITH {hits}, "
+            "page AS (SELECT *, COUNT(*) OVER () AS total FROM ranked "
+            "ORDER BY match_rank, sort_name, journal_id LIMIT ? OFFSET ?) "
+            f"SELECT page.total, {_record_columns('r')} "
+            f"FROM page JOIN {RECORDS_TABLE} AS r ON r.journal_id = page.journal_id "
+            "WHERE +r.rowid IN (SELECT record_id FROM hits) "
+            "ORDER BY page.match_rank, page.sort_name, r.journal_id, r.year, r.source",
+            hit_params + [page_limit, page_offset],
+        )
+        rows = cursor.fetchall()
+        if rows:
+            total = rows[0][0]
+        elif offset:
+            total = conn.execute(f"WITH {hits} SELECT COUNT(*) FROM ranked", hit_params).fetchone()[0]
+        else:
+            total = 0
+        return SearchResult([_record_to_info(row[1:]) for row in rows], MATCH_SUBSTRING, total)
+    
+    def _search_tables(
+        self,
+        conn: PooledConnection,
+        catalog: SchemaCatalog,
+        journal_name: str,
+        years: Optional[YearFilter] = None,
+    ) -> List[JournalInfo]:
+        """
+        逐表搜索原始数据表（未构建统一表时的兼容路径），年份不符的表直接跳过
+        
+        与缓存键一致，使用规范化后的名称做子串匹配（LIKE 本身不区分ASCII大小写）。
+        """
         results = []
-        try:
-            # 获取所有表名
-            cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
-            tables = [table[0] for table in cursor.fetchall()]
+        pattern = _like_pattern(normalize_name(journal_name))
+        cursor = conn.cursor()
+        
+        # 在各个表中搜索期刊
+        for schema in catalog.journal_tables(years=years):
+            try:
+                results.extend(self._read_table(
+                    cursor, schema, "Journal LIKE ? ESCAPE '\\'", [pattern]
+                ))
+            except sqlite3.Error:
+                continue
+        
+        return results
+    
+    def _search_exact_many(
+        self,
+        conn: PooledConnection,
+        catalog: SchemaCatalog,
+        journal_names: List[str],
+        years: Optional[YearFilter] = None,
+    ) -> Dict[str, SearchResult]:
+        """一次查询按名称键精确查找多个期刊"""
+        keys = {name: name_key(name) for name in journal_names}
+        wanted = sorted({key for key in keys.values() if key})
+        by_key: Dict[str, List[JournalInfo]] = {}
+        
+        if wanted:
+            placeholders = ", ".join("?" * len(wanted))
+            year_condition, year_params = _year_condition(catalog, years)
+            cursor = conn.execute(
+                f"SELECT matched.name_key, {_RECORD_COLUMNS} FROM {RECORDS_TABLE} "
+                f"JOIN (SELECT DISTINCT name_key, journal_id FROM {RECORDS_TABLE} "
+                f"WHERE name_key IN ({placeholders})) AS matched USING (journal_id) "
+                f"WHERE {year_condition} "
+                "ORDER BY journal_id, year, source",
+                wanted + year_params,
+            )
+            for row in cursor.fetchall():
+                by_key.setdefault(row[0], []).append(_record_to_info(row[1:]))
+        
+        results = {}
+        for name, key in keys.items():
+            infos = list(by_key.get(key, []))
+            total = len({info.journal_id for info in infos})
+            results[name] = SearchResult(infos, MATCH_EXACT, total)
+        return results
+    
+    def _search_records_many(
+        self,
+        conn: PooledConnection,
+        catalog: SchemaCatalog,
+        journal_names: List[str],
+        years: Optional[YearFilter] = None,
+    ) -> Dict[str, SearchResult]:
+        """
+        将多个名称的子串查询合并为一条 UNION ALL 语句执行
+        
+        每个名称内部的期刊排序与 search 一致（按窗口函数计算匹配等级与排序名称）。
+        """
+        year_condition, year_params = _year_condition(catalog, years)
+        selects = []
+        params: list = []
+        for index, name in enumerate(journal_names):
+            condition, condition_params = _name_condition(catalog, name)
+            rank, rank_params = _rank_expression(name)
+            selects.append(
+                f"SELECT {index} AS query_index, "
+                f"MIN({rank}) OVER (PARTITION BY journal_id) AS match_rank, "
+                "MIN(normalized_name) OVER (PARTITION BY journal_id) AS sort_name, "
+                f"{_RECORD_COLUMNS}, source FROM {RECORDS_TABLE} "
+                f"WHERE {condition} AND {year_condition}"
+            )
+            params.extend(rank_params + condition_params + year_params)
+        
+        cursor = conn.execute(
+            " UNION ALL ".join(selects)
+            + " ORDER BY query_index, match_rank, sort_name, journal_id, year, source",
+            params,
+        )
+        results = {name: SearchResult(total=0) for name in journal_names}
+        for row in cursor.fetchall():
+            results[journal_names[row[0]]].journals.append(_record_to_info(row[3:-1]))
+        for result in results.values():
+            result.total = len({info.journal_id for info in result.journals})
+        return results
+    
+    def _search_tables_many(
+        self,
+        conn: PooledConnection,
+        catalog: SchemaCatalog,
+        journal_names: List[str],
+        years: Optional[YearFilter] = None,
+    ) -> Dict[str, SearchResult]:
+        """逐表扫描原始数据表，每张表只查询一次并在内存中分派到各个名称"""
+        results = {name: SearchResult() for name in journal_names}
+        needles = [(name, normalize_name(name)) for name in journal_names]
+        conditions = " OR ".join("Journal LIKE ? ESCAPE '\\'" for _ in journal_names)
+        params = [_like_pattern(needle) for _, needle in needles]
+        cursor = conn.cursor()
+        
+        for schema in catalog.journal_tables(years=years):
+            try:
+                for journal_info in self._read_table(cursor, schema, conditions, params):
+                    journal = normalize_name(journal_info.journal_name)
+                    for name, needle in needles:
+                        if needle in journal:
+                            results[name].journals.append(journal_info)
             
-            # 在各个表中搜索期刊
-            for table in tables:
-                try:
-                    # 检查表结构
-                    cursor.execute(f"PRAGMA table_info({table})")
-                    columns = [col[1] for col in cursor.fetchall()]
-                    
-                    if 'Journal' not in columns:
-                        continue
-                    
-                    # 构建查询语句
-                    query = f"SELECT * FROM {table} WHERE Journal LIKE ? COLLATE NOCASE"
-                    cursor.execute(query, (f"%{journal_name}%",))
-                    
-                    rows = cursor.fetchall()
-                    column_names = [description[0] for description in cursor.description]
-                    
-                    for row in rows:
-                        row_dict = dict(zip(column_names, row))
-                        journal_info = self._parse_journal_info(row_dict, table)
-                        if journal_info:
-                            results.append(journal_info)
+            except sqlite3.Error:
+                continue
+        
+        return {name: _rank_groups(result.journals, name) for name, result in results.items()}
+    
+    def get_by_issn(self, issns: Union[str, Iterable[str]]) -> Dict[str, List[JournalInfo]]:
+        """
+        按ISSN/eISSN查询期刊在所有来源、年份下的记录
+        
+        Args:
+            issns: 单个ISSN或ISSN列表（忽略连字符与大小写）
+        
+        Returns:
+            以输入ISSN为键的期刊记录列表，未命中或格式无效时为空列表
+        """
+        if isinstance(issns, str):
+            issns = [issns]
+        queries = {issn: normalize_issn(issn) for issn in issns}
+        wanted = sorted({issn for issn in queries.values() if issn})
+        
+        by_issn: Dict[str, List[JournalInfo]] = {}
+        if wanted and self.engine == ENGINE_MEMORY:
+            by_issn = self._get_snapshot().get_by_issn(wanted)
+        elif wanted:
+            with self.connection() as conn:
+                catalog = self._get_catalog(conn)
+                for issn in wanted:
+                    hit, records = self.cache.get(("issn", issn, None), catalog.generation)
+                    if hit:
+                        by_issn[issn] = records
                 
-                except sqlite3.Error:
-                    continue
+                pending = [issn for issn in wanted if issn not in by_issn]
+                if pending:
+                    if catalog.has_issn:
+                        fetched = self._lookup_issns(conn, pending)
+                    else:
+                        fetched = self._scan_issns(conn, catalog, pending)
+                    for issn in pending:
+                        records = fetched.get(issn, [])
+                        self.cache.put(("issn", issn, None), records, catalog.generation)
+                        by_issn[issn] = records
         
-        finally:
-            conn.close()
+        return {issn: list(by_issn.get(normalized, [])) for issn, normalized in queries.items()}
+    
+    def _lookup_issns(self, conn: PooledConnection, issns: List[str]) -> Dict[str, List[JournalInfo]]:
+        """通过ISSN索引表点查 journal_id，再取回这些期刊的全部记录"""
+        placeholders = ", ".join("?" * len(issns))
+        pairs = conn.execute(
+            f"SELECT issn, journal_id FROM {ISSN_TABLE} WHERE issn IN ({placeholders})",
+            issns,
+        ).fetchall()
+        if not pairs:
+            return {}
         
-        return results
+        journal_ids = sorted({journal_id for _, journal_id in pairs})
+        placeholders = ", ".join("?" * len(journal_ids))
+        cursor = conn.execute(
+            f"SELECT {_RECORD_COLUMNS} FROM {RECORDS_TABLE} "
+            f"WHERE journal_id IN ({placeholders}) "
+            "ORDER BY journal_id, year, source",
+            journal_ids,
+        )
+        by_journal: Dict[int, List[JournalInfo]] = {}
+        for row in cursor.fetchall():
+            info = _record_to_info(row)
+            by_journal.setdefault(info.journal_id, []).append(info)
+        
+        by_issn: Dict[str, List[JournalInfo]] = {}
+        for issn, journal_id in pairs:
+            by_issn.setdefault(issn, []).extend(by_journal.get(journal_id, []))
+        return by_issn
     
-    def _parse_journal_info(self, row_dict: Dict, table_name: str) -> Optional[JournalInfo]:
-        """解析数据库行为期刊信息对象"""
-        try:
-            journal_name = row_dict.get('Journal', '')
+    def _scan_issns(
+        self, conn: PooledConnection, catalog: SchemaCatalog, issns: List[str]
+    ) -> Dict[str, List[JournalInfo]]:
+        """逐表扫描ISSN列（未构建统一表时的兼容路径）"""
+        wanted = set(issns)
+        by_issn: Dict[str, List[JournalInfo]] = {}
+        cursor = conn.cursor()
+        
+        for schema in catalog.journal_tables():
+            issn_columns = [schema.mapping[f] for f in ("issn", "eissn") if f in schema.mapping]
+            if not issn_columns:
+                continue
             
-            # 根据表名判断数据类型和年份
-            impact_factor = None
-            partition = None
-            category = None
-            warning_status = None
-            ccf_level = None
-            year = None
+            conditions = " OR ".join(
+                f"""instr(replace(upper("{column}"), '-', ''), ?) > 0"""
+                for column in issn_columns for _ in issns
+            )
+            params = [issn for _ in issn_columns for issn in issns]
+            # ISSN列追加在 JournalInfo 字段之后，行转换函数只取前面的字段
+            fields = INFO_FIELDS + tuple(f for f in ("issn", "eissn") if f in schema.mapping)
+            cursor.execute(
+                f'SELECT {schema.select_list(fields)} FROM "{schema.name}" WHERE {conditions}', params
+            )
+            to_info = schema.row_mapper()
             
-            # 解析年份
-            if 'JCR' in table_name:
-                year = table_name.replace('JCR', '')
-                impact_factor = row_dict.get('IF', row_dict.get('Impact Factor'))
-                partition = row_dict.get('Quartile', row_dict.get('分区'))
-                category = row_dict.get('Category', row_dict.get('类别'))
+            for row in cursor.fetchall():
+                found = set()
+                for value in row[len(INFO_FIELDS):]:
+                    found.update(split_issns(value))
+                matched = found & wanted
+                if matched:
+                    journal_info = to_info(row)
+                    for issn in matched:
+                        by_issn.setdefault(issn, []).append(journal_info)
+        
+        return by_issn
+    
+    def list_warning_journals(self, keywords: Optional[str] = None) -> List[JournalInfo]:
+        """
+        查询国际期刊预警名单
+        
+        Args:
+            keywords: 关键词（可选，用于筛选特定期刊）
+        
+        Returns:
+            预警期刊记录列表，按年份降序排列
+        """
+        return self.search_warning_journals(keywords).journals
+    
+    def search_warning_journals(
+        self, keywords: Optional[str] = None, limit: Optional[int] = None, offset: int = 0
+    ) -> SearchResult:
+        """
+        分页查询国际期刊预警名单（在预警名单成员索引上过滤分页）
+        
+        Args:
+            keywords: 关键词（可选）：ISSN 按期刊精确匹配，其他按名称子串筛选
+            limit: 最多返回的预警记录数，为None时不限制
+            offset: 跳过的预警记录数
+        
+        Returns:
+            当前页的预警记录（按年份降序、名称排列）及记录总数
+        
+        Raises:
+            ValueError: 分页参数无效
+        """
+        _page_bounds(limit, offset)
+        return self.get_warning_index().search(keywords, limit, offset)
+    
+    def is_warned(self, name_or_issn: str, year: Union[int, str, None] = None) -> bool:
+        """
+        判断期刊是否在国际期刊预警名单中（哈希查找）
+        
+        Args:
+            name_or_issn: 期刊名称（按名称匹配键精确匹配，同一期刊在其他来源中的名称同样有效）或ISSN/eISSN
+            year: 预警名单年份，为None时不限年份，"latest" 表示最新一年的名单
+        """
+        return self.get_warning_index().is_warned(name_or_issn, year)
+    
+    def get_warning_index(self) -> WarningIndex:
+        """获取预警名单成员索引，数据代次变化时重建"""
+        index = self._warnings
+        if self._is_current(index):
+            return index
+        with self.connection() as conn:
+            catalog = self._get_catalog(conn)
+            index = self._warnings
+            if index is not None and index.generation == catalog.generation:
+                return index
             
-            elif 'FQBJCR' in table_name:
-                year = table_name.replace('FQBJCR', '')
-                partition = row_dict.get('大类分区', row_dict.get('Partition'))
-                category = row_dict.get('学科', row_dict.get('Subject'))
+            with self._catalog_lock:
+                if self._warnings is None or self._warnings.generation != catalog.generation:
+                    self._warnings = self._build_warning_index(conn, catalog)
+                return self._warnings
+    
+    def _build_warning_index(self, conn: PooledConnection, catalog: SchemaCatalog) -> WarningIndex:
+        """读取所有预警名单记录及其ISSN、别名构建成员索引（优先读取统一表）"""
+        if catalog.has_records:
+            warned = f"SELECT journal_id FROM {RECORDS_TABLE} WHERE source = 'GJQKYJMD'"
+            records = map(_record_to_info, conn.execute(
+                f"SELECT {_RECORD_COLUMNS} FROM {RECORDS_TABLE} WHERE source = 'GJQKYJMD'"
+            ))
+            # 实体解析后同一期刊在JCR、中科院分区表等来源中的名称和ISSN同样可以命中
+            aliases = conn.execute(
+                f"SELECT DISTINCT name_key, journal_id FROM {RECORDS_TABLE} WHERE journal_id IN ({warned})"
+            ).fetchall()
+            issns = []
+            if catalog.has_issn:
+                issns = conn.execute(
+                    f"SELECT issn, journal_id FROM {ISSN_TABLE} WHERE journal_id IN ({warned})"
+                ).fetchall()
+            reasons = []
+            if catalog.has_warning_reason:
+                reasons = conn.execute(
+                    f"SELECT journal_id, year, warning_reason FROM {RECORDS_TABLE} "
+                    "WHERE source = 'GJQKYJMD' AND warning_reason IS NOT NULL"
+                ).fetchall()
+            return WarningIndex(records, issns, aliases, catalog.generation, reasons)
+        
+        records, issns, reasons = [], [], []
+        cursor = conn.cursor()
+        for schema in catalog.journal_tables("GJQKYJMD"):
+            records.extend(self._read_table(cursor, schema))
+            cursor.execute(
+                f'SELECT {schema.select_list(("journal_name", "issn", "warning_reason"))} FROM "{schema.name}"'
+            )
+            for journal_name, value, reason in cursor.fetchall():
+                issns.extend((issn, name_key(journal_name)) for issn in split_issns(value))
+                if reason:
+                    reasons.append((name_key(journal_name), schema.year, reason))
+        return WarningIndex(records, issns, generation=catalog.generation, reasons=reasons)
+    
+    def query_journals(
+        self,
+        filters: str,
+        sort: Optional[str] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        year: Optional[str] = "latest",
+    ) -> SearchResult:
+        """
+        按条件查询期刊
+        
+        Args:
+            filters: 过滤条件，多个条件用分号分隔，如 "category=计算机科学; partition=1区; if>5; warning=none"
+                （字段: category/partition/if/warning/ccf/top；运算符: = != > >= < <= ~，~ 表示包含；
+                partition=1区 只匹配中科院分区（"1区"、"1 [3/45]" 等格式），partition=Q1 只匹配JCR分区，
+                partition=1 与 partition<=2 等按分区等级匹配所有来源）
+            sort: 排序方式，if（影响因子降序，默认）或 name，前加 - 或后加 desc/asc 指定方向
+            limit: 最多返回的期刊数，为None时不限制
+            offset: 跳过的期刊数
+            year: 条件匹配的年份范围（默认 latest，即各来源的最新年份；为None时不限年份）
+        
+        Returns:
+            当前页期刊在年份范围内的全部记录（按排序先后排列）及符合条件的期刊总数
+        
+        Raises:
+            ValueError: 过滤条件、排序方式或分页参数无效，或数据库尚未建立统一索引表
+        """
+        _page_bounds(limit, offset)
+        sort_key, descending = parse_sort(sort)
+        years = YearFilter.parse(year)
+        
+        with self.connection() as conn:
+            catalog = self._get_catalog(conn)
+            if not catalog.has_typed_columns:
+                raise ValueError("条件查询需要统一索引表及其类型化列，请先运行 jcr-mcp-sync 同步数据")
+            stats = self._get_filter_stats(conn, catalog)
+            conditions = stats.parse(filters)
+            if not conditions:
+                raise ValueError("请至少提供一个过滤条件，如 partition=1区; if>5")
             
-            elif 'GJQKYJMD' in table_name:
-                year = table_name.replace('GJQKYJMD', '')
-                warning_status = row_dict.get('预警等级', row_dict.get('Warning Level'))
+            cache_key = ("query", tuple(conditions), years, sort_key, descending, limit, offset)
+            hit, result = self.cache.get(cache_key, catalog.generation)
+            if not hit:
+                result = self._query_uncached(
+                    conn, catalog, stats, conditions, years, sort_key, descending, limit, offset
+                )
+                self.cache.put(cache_key, result, catalog.generation)
+        return SearchResult(list(result.journals), result.match_type, result.total)
+    
+    def _get_filter_stats(self, conn: PooledConnection, catalog: SchemaCatalog) -> FilterStats:
+        """获取条件查询的统计信息，数据代次变化时重新统计"""
+        stats = self._filter_stats
+        if stats is not None and stats.generation == catalog.generation:
+            return stats
+        
+        with self._catalog_lock:
+            if self._filter_stats is None or self._filter_stats.generation != catalog.generation:
+                value_counts = {
+                    column: {
+                        str(value): count for value, count in conn.execute(
+                            f"SELECT {column}, COUNT(*) FROM {RECORDS_TABLE} "
+                            f"WHERE {column} IS NOT NULL GROUP BY {column}"
+                        )
+                    }
+                    for column in TEXT_FIELDS
+                }
+                numeric_values = {
+                    column: [value for (value,) in conn.execute(
+                        f"SELECT {column} FROM {RECORDS_TABLE} WHERE {column} IS NOT NULL"
+                    )]
+                    for column in NUMERIC_FIELDS
+                }
+                total = conn.execute(f"SELECT COUNT(*) FROM {RECORDS_TABLE}").fetchone()[0]
+                self._filter_stats = FilterStats(value_counts, numeric_values, total, catalog.generation)
+            return self._filter_stats
+    
+    def _query_uncached(
+        self,
+        conn: PooledConnection,
+        catalog: SchemaCatalog,
+        stats: FilterStats,
+        conditions: List[Condition],
+        years: Optional[YearFilter],
+        sort_key: str,
+        descending: bool,
+        limit: Optional[int],
+        offset: int,
+    ) -> SearchResult:
+        """执行条件查询（不经过缓存）：先求出符合条件的期刊编号集合，再排序分页并读取当前页记录"""
+        journal_ids = self._match_journal_ids(conn, catalog, stats.plan(conditions), years)
+        if not journal_ids:
+            return SearchResult([], total=0)
+        
+        # 年份条件加一元 "+"，让SQLite按 journal_id 索引读取候选期刊的记录
+        year_clause, year_params = _year_condition(catalog, years, "+")
+        if sort_key == "if_value":
+            key = "MAX(if_value)"
+        else:
+            key = "MIN(normalized_name)"
+        direction = "DESC" if descending else "ASC"
+        page_limit, page_offset = _page_bounds(limit, offset)
+        cursor = conn.execute(
+            f"SELECT journal_id FROM {RECORDS_TABLE} "
+            f"WHERE journal_id IN (SELECT value FROM json_each(?)) AND {year_clause} "
+            f"GROUP BY journal_id ORDER BY {key} IS NULL, {key} {direction}, journal_id "
+            f"LIMIT ? OFFSET ?",
+            [json.dumps(sorted(journal_ids)), *year_params, page_limit, page_offset],
+        )
+        page = [journal_id for (journal_id,) in cursor]
+        
+        cursor = conn.execute(
+            f"SELECT {_RECORD_COLUMNS} FROM {RECORDS_TABLE} "
+            f"WHERE journal_id IN (SELECT value FROM json_each(?)) AND {year_clause} "
+            f"ORDER BY year DESC, source",
+            [json.dumps(page), *year_params],
+        )
+        positions = {journal_id: position for position, journal_id in enumerate(page)}
+        infos = sorted(map(_record_to_info, cursor), key=lambda info: positions[info.journal_id])
+        return SearchResult(infos, total=len(journal_ids))
+    
+    def _match_journal_ids(
+        self,
+        conn: PooledConnection,
+        catalog: SchemaCatalog,
+        plan: List[Tuple[Union[Condition, RowCondition], int]],
+        years: Optional[YearFilter],
+    ) -> Set[int]:
+        """
+        按执行计划求符合全部条件的期刊编号集合
+        
+        学科、分区、Top 条件已合并为 RowCondition，在同一条记录上判断；其余条件按期刊求交集。
+        第一个条件走该列的索引取出期刊编号集合；之后的条件若估算命中数不超过候选集的
+        PROBE_RATIO 倍，同样走索引取集合后求交集（排除条件求差集），否则只按 journal_id
+        索引读取候选期刊的记录逐一校验。
+        """
+        journal_ids: Optional[Set[int]] = None
+        for condition, estimate in plan:
+            if journal_ids is not None and not journal_ids:
+                break
+            if journal_ids is None and condition.negate:
+                # 只有排除条件时，从年份范围内的全部期刊中排除
+                journal_ids = self._fetch_journal_ids(conn, catalog, None, years)
             
-            elif 'CCF' in table_name:
-                year = table_name.replace('CCF', '')
-                ccf_level = row_dict.get('CCF推荐类型', row_dict.get('CCF Level'))
-                category = row_dict.get('领域', row_dict.get('Field'))
+            if journal_ids is not None and estimate > PROBE_RATIO * len(journal_ids):
+                matched = self._probe_journal_ids(conn, catalog, condition, journal_ids, years)
+            else:
+                matched = self._fetch_journal_ids(conn, catalog, condition, years)
             
-            return JournalInfo(
-                journal_name=journal_name,
-                impact_factor=impact_factor,
-                partition=partition,
-                category=category,
-                warning_status=warning_status,
-                ccf_level=ccf_level,
-                year=year
+            if journal_ids is None:
+                journal_ids = matched
+            elif condition.negate:
+                journal_ids -= matched
+            else:
+                journal_ids &= matched
+        return journal_ids or set()
+    
+    @staticmethod
+    def _fetch_journal_ids(
+        conn: PooledConnection,
+        catalog: SchemaCatalog,
+        condition: Union[Condition, RowCondition, None],
+        years: Optional[YearFilter],
+    ) -> Set[int]:
+        """通过条件列上的索引取出满足条件的期刊编号（年份条件从覆盖索引中判断）"""
+        if condition is None:
+            clause, params = "1", []
+            year_clause, year_params = _year_condition(catalog, years)
+        else:
+            clause, params = condition.sql()
+            year_clause, year_params = _year_condition(catalog, years, "+")
+        # 不用 DISTINCT：去重在 Python 集合中完成，否则SQLite倾向于按 journal_id 索引全表扫描
+        cursor = conn.execute(
+            f"SELECT journal_id FROM {RECORDS_TABLE} WHERE {clause} AND {year_clause}",
+            params + year_params,
+        )
+        return {journal_id for (journal_id,) in cursor}
+    
+    @staticmethod
+    def _probe_journal_ids(
+        conn: PooledConnection,
+        catalog: SchemaCatalog,
+        condition: Union[Condition, RowCondition],
+        journal_ids: Set[int],
+        years: Optional[YearFilter],
+    ) -> Set[int]:
+        """只在候选期刊的记录上校验条件（按 journal_id 索引读取）"""
+        clause, params = condition.sql(indexed=False)
+        year_clause, year_params = _year_condition(catalog, years, "+")
+        cursor = conn.execute(
+            f"SELECT journal_id FROM {RECORDS_TABLE} "
+            f"WHERE journal_id IN (SELECT value FROM json_each(?)) AND {clause} AND {year_clause}",
+            [json.dumps(sorted(journal_ids)), *params, *year_params],
+        )
+        return {journal_id for (journal_id,) in cursor}
+    
+    def top_journals(self, category: str, year: Optional[str] = "latest", n: int = 20) -> Ranking:
+        """
+        查询学科内影响因子排名前 n 的期刊（排名在同步时预先计算）
+        
+        Args:
+            category: 学科名称（JCR学科或中科院分区表大类，忽略大小写，可只写名称中的一部分）
+            year: 排名年份（默认 latest，即该学科的最新年份）
+            n: 返回的期刊数
+        
+        Returns:
+            学科排名（前 n 名及参与排名的期刊总数）
+        
+        Raises:
+            ValueError: 学科、年份或 n 无效，或数据库尚未建立学科排名表
+        """
+        if n <= 0:
+            raise ValueError("n 必须为正整数")
+        
+        with self.connection() as conn:
+            index = self._get_category_index(conn)
+            category = index.resolve(category)
+            year = index.resolve_year(category, year)
+            # 沿主键 (category, year, rank) 读取前 n 行
+            cursor = conn.execute(
+                f"SELECT rank, journal_name, impact_factor, if_year, partition, source, journal_id "
+                f"FROM {RANKINGS_TABLE} WHERE category = ? AND year = ? AND rank <= ? ORDER BY rank",
+                (category, year, n),
             )
+            journals = [RankedJournal._make(row) for row in cursor]
+        return Ranking(category, year, journals, index.count(category, year))
+    
+    def partition_trend(self, journal_name: str) -> Optional[dict]:
+        """
+        获取期刊的趋势文档（同步时预先生成，见 trends.build_trend）
         
-        except Exception:
+        名称匹配键完全一致时直接按 journal_id 读取一行；否则取搜索排名第一的期刊。
+        内存引擎直接从快照中读取。
+        
+        Args:
+            journal_name: 期刊名称
+        
+        Returns:
+            趋势文档，未找到期刊时返回None
+        """
+        if self.engine == ENGINE_MEMORY and self._get_snapshot().has_trends:
+            found = self.search(journal_name, limit=1).journals
+            return self._get_snapshot().trend(found[0].journal_id) if found else None
+        
+        with self.connection() as conn:
+            catalog = self._get_catalog(conn)
+            if catalog.has_trends:
+                row = conn.execute(
+                    f"SELECT document FROM {TRENDS_TABLE} WHERE journal_id = "
+                    f"(SELECT journal_id FROM {RECORDS_TABLE} WHERE name_key = ? LIMIT 1)",
+                    (name_key(journal_name),),
+                ).fetchone()
+                if row is not None:
+                    return json.loads(row[0])
+        
+        found = self.search(journal_name, limit=1).journals
+        if not found:
             return None
+        
+        with self.connection() as conn:
+            catalog = self._get_catalog(conn)
+            if catalog.has_trends and found[0].journal_id is not None:
+                row = conn.execute(
+                    f"SELECT document FROM {TRENDS_TABLE} WHERE journal_id = ?", (found[0].journal_id,)
+                ).fetchone()
+                return json.loads(row[0]) if row is not None else None
+            return build_trend(found[0].journal_id, self._trend_records(conn, catalog, found[0].journal_name))
+    
+    def partition_trends_many(self, journals: Iterable[JournalInfo]) -> List[Optional[dict]]:
+        """
+        批量获取多个期刊的趋势文档
+        
+        所有 journal_id 合并为一次 IN 查询（内存引擎直接从快照中读取）；
+        未建立趋势文档表（或文档版本过旧）时逐个期刊从原始数据表生成。
+        
+        Args:
+            journals: 期刊记录（通常为各期刊搜索排名第一的记录）
+        
+        Returns:
+            与输入顺序一致的趋势文档列表，未找到时对应位置为None
+        """
+        journals = list(journals)
+        if self.engine == ENGINE_MEMORY:
+            snapshot = self._get_snapshot()
+            if snapshot.has_trends:
+                return [snapshot.trend(info.journal_id) for info in journals]
+        
+        with self.connection() as conn:
+            catalog = self._get_catalog(conn)
+            documents = {}
+            journal_ids = sorted({info.journal_id for info in journals if info.journal_id is not None})
+            if catalog.has_trends and journal_ids:
+                rows = conn.execute(
+                    f"SELECT journal_id, document FROM {TRENDS_TABLE} "
+                    f"WHERE journal_id IN (SELECT value FROM json_each(?))",
+                    (json.dumps(journal_ids),),
+                ).fetchall()
+                documents = {journal_id: json.loads(document) for journal_id, document in rows}
+            
+            trends = []
+            for info in journals:
+                if catalog.has_trends and info.journal_id is not None:
+                    trends.append(documents.get(info.journal_id))
+                else:
+                    trends.append(build_trend(
+                        info.journal_id, self._trend_records(conn, catalog, info.journal_name)
+                    ))
+            return trends
+    
+    def _trend_records(
+        self, conn: PooledConnection, catalog: SchemaCatalog, journal_name: str
+    ) -> Iterator[tuple]:
+        """从原始数据表中读取名称匹配键与指定期刊一致的记录（用于未建立趋势文档表的旧数据库）"""
+        key = name_key(journal_name)
+        # 先用名称中最长的词做 LIKE 预筛选（"and" 可能来自原名中的 "&"，不用于预筛选），再按名称匹配键精确比较
+        word = max((w for w in key.split() if w != "and"), key=len, default="")
+        cursor = conn.cursor()
+        for schema in catalog.journal_tables():
+            cursor.execute(
+                f'SELECT {schema.select_list(INFO_FIELDS + ("is_top",))} FROM "{schema.name}" '
+                f"WHERE Journal LIKE ? ESCAPE '\\'",
+                [_like_pattern(word)],
+            )
+            for name, impact_factor, partition, category, warning, ccf_level, top in cursor.fetchall():
+                if name_key(name) == key:
+                    yield (
+                        schema.source, schema.year, name, partition, category, warning, ccf_level,
+                        parse_impact_factor(impact_factor), partition_rank(partition),
+                        int(is_top_partition(partition, top)),
+                    )
+    
+    def _get_category_index(self, conn: PooledConnection) -> CategoryIndex:
+        """获取排名表的学科目录，数据代次变化时重新加载"""
+        catalog = self._get_catalog(conn)
+        if not catalog.has_rankings:
+            raise ValueError("学科排名需要预先计算的排名表，请先运行 jcr-mcp-sync 同步数据")
+        index = self._categories
+        if index is not None and index.generation == catalog.generation:
+            return index
+        
+        with self._catalog_lock:
+            if self._categories is None or self._categories.generation != catalog.generation:
+                self._categories = CategoryIndex(
+                    conn.execute(
+                        f"SELECT category, year, MAX(rank) FROM {RANKINGS_TABLE} GROUP BY category, year"
+                    ),
+                    catalog.generation,
+                )
+            return self._categories
+    
+    @staticmethod
+    def _read_table(
+        cursor: sqlite3.Cursor, schema: TableSchema, condition: str = "", params: Iterable = ()
+    ) -> List[JournalInfo]:
+        """按本表编译好的列映射读取原始数据表，逐行按位置转换，不构建字典"""
+        query = f'SELECT {schema.select_list()} FROM "{schema.name}"'
+        if condition:
+            query += f" WHERE {condition}"
+        cursor.execute(query, list(params))
+        return list(map(schema.row_mapper(), cursor.fetchall()))
@@ -0,0 +1,96 @@
+"""
+数据库任务执行器模块
+
+工具与资源处理函数中的SQLite查询和结果格式化都是阻塞操作，统一交给有界线程池执行，
+避免一个慢查询阻塞事件循环上的其他会话；同时统计排队深度与等待时间。
+"""
+import asyncio
+import functools
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+
+class DatabaseExecutor:
+    """有界数据库线程池"""
+
+    def __init__(self, max_workers: Optional[int] = None):
+        """
+        初始化线程池
+
+        Args:
+            max_workers: 工作线程数，为None时读取环境变量 JCR_MCP_DB_WORKERS（默认8）
+        """
+        if max_workers is None:
+            max_workers = int(os.getenv("JCR_MCP_DB_WORKERS", "8"))
+        self.max_workers = max(1, max_workers)
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="jcr-db"
+        )
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._active = 0
+        self.completed = 0
+        self.failed = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.max_queued = 0
+
+    def _call(self, submitted: float, func: Callable, args: tuple, kwargs: dict) -> Any:
+        """在工作线程中执行任务并记录排队等待时间"""
+        wait_time = time.monotonic() - submitted
+        with self._lock:
+            self._queued -= 1
+            self._active += 1
+            self.total_wait += wait_time
+            if wait_time > self.max_wait:
+                self.max_wait = wait_time
+
+        try:
+            result = func(*args, **kwargs)
+        except BaseException:
+            with self._lock:
+                self.failed += 1
+            raise
+        finally:
+            with self._lock:
+                self._active -= 1
+                self.completed += 1
+        return result
+
+    async def run(self, func: Callable, *args, **kwargs) -> Any:
+        """在线程池中执行阻塞函数并等待结果"""
+        with self._lock:
+            self._queued += 1
+            if self._queued > self.max_queued:
+                self.max_queued = self._queued
+        loop = asyncio.get_running_loop()
+        call = functools.partial(self._call, time.monotonic(), func, args, kwargs)
+        try:
+            future = loop.run_in_executor(self._executor, call)
+        except RuntimeError:
+            # 线程池已关闭，任务未被提交
+            with self._lock:
+                self._queued -= 1
+            raise
+        return await future
+
+    def shutdown(self, wait: bool = True):
+        """关闭线程池"""
+        self._executor.shutdown(wait=wait)
+
+    def stats(self) -> Dict[str, Any]:
+        """获取线程池统计信息（等待时间单位为毫秒）"""
+        with self._lock:
+            return {
+                "workers": self.max_workers,
+                "queued": self._queued,
+                "active": self._active,
+                "completed": self.completed,
+                "failed": self.failed,
+                "max_queued": self.max_queued,
+                "avg_wait_ms": self.total_wait / self.completed * 1000 if self.completed else 0.0,
+                "max_wait_ms": self.max_wait * 1000,
+            }
@@ -0,0 +1,240 @@
+"""
+期刊名称模糊匹配模块
+
+加载时为所有期刊名称建立三元组倒排索引，查询时先按共享三元组数筛选候选，
+再用 Jaro-Winkler 相似度重排序，给出带分数的 "您是否要找" 建议。
+候选过多时分块交给进程池并行打分（进程池在首次需要时才创建），整个过程受时间预算约束。
+"""
+import heapq
+import multiprocessing
+import os
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .normalize import name_key
+
+
+def _grams(key: str) -> List[str]:
+    """提取两端补空格后的三元组（短词也能产生三元组）"""
+    padded = f"  {key} "
+    return [padded[i:i + 3] for i in range(len(padded) - 2)]
+
+
+def jaro_winkler(a: str, b: str, prefix_scale: float = 0.1) -> float:
+    """计算两个字符串的 Jaro-Winkler 相似度（0~1）"""
+    if a == b:
+        return 1.0
+    len_a, len_b = len(a), len(b)
+    if not len_a or not len_b:
+        return 0.0
+
+    window = max(max(len_a, len_b) // 2 - 1, 0)
+    matched_b = [False] * len_b
+    matches_a = []
+    for i, char in enumerate(a):
+        start = max(0, i - window)
+        end = min(i + window + 1, len_b)
+        for j in range(start, end):
+            if not matched_b[j] and b[j] == char:
+                matched_b[j] = True
+                matches_a.append(char)
+                break
+
+    matches = len(matches_a)
+    if not matches:
+        return 0.0
+
+    matches_b = [b[j] for j in range(len_b) if matched_b[j]]
+    transpositions = sum(x != y for x, y in zip(matches_a, matches_b)) // 2
+    jaro = (matches / len_a + matches / len_b + (matches - transpositions) / matches) / 3
+
+    prefix = 0
+    for x, y in zip(a[:4], b[:4]):
+        if x != y:
+            break
+        prefix += 1
+    return jaro + prefix * prefix_scale * (1 - jaro)
+
+
+def _score_chunk(query: str, keys: Sequence[str], min_score: float) -> List[Tuple[int, float]]:
+    """为一批候选打分（进程池工作函数），返回 (块内序号, 分数)"""
+    scored = []
+    for index, key in enumerate(keys):
+        score = jaro_winkler(query, key)
+        if score >= min_score:
+            scored.append((index, score))
+    return scored
+
+
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_lock = threading.Lock()
+_workers = int(os.getenv("JCR_MCP_FUZZY_WORKERS", "0")) or min(4, os.cpu_count() or 1)
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    """延迟创建打分进程池（spawn 方式，避免在多线程服务进程中 fork）"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(
+                max_workers=_workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        return _executor
+
+
+def _executor_started() -> bool:
+    """打分进程池是否已经创建"""
+    with _executor_lock:
+        return _executor is not None
+
+
+def _reset_executor():
+    """丢弃已损坏的进程池，下次使用时重建"""
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+class FuzzyIndex:
+    """期刊名称的三元组候选索引（只读，按数据代次整体替换）"""
+
+    # 按三元组 Dice 系数保留的最大候选数
+    max_candidates = 1000
+    # 候选数超过该值时分块交给进程池打分。串行为 max_candidates 个候选打分约需60ms，
+    # 远在默认200ms预算之内，进程间传参的开销抵消了并行收益，故默认与候选上限相同（不并行）
+    parallel_threshold = 1000
+
+    def __init__(self, names: Iterable[str], generation: Tuple = ()):
+        """
+        构建索引
+
+        Args:
+            names: 期刊显示名称（按名称匹配键去重，保留首次出现的写法）
+            generation: 数据代次标识
+        """
+        self.generation = generation
+        self.names: List[str] = []
+        self.keys: List[str] = []
+        self.gram_counts: List[int] = []
+        self.postings: Dict[str, List[int]] = {}
+
+        seen = set()
+        for name in names:
+            key = name_key(name)
+            if not key or key in seen:
+                continue
+            seen.add(key)
+            name_id = len(self.keys)
+            self.names.append(str(name).strip())
+            self.keys.append(key)
+            grams = set(_grams(key))
+            self.gram_counts.append(len(grams))
+            for gram in grams:
+                self.postings.setdefault(gram, []).append(name_id)
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def candidates(self, key: str, min_overlap: float = 0.3) -> List[int]:
+        """按共享三元组的 Dice 系数筛选候选名称编号，最多保留 max_candidates 个"""
+        grams = set(_grams(key))
+        shared = Counter()
+        for gram in grams:
+            shared.update(self.postings.get(gram, ()))
+
+        total = len(grams)
+        gram_counts = self.gram_counts
+        scored = [
+            (2 * count / (total + gram_counts[name_id]), name_id)
+            for name_id, count in shared.items()
+        ]
+        return [
+            name_id for dice, name_id in heapq.nlargest(self.max_candidates, scored)
+            if dice >= min_overlap
+        ]
+
+    def suggest(
+        self,
+        journal_name: str,
+        limit: int = 5,
+        min_score: float = 0.8,
+        budget: float = 0.2,
+    ) -> List[Tuple[str, float]]:
+        """
+        给出与输入名称最相似的期刊名称
+
+        Args:
+            journal_name: 输入的期刊名称（可含拼写错误）
+            limit: 最多返回的建议数
+            min_score: 最低 Jaro-Winkler 相似度
+            budget: 时间预算（秒），超时后返回已完成部分的最佳结果
+
+        Returns:
+            (期刊名称, 相似度) 列表，按相似度降序排列
+        """
+        key = name_key(journal_name)
+        if not key:
+            return []
+
+        deadline = time.monotonic() + budget
+        candidates = self.candidates(key)
+        if len(candidates) > self.parallel_threshold and _workers > 1 and not _executor_started():
+            # 首次需要并行时才在后台启动进程池，本次查询仍串行打分，避免预算耗在进程启动上
+            _get_executor().submit(jaro_winkler, "", "")
+            scored = self._score_serial(key, candidates, min_score, deadline)
+        elif len(candidates) > self.parallel_threshold and _workers > 1:
+            try:
+                scored = self._score_parallel(key, candidates, min_score, deadline)
+            except BrokenProcessPool:
+                _reset_executor()
+                scored = self._score_serial(key, candidates, min_score, deadline)
+        else:
+            scored = self._score_serial(key, candidates, min_score, deadline)
+
+        scored.sort(key=lambda item: (-item[1], self.names[item[0]]))
+        return [(self.names[name_id], round(score, 3)) for name_id, score in scored[:limit]]
+
+    def _score_serial(
+        self, key: str, candidates: List[int], min_score: float, deadline: float
+    ) -> List[Tuple[int, float]]:
+        """在当前进程内打分，每256个候选检查一次时间预算"""
+        scored = []
+        keys = self.keys
+        for position, name_id in enumerate(candidates):
+            if position % 256 == 0 and time.monotonic() > deadline:
+                break
+            score = jaro_winkler(key, keys[name_id])
+            if score >= min_score:
+                scored.append((name_id, score))
+        return scored
+
+    def _score_parallel(
+        self, key: str, candidates: List[int], min_score: float, deadline: float
+    ) -> List[Tuple[int, float]]:
+        """分块提交进程池打分，只收集预算内完成的块"""
+        executor = _get_executor()
+        size = -(-len(candidates) // _workers)
+        chunks = [candidates[i:i + size] for i in range(0, len(candidates), size)]
+        futures = {
+            executor.submit(_score_chunk, key, [self.keys[n] for n in chunk], min_score): chunk
+            for chunk in chunks
+        }
+        done, not_done = wait(futures, timeout=max(deadline - time.monotonic(), 0))
+        for future in not_done:
+            future.cancel()
+
+        scored = []
+        for future in done:
+            if future.exception() is not None:
+                if isinstance(future.exception(), BrokenProcessPool):
+                    raise future.exception()
+                continue
+            chunk = futures[future]
+            scored.extend((chunk[index], score) for index, score in future.result())
+        return scored
@@ -0,0 +1,224 @@
+"""
+存活/就绪探针模块
+
+存活探针（liveness）只报告进程信息与运行时长，不做任何I/O；
+就绪探针（readiness）报告数据代次、数据新鲜度以及连接池和数据库线程池的状态，
+检查结果缓存 ttl 秒，缓存期内的探测不访问数据库。
+两者既作为MCP资源提供，也可由本地HTTP探针端点（/livez、/readyz）读取，
+HTTP端点运行在独立线程中，不经过MCP传输层和数据库线程池的排队。
+多进程模式下探针端点只由主进程提供一份：数据库检查在主进程中完成，并汇总各工作进程的运行情况。
+"""
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Optional, Union
+
+STATUS_ALIVE = "alive"
+STATUS_READY = "ready"
+STATUS_NOT_READY = "not_ready"
+
+
+class HealthMonitor:
+    """存活/就绪状态（就绪检查结果按 ttl 缓存）"""
+
+    def __init__(
+        self,
+        get_db: Callable,
+        get_executor: Callable,
+        ttl: Optional[float] = None,
+        max_data_age_days: Optional[float] = None,
+        max_queued: Optional[int] = None,
+    ):
+        """
+        初始化
+
+        Args:
+            get_db: 返回 JCRDatabase 实例的函数
+            get_executor: 返回 DatabaseExecutor 实例的函数，为None时不检查线程池（多进程模式的主进程）
+            ttl: 就绪检查结果的缓存时间（秒），为None时读取环境变量 JCR_MCP_READY_TTL（默认5）
+            max_data_age_days: 数据距最后同步超过该天数即视为未就绪（0 表示不限制），
+                为None时读取环境变量 JCR_MCP_MAX_DATA_AGE_DAYS（默认0）
+            max_queued: 数据库线程池排队任务数超过该值即视为未就绪（0 表示不限制），
+                为None时读取环境变量 JCR_MCP_READY_MAX_QUEUE（默认0）
+        """
+        if ttl is None:
+            ttl = float(os.getenv("JCR_MCP_READY_TTL", "5"))
+        if max_data_age_days is None:
+            max_data_age_days = float(os.getenv("JCR_MCP_MAX_DATA_AGE_DAYS", "0"))
+        if max_queued is None:
+            max_queued = int(os.getenv("JCR_MCP_READY_MAX_QUEUE", "0"))
+        self._get_db = get_db
+        self._get_executor = get_executor
+        self.ttl = ttl
+        self.max_data_age_days = max_data_age_days
+        self.max_queued = max_queued
+        self.started = time.monotonic()
+        self._ready: Optional[Dict] = None
+        self._checked = 0.0
+        self._lock = threading.Lock()
+
+    def liveness(self) -> Dict:
+        """存活状态（不做任何I/O）"""
+        return {
+            "status": STATUS_ALIVE,
+            "pid": os.getpid(),
+            "uptime_s": round(time.monotonic() - self.started, 1),
+        }
+
+    def cached_readiness(self) -> Optional[Dict]:
+        """缓存期内的就绪状态，已过期或尚未检查时返回None"""
+        report = self._ready
+        if report is not None and time.monotonic() - self._checked < self.ttl:
+            return report
+        return None
+
+    def readiness(self) -> Dict:
+        """就绪状态（缓存过期时重新检查，并发探测只检查一次）"""
+        report = self.cached_readiness()
+        if report is not None:
+            return report
+
+        with self._lock:
+            report = self.cached_readiness()
+            if report is None:
+                report = self._check()
+                self._ready, self._checked = report, time.monotonic()
+            return report
+
+    def _check(self) -> Dict:
+        """
+        检查是否就绪
+
+        从连接池借用一个连接确认数据代次（同时验证连接池可用），数据库概况取自
+        按数据代次缓存的同步元数据，不扫描数据表。
+        """
+        report: Dict = {"status": STATUS_READY, "pid": os.getpid(), "checked_at": datetime.now().isoformat()}
+        problems = []
+        try:
+            database = self._get_db()
+            info = database.database_info()
+        except Exception as e:
+            report.update(status=STATUS_NOT_READY, problems=[f"数据库不可用: {e}"])
+            return report
+
+        report["generation"] = list(info.generation)
+        report["sources"] = {source: years[0] for source, years in sorted(info.source_years.items())}
+        report["last_synced"] = info.last_updated
+        if not info.source_years:
+            problems.append("数据库中没有期刊数据，请先运行 jcr-mcp-sync 同步数据")
+
+        age_days = None
+        if info.last_updated:
+            try:
+                age_days = (datetime.now() - datetime.fromisoformat(info.last_updated)).total_seconds() / 86400
+            except ValueError:
+                pass
+        report["data_age_days"] = None if age_days is None else round(age_days, 1)
+        report["stale"] = bool(self.max_data_age_days) and (age_days is None or age_days > self.max_data_age_days)
+        if report["stale"]:
+            problems.append(f"数据超过 {self.max_data_age_days:g} 天未同步")
+
+        pool = database.pool_stats()
+        report["pool"] = {key: pool[key] for key in ("idle", "in_use", "hits", "misses", "discarded")}
+        if self._get_executor is not None:
+            tasks = self._get_executor().stats()
+            report["executor"] = {key: tasks[key] for key in ("workers", "active", "queued", "max_queued")}
+            if self.max_queued and tasks["queued"] > self.max_queued:
+                problems.append(f"数据库线程池排队任务过多（{tasks['queued']} > {self.max_queued}）")
+
+        if problems:
+            report.update(status=STATUS_NOT_READY, problems=problems)
+        return report
+
+
+class SupervisorMonitor:
+    """
+    多进程模式下主进程的存活/就绪状态
+
+    工作进程共享同一个数据库文件，数据库相关检查由主进程的 HealthMonitor 完成一次；
+    工作进程状态取自监控器。平滑重启期间会短暂少一个工作进程，只要仍有工作进程在
+    共享端口上 accept 连接即视为就绪，正在停止或没有工作进程运行时视为未就绪。
+    各工作进程内部的线程池排队情况不在主进程中汇总。
+    """
+
+    def __init__(self, monitor: HealthMonitor, get_workers: Callable[[], Dict]):
+        """
+        初始化
+
+        Args:
+            monitor: 主进程中检查数据库的 HealthMonitor（不检查线程池）
+            get_workers: 返回工作进程状态的函数，见 WorkerSupervisor.status
+        """
+        self.monitor = monitor
+        self._get_workers = get_workers
+
+    def liveness(self) -> Dict:
+        """存活状态：主进程在运行即存活（工作进程退出时由主进程重启）"""
+        report = self.monitor.liveness()
+        report["workers"] = self._get_workers()
+        return report
+
+    def readiness(self) -> Dict:
+        """就绪状态：数据库检查结果（按 ttl 缓存）加上当前的工作进程状态"""
+        report = dict(self.monitor.readiness())
+        workers = report["workers"] = self._get_workers()
+        problems = list(report.get("problems", ()))
+        if workers["stopping"]:
+            problems.append("服务正在停止")
+        elif not workers["running"]:
+            problems.append("没有运行中的工作进程")
+        if problems:
+            report.update(status=STATUS_NOT_READY, problems=problems)
+        return report
+
+
+class _ProbeHandler(BaseHTTPRequestHandler):
+    """探针请求处理：GET /livez、/readyz，就绪时返回200，否则返回503"""
+
+    def do_GET(self):
+        monitor = self.server.monitor
+        path = self.path.split("?", 1)[0].rstrip("/")
+        if path == "/livez":
+            report, ok = monitor.liveness(), True
+        elif path == "/readyz":
+            report = monitor.readiness()
+            ok = report["status"] == STATUS_READY
+        else:
+            self.send_error(404)
+            return
+
+        body = json.dumps(report, ensure_ascii=False).encode("utf-8")
+        self.send_response(200 if ok else 503)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        """探测频繁，不输出访问日志"""
+
+
+class _ProbeServer(ThreadingHTTPServer):
+    """探针HTTP服务"""
+
+    daemon_threads = True
+
+
+def start_probe_server(
+    monitor: Union[HealthMonitor, SupervisorMonitor], host: str, port: int
+) -> ThreadingHTTPServer:
+    """
+    在后台线程中启动探针HTTP服务
+
+    Raises:
+        OSError: 端口无法绑定
+    """
+    server = _ProbeServer((host, port), _ProbeHandler)
+    server.monitor = monitor
+    thread = threading.Thread(target=server.serve_forever, name="jcr-probe", daemon=True)
+    thread.start()
+    return server
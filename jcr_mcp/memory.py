@@ -0,0 +1,290 @@
+"""
+内存列式快照模块
+
+将全部期刊记录一次性加载为紧凑的列数组（字典编码的字符串列、浮点影响因子列、
+小整数编码列），并建立名称键哈希索引和三元组子串索引，
+查询完全在内存中完成。快照同时保存加载时的表结构目录和期刊趋势文档，
+趋势查询与期刊对比同样不访问SQLite。
+"""
+import json
+import math
+import sqlite3
+import sys
+from array import array
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from .catalog import INFO_FIELDS, ISSN_TABLE, RECORDS_TABLE, TRENDS_TABLE, SchemaCatalog, YearFilter
+from .models import JournalInfo, SearchResult, MATCH_EXACT, MATCH_SUBSTRING
+from .normalize import match_rank, name_key, normalize_name, split_issns
+
+
+class _DictColumn:
+    """字典编码的字符串列：每行只存一个小整数编码"""
+
+    def __init__(self, typecode: str = "H"):
+        self.values: List[Optional[str]] = [None]
+        self.codes = array(typecode)
+        self._index: Dict[Optional[str], int] = {None: 0}
+
+    def append(self, value) -> int:
+        if value is not None:
+            value = sys.intern(str(value))
+        code = self._index.get(value)
+        if code is None:
+            code = len(self.values)
+            self._index[value] = code
+            self.values.append(value)
+        self.codes.append(code)
+        return code
+
+    def code_of(self, value: Optional[str]) -> Optional[int]:
+        """获取某个取值的编码，不存在时返回None"""
+        return self._index.get(value)
+
+    def __getitem__(self, row: int) -> Optional[str]:
+        return self.values[self.codes[row]]
+
+
+def _trigrams(text: str) -> Set[str]:
+    """提取字符串的三元组集合"""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class MemorySnapshot:
+    """期刊数据的内存列式快照（只读，按数据代次整体替换）"""
+
+    def __init__(self, generation: Tuple = (), catalog: Optional[SchemaCatalog] = None):
+        self.generation = generation
+        self.catalog = catalog
+
+        # 列数组
+        self.journal_ids = array("I")
+        self.years = array("H")
+        self.impact_factors = array("d")
+        self.sources = _DictColumn("B")
+        self.partitions = _DictColumn()
+        self.categories = _DictColumn()
+        self.warnings = _DictColumn("B")
+        self.ccf_levels = _DictColumn("B")
+        self.journal_names = _DictColumn("I")
+        self.name_ids = array("I")
+        # 无法解析为数值的原始影响因子文本（如 "<0.1"）
+        self.impact_factor_text: Dict[int, str] = {}
+
+        # 名称与索引
+        self.names: List[str] = []
+        self._name_index: Dict[str, int] = {}
+        self.name_rows: List[List[int]] = []
+        self.key_journals: Dict[str, List[int]] = {}
+        self.journal_rows: Dict[int, List[int]] = {}
+        self.issn_journals: Dict[str, List[int]] = {}
+        self.trigram_names: Dict[str, List[int]] = {}
+        self.latest_years: Dict[str, int] = {}
+        # journal_id -> 趋势文档（JSON文本，读取时解析，调用方得到独立的副本）
+        self.has_trends = False
+        self.trend_documents: Dict[int, str] = {}
+
+    def __len__(self) -> int:
+        return len(self.journal_ids)
+
+    @classmethod
+    def load(
+        cls, conn: sqlite3.Connection, catalog: SchemaCatalog, generation: Tuple = ()
+    ) -> "MemorySnapshot":
+        """
+        从数据库加载快照
+
+        存在 journal_records 统一表时一次查询加载，否则按列映射逐表读取原始数据表；
+        存在当前版本的趋势文档表时一并加载全部趋势文档。
+        """
+        snapshot = cls(generation, catalog)
+        snapshot.latest_years = catalog.latest_years()
+
+        if catalog.has_records:
+            rows = conn.execute(
+                "SELECT journal_id, source, year, journal_name, normalized_name, name_key, "
+                "impact_factor, partition, category, warning, ccf_level "
+                f"FROM {RECORDS_TABLE} ORDER BY journal_id, year, source"
+            )
+            for row in rows:
+                snapshot._append(*row)
+            if catalog.has_issn:
+                for issn, journal_id in conn.execute(f"SELECT issn, journal_id FROM {ISSN_TABLE}"):
+                    snapshot.issn_journals.setdefault(issn, []).append(journal_id)
+        else:
+            snapshot._load_tables(conn, catalog)
+
+        if catalog.has_trends:
+            snapshot.has_trends = True
+            snapshot.trend_documents = dict(conn.execute(f"SELECT journal_id, document FROM {TRENDS_TABLE}"))
+
+        snapshot._build_indexes()
+        return snapshot
+
+    def _load_tables(self, conn: sqlite3.Connection, catalog: SchemaCatalog):
+        """逐表读取原始数据表，按名称匹配键分配期刊编号"""
+        key_ids: Dict[str, int] = {}
+        fields = INFO_FIELDS + ("issn", "eissn")
+
+        for schema in catalog.journal_tables():
+            for name, impact_factor, partition, category, warning, ccf_level, issn, eissn in conn.execute(
+                f'SELECT {schema.select_list(fields)} FROM "{schema.name}"'
+            ):
+                key = name_key(name)
+                if not key:
+                    continue
+                journal_id = key_ids.setdefault(key, len(key_ids) + 1)
+                self._append(
+                    journal_id, schema.source, schema.year, str(name).strip(),
+                    normalize_name(name), key, impact_factor, partition, category,
+                    warning, ccf_level,
+                )
+                for value in split_issns(issn) + split_issns(eissn):
+                    journal_ids = self.issn_journals.setdefault(value, [])
+                    if journal_id not in journal_ids:
+                        journal_ids.append(journal_id)
+
+    def _append(
+        self, journal_id, source, year, journal_name, normalized, key,
+        impact_factor, partition, category, warning, ccf_level,
+    ):
+        """追加一行记录"""
+        row = len(self.journal_ids)
+        self.journal_ids.append(journal_id)
+        self.years.append(int(year))
+        self.sources.append(source)
+        self.journal_names.append(journal_name)
+        self.partitions.append(partition)
+        self.categories.append(category)
+        self.warnings.append(warning)
+        self.ccf_levels.append(ccf_level)
+
+        try:
+            value = float(impact_factor) if impact_factor is not None else math.nan
+        except (TypeError, ValueError):
+            value = math.nan
+            self.impact_factor_text[row] = str(impact_factor)
+        self.impact_factors.append(value)
+
+        name_id = self._name_index.get(normalized)
+        if name_id is None:
+            name_id = len(self.names)
+            self._name_index[normalized] = name_id
+            self.names.append(sys.intern(normalized))
+            self.name_rows.append([])
+        self.name_ids.append(name_id)
+        self.name_rows[name_id].append(row)
+
+        self.journal_rows.setdefault(journal_id, []).append(row)
+        journal_ids = self.key_journals.setdefault(key, [])
+        if journal_id not in journal_ids:
+            journal_ids.append(journal_id)
+
+    def _build_indexes(self):
+        """构建三元组子串索引（前缀补全由按数据代次构建的 CompletionIndex 提供，两种引擎共用）"""
+        trigram_names: Dict[str, List[int]] = {}
+        for name_id, name in enumerate(self.names):
+            for gram in _trigrams(name):
+                trigram_names.setdefault(gram, []).append(name_id)
+        self.trigram_names = trigram_names
+
+    def info(self, row: int) -> JournalInfo:
+        """将一行记录物化为期刊信息对象"""
+        impact_factor = self.impact_factors[row]
+        if math.isnan(impact_factor):
+            impact_factor = self.impact_factor_text.get(row)
+        return JournalInfo(
+            self.journal_names[row], impact_factor, self.partitions[row], self.categories[row],
+            self.warnings[row], self.ccf_levels[row], str(self.years[row]), self.journal_ids[row],
+        )
+
+    def _year_match(self, row: int, years: Optional[YearFilter]) -> bool:
+        if years is None:
+            return True
+        return years.matches(self.sources[row], self.years[row], self.latest_years)
+
+    def _materialize(self, rows: Iterable[int], years: Optional[YearFilter]) -> List[JournalInfo]:
+        """按 (journal_id, year, source) 排序并物化满足年份条件的记录"""
+        selected = [row for row in rows if self._year_match(row, years)]
+        selected.sort(key=lambda row: (self.journal_ids[row], self.years[row], self.sources[row]))
+        return [self.info(row) for row in selected]
+
+    def match_names(self, text: str) -> List[int]:
+        """子串匹配规范化名称，返回名称编号（通过三元组索引过滤候选）"""
+        needle = normalize_name(text)
+        if len(needle) < 3:
+            return [name_id for name_id, name in enumerate(self.names) if needle in name]
+
+        candidates = None
+        for gram in sorted(_trigrams(needle), key=lambda g: len(self.trigram_names.get(g, ()))):
+            postings = self.trigram_names.get(gram)
+            if not postings:
+                return []
+            candidates = set(postings) if candidates is None else candidates.intersection(postings)
+            if not candidates:
+                return []
+        return [name_id for name_id in candidates if needle in self.names[name_id]]
+
+    def search(
+        self,
+        journal_name: str,
+        years: Optional[YearFilter] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+    ) -> SearchResult:
+        """
+        先按名称匹配键精确查找，未命中再做子串匹配
+
+        子串匹配的期刊按匹配等级（完全相同 > 前缀 > 子串）和名称排序，
+        limit/offset 按期刊（而非记录）分页。
+        """
+        end = None if limit is None else offset + limit
+
+        by_journal: Dict[int, List[int]] = {}
+        for journal_id in self.key_journals.get(name_key(journal_name), []):
+            rows = [row for row in self.journal_rows[journal_id] if self._year_match(row, years)]
+            if rows:
+                by_journal[journal_id] = rows
+        if by_journal:
+            page = sorted(by_journal)[offset:end]
+            rows = [row for journal_id in page for row in by_journal[journal_id]]
+            return SearchResult(self._materialize(rows, None), MATCH_EXACT, len(by_journal))
+
+        needle = normalize_name(journal_name)
+        ranked: Dict[int, Tuple[int, str]] = {}
+        for name_id in self.match_names(journal_name):
+            name = self.names[name_id]
+            rank = match_rank(name, needle)
+            for row in self.name_rows[name_id]:
+                if not self._year_match(row, years):
+                    continue
+                journal_id = self.journal_ids[row]
+                by_journal.setdefault(journal_id, []).append(row)
+                # 与SQL一致：等级和排序名称分别取该期刊所有命中名称的最小值
+                best = ranked.get(journal_id)
+                ranked[journal_id] = (rank, name) if best is None else (min(best[0], rank), min(best[1], name))
+
+        page = sorted(ranked, key=lambda journal_id: ranked[journal_id] + (journal_id,))[offset:end]
+        journals = []
+        for journal_id in page:
+            rows = sorted(by_journal[journal_id], key=lambda row: (self.years[row], self.sources[row]))
+            journals.extend(self.info(row) for row in rows)
+        return SearchResult(journals, MATCH_SUBSTRING, len(ranked))
+
+    def get_by_issn(self, issns: List[str]) -> Dict[str, List[JournalInfo]]:
+        """按规范化ISSN查找期刊的全部记录"""
+        by_issn = {}
+        for issn in issns:
+            rows = [
+                row
+                for journal_id in self.issn_journals.get(issn, [])
+                for row in self.journal_rows.get(journal_id, [])
+            ]
+            if rows:
+                by_issn[issn] = self._materialize(rows, None)
+        return by_issn
+
+    def trend(self, journal_id: Optional[int]) -> Optional[dict]:
+        """按 journal_id 读取趋势文档，未找到时返回None"""
+        document = self.trend_documents.get(journal_id)
+        return json.loads(document) if document is not None else None
@@ -0,0 +1,92 @@
+"""
+期刊数据模型模块
+"""
+from dataclasses import dataclass, field
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+
+class JournalInfo(NamedTuple):
+    """
+    期刊信息（基于元组，查询结果可按位置直接构造，不为每行分配字典）
+
+    字段顺序与 journal_records 查询列及原始数据表的列映射顺序一致。
+    """
+    journal_name: str
+    impact_factor: Optional[float] = None
+    partition: Optional[str] = None
+    category: Optional[str] = None
+    warning_status: Optional[str] = None
+    ccf_level: Optional[str] = None
+    year: Optional[str] = None
+    journal_id: Optional[int] = None
+
+
+class Completion(NamedTuple):
+    """期刊名称前缀补全结果（附带最新分区与影响因子）"""
+    journal_name: str
+    partition: Optional[str] = None
+    partition_year: Optional[str] = None
+    impact_factor: Optional[float] = None
+    impact_factor_year: Optional[str] = None
+    journal_id: Optional[int] = None
+
+
+class RankedJournal(NamedTuple):
+    """学科影响因子排名中的一个期刊"""
+    rank: int
+    journal_name: str
+    impact_factor: float
+    # 影响因子所属的JCR年份（中科院学科排名取不晚于排名年份的最近一年）
+    if_year: int
+    partition: Optional[str] = None
+    source: Optional[str] = None
+    journal_id: Optional[int] = None
+
+
+@dataclass
+class Ranking:
+    """某一学科、年份的影响因子排名（前 n 名）"""
+    category: str
+    year: int
+    journals: List[RankedJournal] = field(default_factory=list)
+    # 该学科、年份下参与排名的期刊总数
+    total: int = 0
+
+
+class TableInfo(NamedTuple):
+    """数据库中的一张数据表"""
+    name: str
+    # 同步元数据中记录的记录数与更新时间（未经同步任务写入的表为None）
+    record_count: Optional[int] = None
+    last_updated: Optional[str] = None
+    # 重新统计的实际记录数（仅校验时填写）
+    counted: Optional[int] = None
+
+
+@dataclass
+class DatabaseInfo:
+    """数据库概况（来自同步元数据与表结构目录，按数据代次缓存）"""
+    db_path: str
+    size_bytes: int = 0
+    tables: List[TableInfo] = field(default_factory=list)
+    # 来源类型 -> 年份（降序）
+    source_years: Dict[str, List[int]] = field(default_factory=dict)
+    last_updated: Optional[str] = None
+    generation: Tuple = ()
+    # 是否已逐表重新统计记录数
+    verified: bool = False
+
+
+# 查询命中的匹配路径
+MATCH_EXACT = "exact"
+MATCH_SUBSTRING = "substring"
+
+
+@dataclass
+class SearchResult:
+    """期刊搜索结果"""
+    journals: List[JournalInfo] = field(default_factory=list)
+    # 实际服务本次查询的匹配路径: exact（规范化名称键精确匹配）或 substring（子串匹配）
+    match_type: str = MATCH_SUBSTRING
+    # 命中的期刊总数（分页前），None 表示未统计
+    total: Optional[int] = None
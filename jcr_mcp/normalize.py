@@ -0,0 +1,132 @@
+"""
+期刊名称与标识规范化模块
+
+同步任务建表与查询时共用同一套规范化规则，保证两端的键一致。
+"""
+import re
+from typing import List, Optional
+
+
+_WHITESPACE_RE = re.compile(r"\s+")
+_PUNCTUATION_RE = re.compile(r"[^\w\s]|_")
+_LEADING_THE_RE = re.compile(r"^the\s+")
+_ISSN_RE = re.compile(r"^\d{7}[\dX]$")
+
+
+def normalize_name(name: Optional[str]) -> str:
+    """
+    规范化期刊名称（用于子串搜索）
+
+    统一大小写并合并空白字符，如 "  Nature   Communications" -> "nature communications"
+    """
+    if not name:
+        return ""
+    return _WHITESPACE_RE.sub(" ", str(name)).strip().casefold()
+
+
+def name_key(name: Optional[str]) -> str:
+    """
+    计算期刊名称的精确匹配键
+
+    在 normalize_name 的基础上统一 "&"/"and"、去除标点及开头的 "The"，
+    如 "The Journal of Physical Chemistry. A" -> "journal of physical chemistry a"
+    """
+    key = normalize_name(name).replace("&", " and ")
+    key = _PUNCTUATION_RE.sub(" ", key)
+    key = _WHITESPACE_RE.sub(" ", key).strip()
+    return _LEADING_THE_RE.sub("", key)
+
+
+def match_rank(normalized: str, needle: str) -> int:
+    """
+    计算名称匹配等级，用于排序：0 完全相同，1 前缀匹配，2 子串匹配
+
+    Args:
+        normalized: 规范化后的期刊名称
+        needle: 规范化后的查询串
+    """
+    if normalized == needle:
+        return 0
+    if normalized.startswith(needle):
+        return 1
+    return 2
+
+
+def normalize_issn(value: Optional[str]) -> Optional[str]:
+    """
+    规范化单个ISSN，忽略连字符与大小写
+
+    Returns:
+        8位ISSN（如 "00280836"），无效值返回None
+    """
+    if not value:
+        return None
+    issn = re.sub(r"[\s\-]", "", str(value)).upper()
+    return issn if _ISSN_RE.match(issn) else None
+
+
+def split_issns(value: Optional[str]) -> List[str]:
+    """
+    拆分并规范化可能包含多个ISSN的字段，如 "0028-0836/1476-4687"
+
+    Returns:
+        去重后的有效ISSN列表
+    """
+    if not value:
+        return []
+    issns = []
+    for part in re.split(r"[/,;|]", str(value)):
+        issn = normalize_issn(part)
+        if issn and issn not in issns:
+            issns.append(issn)
+    return issns
+
+
+_PARTITION_RANK_RE = re.compile(r"^(?:q)?([1-4])(?!\d)")
+_TOP_VALUES = {"是", "top", "yes", "y", "true", "1"}
+
+
+def parse_impact_factor(value) -> Optional[float]:
+    """
+    解析影响因子为数值
+
+    pandas 推断出的数值直接返回；文本形式的数字（如 "12.5"）转换为数值；
+    "<0.1"、"N/A" 等无法比较大小的取值返回None。
+    """
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        number = float(value)
+    else:
+        try:
+            number = float(str(value).strip())
+        except ValueError:
+            return None
+    return number if number == number else None
+
+
+def partition_rank(partition: Optional[str]) -> Optional[int]:
+    """
+    分区等级：Q1、1区、"1区 Top"、"1 [3/45]" 均为 1，依此类推
+
+    Returns:
+        1-4，无法识别时返回None
+    """
+    if partition is None:
+        return None
+    match = _PARTITION_RANK_RE.match(re.sub(r"\s+", "", str(partition)).casefold())
+    return int(match.group(1)) if match else None
+
+
+def is_top_partition(partition: Optional[str], top=None) -> bool:
+    """是否为Top期刊：中科院分区表的 Top 列为"是"，或分区文本中带有 Top 字样"""
+    if top is not None and str(top).strip().casefold() in _TOP_VALUES:
+        return True
+    return partition is not None and "top" in str(partition).casefold()
+
+
+def quartile_code(source: str, rank: Optional[int]) -> Optional[str]:
+    """规范化分区代码：JCR 为 Q1-Q4，中科院分区表为 1区-4区"""
+    if rank is None:
+        return None
+    return f"Q{rank}" if source == "JCR" else f"{rank}区"
@@ -0,0 +1,52 @@
+"""
+分页游标模块
+
+游标对客户端不透明，内部记录下一页的偏移量和查询指纹，
+防止把一个查询的游标误用到另一个查询上。
+"""
+import base64
+import hashlib
+import json
+from typing import Optional
+
+
+def _fingerprint(*scope) -> str:
+    """计算查询参数的短指纹"""
+    text = json.dumps(scope, ensure_ascii=False, default=str)
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()[:12]
+
+
+def encode_cursor(offset: int, *scope) -> str:
+    """
+    生成分页游标
+
+    Args:
+        offset: 下一页的起始偏移量
+        scope: 查询参数（如规范化名称、年份），用于校验游标
+    """
+    payload = json.dumps({"o": offset, "f": _fingerprint(*scope)}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str], *scope) -> int:
+    """
+    解析分页游标
+
+    Returns:
+        游标对应的偏移量，未提供游标时为0
+
+    Raises:
+        ValueError: 游标无效或不属于当前查询
+    """
+    if not cursor:
+        return 0
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        offset = int(payload["o"])
+        fingerprint = payload["f"]
+    except (ValueError, KeyError, TypeError):
+        raise ValueError("无效的分页游标")
+    if offset < 0 or fingerprint != _fingerprint(*scope):
+        raise ValueError("分页游标与当前查询条件不匹配")
+    return offset
@@ -0,0 +1,151 @@
+"""
+SQLite只读连接池模块
+"""
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+
+class PooledConnection(sqlite3.Connection):
+    """连接池中的连接（子类化以便附加连接级状态）"""
+    
+    # 该连接上最近一次观察到的 PRAGMA data_version 及对应的数据代次
+    data_version: Optional[int] = None
+    generation: Optional[Tuple] = None
+
+
+class ConnectionPool:
+    """
+    只读SQLite连接池
+
+    每个线程（或任务）在使用期间独占一个连接，用完后归还池中复用。
+    连接以 mode=ro 打开，PRAGMA 只在创建连接时设置一次。
+    immutable 为 True 时追加 immutable=1：SQLite 不再加锁、不检查日志文件与外部修改，
+    多个服务进程可以无锁竞争地共享同一份页缓存中的数据库文件。
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        max_idle: int = 8,
+        cache_size_kib: int = 16384,
+        mmap_size: int = 256 * 1024 * 1024,
+        immutable: bool = False,
+    ):
+        """
+        初始化连接池
+
+        Args:
+            db_path: 数据库文件路径
+            max_idle: 池中最多保留的空闲连接数
+            cache_size_kib: 每个连接的页缓存大小（KiB）
+            mmap_size: 每个连接的内存映射大小（字节）
+            immutable: 是否以不可变方式打开（数据库文件在服务期间不会被修改）
+        """
+        self.db_path = db_path
+        self.max_idle = max_idle
+        self.cache_size_kib = cache_size_kib
+        self.mmap_size = mmap_size
+        self.immutable = immutable
+
+        self._idle: List[PooledConnection] = []
+        self._lock = threading.Lock()
+        self._in_use = 0
+        self.hits = 0
+        self.misses = 0
+        self.discarded = 0
+
+    def _uri(self) -> str:
+        """构建只读连接URI"""
+        uri = Path(self.db_path).resolve().as_uri() + "?mode=ro"
+        if self.immutable:
+            uri += "&immutable=1"
+        return uri
+
+    def _connect(self) -> PooledConnection:
+        """创建新连接并设置PRAGMA"""
+        conn = sqlite3.connect(
+            self._uri(),
+            uri=True,
+            check_same_thread=False,
+            factory=PooledConnection,
+        )
+        conn.execute(f"PRAGMA cache_size = -{int(self.cache_size_kib)}")
+        conn.execute(f"PRAGMA mmap_size = {int(self.mmap_size)}")
+        conn.execute("PRAGMA query_only = ON")
+        return conn
+
+    def acquire(self) -> PooledConnection:
+        """从池中取出一个连接，没有空闲连接时新建"""
+        with self._lock:
+            if self._idle:
+                conn = self._idle.pop()
+                self.hits += 1
+                self._in_use += 1
+                return conn
+            self.misses += 1
+            self._in_use += 1
+
+        try:
+            return self._connect()
+        except Exception:
+            with self._lock:
+                self._in_use -= 1
+            raise
+
+    def release(self, conn: PooledConnection):
+        """归还连接，连接不可用或池已满时关闭"""
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+        except sqlite3.Error:
+            self._discard(conn)
+            return
+
+        with self._lock:
+            self._in_use -= 1
+            if len(self._idle) < self.max_idle:
+                self._idle.append(conn)
+                return
+            self.discarded += 1
+
+        conn.close()
+
+    def _discard(self, conn: PooledConnection):
+        """丢弃损坏的连接"""
+        with self._lock:
+            self._in_use -= 1
+            self.discarded += 1
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+
+    @contextmanager
+    def connection(self) -> Iterator[PooledConnection]:
+        """以上下文管理器方式借用连接，出错时也保证归还"""
+        conn = self.acquire()
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    def close(self):
+        """关闭所有空闲连接"""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+    def stats(self) -> Dict[str, int]:
+        """获取连接池统计信息"""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "idle": len(self._idle),
+                "in_use": self._in_use,
+                "discarded": self.discarded,
+            }
@@ -0,0 +1,304 @@
+"""
+期刊条件查询模块
+
+解析 "category=计算机科学; partition=1区; if>5; warning=none" 形式的过滤条件，
+并按统计信息估算每个条件命中的记录数，为执行器给出先后顺序：
+选择性最高的条件先走各自的索引取出期刊编号集合，之后的条件按候选集大小
+决定是同样走索引取集合再求交集，还是只在候选期刊的记录上逐一校验。
+学科、分区、Top 等描述单条记录的条件合并后由同一条记录同时满足。
+"""
+import re
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+from .normalize import partition_rank, quartile_code
+
+
+# 过滤字段别名 -> journal_records 列名
+FIELD_ALIASES: Dict[str, str] = {
+    "category": "category", "类别": "category", "学科": "category", "subject": "category",
+    "partition": "partition", "分区": "partition", "quartile": "partition",
+    "if": "if_value", "impact_factor": "if_value", "影响因子": "if_value",
+    "warning": "warning", "预警": "warning", "预警等级": "warning",
+    "ccf": "ccf_level", "ccf_level": "ccf_level", "ccf等级": "ccf_level",
+    "top": "is_top", "top期刊": "is_top",
+}
+
+# 按取值匹配的文本字段（quartile 为同步时规范化的分区代码，JCR为Q1-Q4，中科院为1区-4区）
+TEXT_FIELDS = ("category", "partition", "warning", "ccf_level", "quartile")
+
+# 按数值区间匹配的类型化字段（同步时解析）：影响因子、分区等级（1-4）、Top标记（0/1）
+NUMERIC_FIELDS = ("if_value", "partition_rank", "is_top")
+
+# 描述单条记录（某一来源、某一年份）的字段：同时给出的正向条件须由同一条记录满足，
+# 如 "category=计算机科学; partition=1区" 要求中科院分区表中计算机科学学科下为1区；
+# 影响因子、预警等级、CCF等级等按期刊汇总判断，可由不同来源的记录分别满足
+ROW_FIELDS = ("category", "partition", "quartile", "partition_rank", "is_top")
+
+# 表示 "无/有" 的特殊取值（如 warning=none 表示不在预警名单中）
+NONE_VALUES = {"none", "null", "无", "否", "no"}
+ANY_VALUES = {"any", "有", "是", "yes"}
+_TRUE_VALUES = ANY_VALUES | {"top", "true", "1"}
+_FALSE_VALUES = NONE_VALUES | {"false", "0"}
+
+_CONDITION_RE = re.compile(r"^\s*([^\s=!<>~]+)\s*(>=|<=|!=|=|>|<|~)\s*(.*?)\s*$")
+_SEPARATOR_RE = re.compile(r"[;；\n]|\s+and\s+|&&", re.IGNORECASE)
+
+# 排序字段别名 -> (排序键, 默认是否降序)
+SORT_KEYS: Dict[str, Tuple[str, bool]] = {
+    "if": ("if_value", True), "impact_factor": ("if_value", True), "影响因子": ("if_value", True),
+    "name": ("name", False), "名称": ("name", False),
+}
+
+# 估算命中数超过候选集的该倍数时，改为在候选期刊的记录上逐一校验
+PROBE_RATIO = 8
+
+
+def normalize_value(value) -> str:
+    """规范化分区/等级取值，"1区"、" 1 " 与 "1" 等价，"q1" 与 "Q1" 等价"""
+    text = re.sub(r"\s+", "", str(value)).casefold()
+    return text[:-1] if len(text) > 1 and text[-1] in "区类级" else text
+
+
+@dataclass(frozen=True)
+class Condition:
+    """
+    单个过滤条件
+
+    文本字段按取值集合匹配（values），类型化数值字段按区间匹配（low/high）；
+    negate 为 True 时表示排除满足条件的期刊。values 为 None 表示 "该字段非空"。
+    """
+    column: str
+    op: str
+    text: str
+    values: Optional[Tuple[str, ...]] = None
+    low: Optional[float] = None
+    high: Optional[float] = None
+    include_low: bool = True
+    include_high: bool = True
+    negate: bool = False
+
+    def sql(self, indexed: bool = True) -> Tuple[str, list]:
+        """
+        构建 journal_records 上的匹配条件（不含取反）
+
+        Args:
+            indexed: 为 False 时在列名前加一元 "+"，禁止SQLite用该列的索引（逐条校验候选记录时使用）
+        """
+        column = self.column if indexed else f"+{self.column}"
+        if self.column in NUMERIC_FIELDS:
+            # 类型化列中无法解析的取值为NULL，任何比较都不成立
+            clauses, params = [], []
+            if self.low is not None:
+                clauses.append(f"{column} {'>=' if self.include_low else '>'} ?")
+                params.append(self.low)
+            if self.high is not None:
+                clauses.append(f"{column} {'<=' if self.include_high else '<'} ?")
+                params.append(self.high)
+            return " AND ".join(clauses), params
+        if self.values is None:
+            return f"{column} IS NOT NULL", []
+        if not self.values:
+            return "0", []
+        return f"{column} IN ({', '.join('?' for _ in self.values)})", list(self.values)
+
+
+@dataclass(frozen=True)
+class RowCondition:
+    """须由同一条记录同时满足的一组正向条件（执行时作为一个条件走索引或逐条校验）"""
+    conditions: Tuple[Condition, ...]
+    negate = False
+
+    @property
+    def text(self) -> str:
+        return "; ".join(condition.text for condition in self.conditions)
+
+    def sql(self, indexed: bool = True) -> Tuple[str, list]:
+        """各条件以 AND 连接，作用于同一条记录"""
+        clauses, params = [], []
+        for condition in self.conditions:
+            clause, values = condition.sql(indexed)
+            clauses.append(f"({clause})")
+            params.extend(values)
+        return " AND ".join(clauses), params
+
+
+def split_filters(filters: str) -> List[str]:
+    """按分号、换行或 AND 拆分过滤表达式（逗号可能出现在学科名称中，不作为分隔符）"""
+    return [part.strip() for part in _SEPARATOR_RE.split(filters or "") if part and part.strip()]
+
+
+def parse_sort(sort: Optional[str]) -> Tuple[str, bool]:
+    """
+    解析排序参数
+
+    Returns:
+        (排序键, 是否降序)；"-if"、"if asc"、"name desc" 等写法均可
+
+    Raises:
+        ValueError: 不支持的排序字段
+    """
+    text = (sort or "if").strip().casefold()
+    descending = None
+    if text.startswith("-"):
+        text, descending = text[1:].strip(), True
+    parts = text.split()
+    if len(parts) == 2 and parts[1] in ("asc", "desc"):
+        text, descending = parts[0], parts[1] == "desc"
+    if text not in SORT_KEYS:
+        raise ValueError(f"不支持的排序字段 '{sort}'，可选值: if, name（前加 - 或后加 desc/asc 指定方向）")
+    key, default_desc = SORT_KEYS[text]
+    return key, default_desc if descending is None else descending
+
+
+class FilterStats:
+    """
+    条件查询的统计信息（按数据代次整体替换）
+
+    记录各文本字段每个取值的记录数，以及各类型化数值字段全部非空取值的有序列表，
+    用于把用户输入的取值解析为库中实际存储的取值，并估算条件的命中记录数。
+    """
+
+    def __init__(
+        self,
+        value_counts: Dict[str, Dict[str, int]],
+        numeric_values: Dict[str, Sequence[float]],
+        total: int,
+        generation: Tuple = (),
+    ):
+        self.value_counts = value_counts
+        self.numeric_values = {column: sorted(values) for column, values in numeric_values.items()}
+        self.total = total
+        self.generation = generation
+
+    def parse(self, filters: str) -> List[Condition]:
+        """
+        解析过滤表达式为条件列表
+
+        Raises:
+            ValueError: 表达式格式、字段或运算符无效
+        """
+        conditions = []
+        for part in split_filters(filters):
+            match = _CONDITION_RE.match(part)
+            if not match:
+                raise ValueError(f"无法解析过滤条件 '{part}'，应为如 partition=1区、if>5、warning=none")
+            field, op, value = match.groups()
+            column = FIELD_ALIASES.get(field.casefold())
+            if column is None:
+                raise ValueError(f"不支持的过滤字段 '{field}'，可选值: category, partition, if, warning, ccf, top")
+            value = value.strip("'\"“”")
+            if not value:
+                raise ValueError(f"过滤条件 '{part}' 缺少取值")
+            if column == "if_value":
+                try:
+                    number = float(value)
+                except ValueError:
+                    raise ValueError(f"影响因子取值应为数字: '{part}'")
+                conditions.append(self._numeric_condition(part, column, op, number))
+            elif column == "partition" and op != "~":
+                conditions.append(self._partition_condition(part, op, value))
+            elif column == "is_top":
+                conditions.append(self._top_condition(part, op, value))
+            else:
+                conditions.append(self._text_condition(part, column, op, value))
+        return conditions
+
+    @staticmethod
+    def _numeric_condition(text: str, column: str, op: str, number: float) -> Condition:
+        """构建类型化数值列上的区间条件"""
+        if op == "~":
+            raise ValueError(f"数值条件不支持 '~' 运算符: '{text}'")
+        if op in ("=", "!="):
+            return Condition(column, op, text, low=number, high=number, negate=op == "!=")
+        if op in (">", ">="):
+            return Condition(column, op, text, low=number, include_low=op == ">=")
+        return Condition(column, op, text, high=number, include_high=op == "<=")
+
+    def _partition_condition(self, text: str, op: str, value: str) -> Condition:
+        """
+        构建分区条件，按同步时解析出的类型化列匹配，与各来源存储的分区文本格式无关
+
+        Q1-Q4 只匹配JCR分区，1区-4区 只匹配中科院分区（quartile 列，同步时规范化为 Q1、1区 等）；
+        不带前后缀的数字（如 1）及范围比较按分区等级匹配所有来源（partition_rank 列）：
+        partition<=2 表示1区或2区（Q1/Q2）。
+        """
+        lowered = value.casefold()
+        if op in ("=", "!=") and (lowered in NONE_VALUES or lowered in ANY_VALUES):
+            return self._text_condition(text, "partition", op, value)
+        rank = partition_rank(value)
+        if rank is None:
+            raise ValueError(f"无法识别的分区 '{value}'，应为如 1区、2 或 Q2: '{text}'")
+        compact = re.sub(r"\s+", "", lowered)
+        if op in ("=", "!=") and compact.startswith("q"):
+            return Condition("quartile", op, text, values=(quartile_code("JCR", rank),), negate=op == "!=")
+        if op in ("=", "!=") and compact.endswith("区"):
+            return Condition("quartile", op, text, values=(quartile_code("FQBJCR", rank),), negate=op == "!=")
+        return self._numeric_condition(text, "partition_rank", op, rank)
+
+    @staticmethod
+    def _top_condition(text: str, op: str, value: str) -> Condition:
+        """构建Top期刊条件：top=yes 要求有Top记录，top=no 排除有Top记录的期刊"""
+        lowered = value.casefold()
+        if op not in ("=", "!=") or lowered not in _TRUE_VALUES | _FALSE_VALUES:
+            raise ValueError(f"Top条件应为 top=yes 或 top=no: '{text}'")
+        return Condition("is_top", op, text, low=1, high=1, negate=(lowered in _TRUE_VALUES) == (op == "!="))
+
+    def _text_condition(self, text: str, column: str, op: str, value: str) -> Condition:
+        """构建文本字段条件，把用户取值解析为库中实际存储的取值"""
+        if op not in ("=", "!=", "~"):
+            raise ValueError(f"字段 '{column}' 只支持 =、!=、~ 运算符: '{text}'")
+        lowered = value.casefold()
+        if op != "~" and (lowered in NONE_VALUES or lowered in ANY_VALUES):
+            # field=none 排除该字段非空的期刊；field=any 要求该字段非空
+            return Condition(column, op, text, negate=(lowered in NONE_VALUES) == (op == "="))
+
+        stored = self.value_counts.get(column, {})
+        if op == "~":
+            values = tuple(sorted(v for v in stored if lowered in v.casefold()))
+        else:
+            wanted = normalize_value(value)
+            values = tuple(sorted(v for v in stored if normalize_value(v) == wanted))
+        return Condition(column, op, text, values=values, negate=op == "!=")
+
+    def estimate(self, condition: Condition) -> int:
+        """估算条件（不含取反）命中的记录数"""
+        if condition.column in NUMERIC_FIELDS:
+            values = self.numeric_values.get(condition.column, ())
+            if condition.low is None:
+                start = 0
+            elif condition.include_low:
+                start = bisect_left(values, condition.low)
+            else:
+                start = bisect_right(values, condition.low)
+            if condition.high is None:
+                end = len(values)
+            elif condition.include_high:
+                end = bisect_right(values, condition.high)
+            else:
+                end = bisect_left(values, condition.high)
+            return max(end - start, 0)
+
+        counts = self.value_counts.get(condition.column, {})
+        if condition.values is None:
+            return sum(counts.values())
+        return sum(counts.get(value, 0) for value in condition.values)
+
+    def plan(self, conditions: List[Condition]) -> List[Tuple[Union[Condition, RowCondition], int]]:
+        """
+        确定条件的执行顺序
+
+        ROW_FIELDS 上的多个正向条件合并为一个 RowCondition，由同一条记录同时满足，
+        其估算命中数取各条件估算数的最小值（上界）。
+
+        Returns:
+            [(条件, 估算命中记录数)]：先执行的正向条件按估算数升序，排除条件排在最后
+        """
+        row = [condition for condition in conditions if not condition.negate and condition.column in ROW_FIELDS]
+        estimated: List[Tuple[Union[Condition, RowCondition], int]] = []
+        if len(row) > 1:
+            estimated.append((RowCondition(tuple(row)), min(self.estimate(condition) for condition in row)))
+            conditions = [condition for condition in conditions if condition not in row]
+        estimated.extend((condition, self.estimate(condition)) for condition in conditions)
+        return sorted(estimated, key=lambda item: (item[0].negate, item[1]))
@@ -0,0 +1,89 @@
+"""
+学科影响因子排名模块
+
+排名本身在同步时写入 category_rankings 表（按 学科、年份、名次 组成主键），
+查询前 n 名只需沿主键读取 n 行。本模块负责把用户输入的学科名称和年份
+解析为排名表中实际存在的学科与年份（每个数据代次加载一次学科目录）。
+"""
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+def _category_key(text: str) -> str:
+    """学科名称匹配键：忽略大小写与多余空白"""
+    return re.sub(r"\s+", " ", str(text)).strip().casefold()
+
+
+class CategoryIndex:
+    """排名表中的学科目录（只读，按数据代次整体替换）"""
+
+    def __init__(self, rows: Iterable[Tuple[str, int, int]], generation: Tuple = ()):
+        """
+        构建目录
+
+        Args:
+            rows: (学科, 年份, 参与排名的期刊数)
+            generation: 数据代次标识
+        """
+        self.generation = generation
+        # 学科 -> {年份: 期刊数}
+        self.categories: Dict[str, Dict[int, int]] = {}
+        for category, year, count in rows:
+            self.categories.setdefault(category, {})[year] = count
+        self._keys: Dict[str, str] = {_category_key(name): name for name in self.categories}
+
+    def __len__(self) -> int:
+        return len(self.categories)
+
+    def resolve(self, category: str) -> str:
+        """
+        将用户输入解析为排名表中的学科名称
+
+        先按忽略大小写的完整名称匹配，否则取唯一包含该输入的学科。
+
+        Raises:
+            ValueError: 学科不存在或输入对应多个学科
+        """
+        key = _category_key(category or "")
+        if not key:
+            raise ValueError("请提供学科名称，如 计算机科学 或 MULTIDISCIPLINARY SCIENCES")
+        if key in self._keys:
+            return self._keys[key]
+
+        candidates = sorted(name for k, name in self._keys.items() if key in k)
+        if len(candidates) == 1:
+            return candidates[0]
+        if not candidates:
+            raise ValueError(f"未找到学科 '{category}'")
+        shown = "、".join(candidates[:10]) + ("等" if len(candidates) > 10 else "")
+        raise ValueError(f"学科 '{category}' 对应多个学科，请指定完整名称: {shown}")
+
+    def resolve_year(self, category: str, year: Optional[str] = "latest") -> int:
+        """
+        确定排名年份
+
+        Args:
+            category: 已解析的学科名称
+            year: 年份，为空或 "latest" 时取该学科的最新年份
+
+        Raises:
+            ValueError: 年份格式无效或该学科没有该年份的排名
+        """
+        years = self.categories[category]
+        text = str(year or "latest").strip().lower()
+        if text == "latest":
+            return max(years)
+        if not re.match(r"^\d{4}$", text):
+            raise ValueError(f"无效的年份 '{year}'，应为如 2024 或 latest")
+        if int(text) not in years:
+            available = "、".join(str(y) for y in self.years(category))
+            raise ValueError(f"学科 '{category}' 没有 {text} 年的排名，可选年份: {available}")
+        return int(text)
+
+    def years(self, category: str) -> List[int]:
+        """获取学科有排名的年份（降序）"""
+        return sorted(self.categories.get(category, {}), reverse=True)
+
+    def count(self, category: str, year: int) -> int:
+        """获取学科某一年份参与排名的期刊数"""
+        return self.categories.get(category, {}).get(year, 0)
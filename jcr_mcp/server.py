@@ -1,314 +1,770 @@
 """
 JCR分区表MCP服务器主模块
 """
+import asyncio
+import json
 import os
-import sqlite3
-from typing import Optional
+import re
+import threading
+from typing import List, Optional
 from pathlib import Path
 
 from mcp.server.fastmcp import FastMCP
 
-from .database import JCRDatabase
+from .database import JCRDatabase, JournalInfo, MATCH_EXACT
+from .executor import DatabaseExecutor
+from .health import STATUS_READY, HealthMonitor, SupervisorMonitor, start_probe_server
+from .normalize import normalize_name
+from .paging import decode_cursor, encode_cursor
+from .structured import (
+    FORMAT_JSON, RECOMMEND_AVOID, RECOMMEND_GOOD, RECOMMEND_TOP, check_format, dumps,
+    group_journal_records, journal_entries, recommendation, warning_entry, warning_levels,
+)
+from .trends import PARTITION_SOURCES, latest_partition
+from .warning_index import WarningIndex
 
 
 # 从环境变量获取配置
 DEFAULT_HOST = os.getenv("JCR_MCP_HOST", "0.0.0.0")
 DEFAULT_PORT = int(os.getenv("JCR_MCP_PORT", "8080"))
 DEFAULT_TRANSPORT = os.getenv("JCR_MCP_TRANSPORT", "stdio")
+DEFAULT_WORKERS = int(os.getenv("JCR_MCP_WORKERS", "1"))
+# 本地探针HTTP端点（/livez、/readyz），端口为0时不启动
+PROBE_HOST = os.getenv("JCR_MCP_PROBE_HOST", "127.0.0.1")
+PROBE_PORT = int(os.getenv("JCR_MCP_PROBE_PORT", "8081"))
+
+# 单页最多返回的期刊数 / 预警记录数 / 补全条数
+MAX_SEARCH_PAGE = 50
+MAX_WARNING_PAGE = 200
+MAX_COMPLETIONS = 50
+MAX_QUERY_PAGE = 50
+MAX_TOP_JOURNALS = 100
 
 # 初始化FastMCP服务器
 app = FastMCP("jcr-partition-server", port=DEFAULT_PORT)
 
-# 全局数据库实例
+# 全局数据库实例与数据库线程池
 db = None
+executor = None
+monitor = None
+# 本进程中运行的探针HTTP服务
+probe_server = None
+_init_lock = threading.Lock()
+
+
+def get_executor() -> DatabaseExecutor:
+    """获取数据库线程池（延迟初始化，大小由 JCR_MCP_DB_WORKERS 配置）"""
+    global executor
+    if executor is None:
+        with _init_lock:
+            if executor is None:
+                executor = DatabaseExecutor()
+    return executor
 
 
 def get_db() -> JCRDatabase:
-    """获取数据库实例（延迟初始化）"""
+    """获取数据库实例（延迟初始化，可能在线程池中首次调用）"""
     global db
     if db is None:
-        db = JCRDatabase()
+        pool_size = get_executor().max_workers
+        with _init_lock:
+            if db is None:
+                # 空闲连接数与工作线程数一致，满载时也不会反复新建连接
+                db = JCRDatabase(pool_size=pool_size)
     return db
 
 
+def get_monitor() -> HealthMonitor:
+    """获取存活/就绪状态（延迟初始化）"""
+    global monitor
+    if monitor is None:
+        with _init_lock:
+            if monitor is None:
+                monitor = HealthMonitor(get_db, get_executor)
+    return monitor
+
+
+def format_warning_levels(levels) -> str:
+    """将 {年份: 预警等级} 格式化为如 2024年（高）、2021年（中）"""
+    return "、".join(
+        f"{year}年（{level}）" if level else f"{year}年" for year, level in sorted(levels.items(), reverse=True)
+    )
+
+
+def format_journal_records(
+    results: List[JournalInfo], warnings: Optional[WarningIndex] = None
+) -> List[str]:
+    """
+    将期刊记录按期刊分组、按年份降序格式化为输出行
+    
+    传入预警名单成员索引时，在每个期刊名称下标注其所在的预警名单年份（不受记录年份过滤影响）。
+    """
+    output = []
+    for infos in group_journal_records(results):
+        output.append(f"\n📚 期刊名称: {infos[0].journal_name}")
+        output.append("=" * 50)
+        
+        levels = warnings.levels_of(infos[0]) if warnings is not None else None
+        if levels:
+            output.append(f"🚨 预警名单: {format_warning_levels(levels)}")
+        
+        for info in infos:
+            year_str = f"【{info.year}年】" if info.year else "【未知年份】"
+            output.append(f"\n{year_str}")
+            
+            if info.impact_factor:
+                output.append(f"  📊 影响因子: {info.impact_factor}")
+            
+            if info.partition:
+                output.append(f"  🏆 分区: {info.partition}")
+            
+            if info.category:
+                output.append(f"  📖 学科类别: {info.category}")
+            
+            if info.warning_status:
+                output.append(f"  ⚠️ 预警状态: {info.warning_status}")
+            
+            if info.ccf_level:
+                output.append(f"  🏅 CCF推荐等级: {info.ccf_level}")
+    
+    return output
+
+
+def _page_size(limit, maximum: int) -> int:
+    """将客户端传入的分页大小限制在 1..maximum 之间"""
+    return max(1, min(int(limit), maximum))
+
+
+def _format_error(output_format: Optional[str], prefix: str, error: Exception) -> str:
+    """格式化工具的出错信息（JSON 输出时包装为 {"error": ...}）"""
+    message = f"{prefix}: {str(error)}"
+    if (output_format or "").strip().lower() == FORMAT_JSON:
+        return dumps({"error": message})
+    return message
+
+
+def _render_search_journal(
+    journal_name: str,
+    year: Optional[str] = None,
+    limit: int = 10,
+    cursor: Optional[str] = None,
+    output_format: str = "text",
+) -> str:
+    """search_journal 的阻塞实现（在数据库线程池中执行）"""
+    output_format = check_format(output_format)
+    limit = _page_size(limit, MAX_SEARCH_PAGE)
+    scope = ("search_journal", normalize_name(journal_name), year)
+    offset = decode_cursor(cursor, *scope)
+    
+    database = get_db()
+    search_result = database.search(journal_name, year, limit=limit, offset=offset)
+    results = search_result.journals
+    total = search_result.total
+    
+    if output_format == FORMAT_JSON:
+        entries = journal_entries(results, database.get_warning_index())
+        shown = len(entries)
+        data = {
+            "match": search_result.match_type,
+            "total": total,
+            "offset": offset,
+            "journals": entries,
+            "next_cursor": encode_cursor(offset + shown, *scope) if shown and offset + shown < total else None,
+        }
+        if not total:
+            data["suggestions"] = [
+                {"journal_name": name, "score": round(score, 3)} for name, score in database.suggest(journal_name)
+            ]
+        return dumps(data)
+    
+    if not results and offset:
+        return f"期刊 '{journal_name}' 没有更多结果（共 {total} 个期刊）"
+    
+    if not results:
+        output = [f"未找到期刊 '{journal_name}' 的相关信息"]
+        suggestions = database.suggest(journal_name)
+        if suggestions:
+            output.append("\n💡 您是否要找:")
+            for name, score in suggestions:
+                output.append(f"  • {name}（相似度 {score:.2f}）")
+        return "\n".join(output)
+    
+    match_label = "精确匹配" if search_result.match_type == MATCH_EXACT else "子串匹配"
+    shown = min(limit, total - offset)
+    output = [f"🔎 匹配方式: {match_label}"]
+    output.append(f"📄 共找到 {total} 个期刊，当前显示第 {offset + 1}-{offset + shown} 个")
+    output.extend(format_journal_records(results, database.get_warning_index()))
+    
+    if offset + shown < total:
+        next_cursor = encode_cursor(offset + shown, *scope)
+        output.append(f"\n➡️ 还有 {total - offset - shown} 个期刊未显示，传入 cursor=\"{next_cursor}\" 获取下一页")
+    
+    return "\n".join(output)
+
+
 @app.tool()
-async def search_journal(journal_name: str, year: Optional[str] = None) -> str:
+async def search_journal(
+    journal_name: str,
+    year: Optional[str] = None,
+    limit: int = 10,
+    cursor: Optional[str] = None,
+    format: str = "text",
+) -> str:
     """
     搜索期刊信息，包括影响因子、分区、预警状态等
     
     Args:
-        journal_name: 期刊名称（支持模糊搜索）
-        year: 指定年份（可选，如2025、2024、2023等）
+        journal_name: 期刊名称（支持模糊搜索，结果按完全匹配 > 前缀匹配 > 子串匹配排序）
+        year: 指定年份（可选，如2025、2024；也支持区间如2022-2024，或latest表示各来源最新年份）
+        limit: 每页最多返回的期刊数（默认10，最大50）
+        cursor: 分页游标（可选，取自上一页结果末尾的提示或 JSON 中的 next_cursor）
+        format: 输出格式，text（默认，便于阅读的文本）或 json（紧凑的结构化记录，便于程序处理）
     
     Returns:
-        期刊的详细信息，包括各年份的分区、影响因子等数据
+        期刊的详细信息，包括各年份的分区、影响因子等数据，以及命中总数和下一页游标
     """
     try:
-        database = get_db()
-        results = database.search_journal(journal_name, year)
-        
-        if not results:
-            return f"未找到期刊 '{journal_name}' 的相关信息"
-        
-        # 按期刊名称和年份分组整理结果
-        grouped_results = {}
-        for result in results:
-            key = result.journal_name
-            if key not in grouped_results:
-                grouped_results[key] = []
-            grouped_results[key].append(result)
-        
-        output = []
-        for journal, infos in grouped_results.items():
-            output.append(f"\n📚 期刊名称: {journal}")
-            output.append("=" * 50)
-            
-            # 按年份排序
-            infos.sort(key=lambda x: x.year or "0000", reverse=True)
-            
-            for info in infos:
-                year_str = f"【{info.year}年】" if info.year else "【未知年份】"
-                output.append(f"\n{year_str}")
-                
-                if info.impact_factor:
-                    output.append(f"  📊 影响因子: {info.impact_factor}")
-                
-                if info.partition:
-                    output.append(f"  🏆 分区: {info.partition}")
-                
-                if info.category:
-                    output.append(f"  📖 学科类别: {info.category}")
-                
-                if info.warning_status:
-                    output.append(f"  ⚠️ 预警状态: {info.warning_status}")
-                
-                if info.ccf_level:
-                    output.append(f"  🏅 CCF推荐等级: {info.ccf_level}")
-        
-        return "\n".join(output)
+        return await get_executor().run(_render_search_journal, journal_name, year, limit, cursor, format)
+    except Exception as e:
+        return _format_error(format, "查询出错", e)
+
+
+def _render_search_by_issn(issn: str) -> str:
+    """search_by_issn 的阻塞实现（在数据库线程池中执行）"""
+    issns = [x for x in re.split(r"[,，;\s]+", issn) if x]
+    
+    if not issns:
+        return "请提供至少一个ISSN"
+    
+    database = get_db()
+    results = database.get_by_issn(issns)
+    
+    output = []
+    for query, records in results.items():
+        output.append(f"\n🔢 ISSN: {query}")
+        if records:
+            output.extend(format_journal_records(records, database.get_warning_index()))
+        else:
+            output.append(f"  未找到ISSN '{query}' 对应的期刊")
+    
+    return "\n".join(output).lstrip("\n")
+
+
+@app.tool()
+async def search_by_issn(issn: str) -> str:
+    """
+    按ISSN/eISSN精确查询期刊信息
+    
+    Args:
+        issn: 一个或多个ISSN，用逗号或空格分隔，如"0028-0836"或"0028-0836,1476-4687"（忽略连字符）
+    
+    Returns:
+        每个ISSN对应期刊在各来源、各年份的分区、影响因子等数据
+    """
+    try:
+        return await get_executor().run(_render_search_by_issn, issn)
+    except Exception as e:
+        return f"ISSN查询出错: {str(e)}"
+
+
+def _render_autocomplete_journal(prefix: str, limit: int = 10) -> str:
+    """autocomplete_journal 的阻塞实现（在数据库线程池中执行）"""
+    if not prefix or not prefix.strip():
+        return "请提供期刊名称的开头部分"
+    
+    completions = get_db().autocomplete(prefix, _page_size(limit, MAX_COMPLETIONS))
+    if not completions:
+        return f"未找到以 '{prefix.strip()}' 开头的期刊"
+    
+    output = [f"🔤 以 '{prefix.strip()}' 开头的期刊（{len(completions)} 个）:"]
+    for completion in completions:
+        details = []
+        if completion.partition is not None:
+            details.append(f"🏆 {completion.partition}（{completion.partition_year}年）")
+        if completion.impact_factor is not None:
+            details.append(f"📊 IF {completion.impact_factor}（{completion.impact_factor_year}年）")
+        line = f"  • {completion.journal_name}"
+        if details:
+            line += "  " + " | ".join(details)
+        output.append(line)
+    
+    return "\n".join(output)
+
+
+@app.tool()
+async def autocomplete_journal(prefix: str, limit: int = 10) -> str:
+    """
+    按名称开头补全期刊名称（适用于只记得期刊名开头或边输入边提示的场景）
     
+    Args:
+        prefix: 期刊名称的开头部分，如"Nature Comm"（忽略大小写与标点）
+        limit: 最多返回的期刊数（默认10，最大50）
+    
+    Returns:
+        匹配的期刊名称列表，附带各期刊最新的分区与影响因子
+    """
+    try:
+        return await get_executor().run(_render_autocomplete_journal, prefix, limit)
     except Exception as e:
-        return f"查询出错: {str(e)}"
+        return f"补全出错: {str(e)}"
+
+
+def _format_move(move: Optional[int]) -> str:
+    """格式化分区升降（正数为上升）"""
+    if not move:
+        return ""
+    return f" ↑ 上升{move}个区" if move > 0 else f" ↓ 下降{-move}个区"
+
+
+def _render_get_partition_trends(journal_name: str, output_format: str = "text") -> str:
+    """get_partition_trends 的阻塞实现（在数据库线程池中执行）"""
+    output_format = check_format(output_format)
+    trend = get_db().partition_trend(journal_name)
+    
+    if output_format == FORMAT_JSON:
+        # 趋势文档本身即为同步时生成的结构化数据，直接返回
+        return dumps({"found": trend is not None, "trend": trend})
+    
+    if trend is None:
+        return f"未找到期刊 '{journal_name}' 的相关信息"
+    
+    impact_factors = trend["impact_factors"]
+    partitions = trend["partitions"]
+    if not partitions and not impact_factors:
+        return f"未找到期刊 '{journal_name}' 的分区信息"
+    
+    output = [f"📈 期刊分区变化趋势分析"]
+    output.append("=" * 40)
+    output.append(f"📚 期刊名称: {trend['journal_name']}")
+    
+    if impact_factors:
+        output.append("\n📊 影响因子变化:")
+        for year, value, delta in impact_factors:
+            change = ""
+            if delta:
+                change = f"（{'↑' if delta > 0 else '↓'} {delta:+.3f}）"
+            output.append(f"  {year}年: {value}{change}")
+    
+    for source, label in PARTITION_SOURCES.items():
+        series = partitions.get(source)
+        if not series:
+            continue
+        output.append(f"\n🏆 {label}:")
+        for year, partition, category, move, _, top in series:
+            category_text = f"（{category}）" if category else ""
+            top_text = " Top" if top and "top" not in partition.casefold() else ""
+            output.append(f"  {year}年: {partition}{top_text}{category_text}{_format_move(move)}")
+    
+    warnings = {int(year): entry["warning"] for year, entry in trend["years"].items() if "warning" in entry}
+    if warnings:
+        output.append(f"\n🚨 该期刊在预警名单中: {format_warning_levels(warnings)}")
+    
+    # 简单趋势分析（最新分区优先取中科院分区）
+    latest = latest_partition(trend)
+    if len(impact_factors) > 1 or (latest and sum(len(series) for series in partitions.values()) > 1):
+        output.append("\n📊 趋势分析:")
+        if len(impact_factors) > 1:
+            (first_year, first_value, _), (last_year, last_value, _) = impact_factors[0], impact_factors[-1]
+            change = last_value - first_value
+            ratio = f"（{change / first_value:+.1%}）" if first_value else ""
+            icon = "📈" if change >= 0 else "📉"
+            output.append(f"{icon} 影响因子 {first_year}→{last_year}年变化 {change:+.3f}{ratio}")
+        rank = latest[4] if latest else None
+        if rank == 1:
+            output.append("✅ 该期刊保持在顶级分区")
+        elif rank == 4:
+            output.append("⚠️ 该期刊分区较低，发表需谨慎")
+        elif rank is not None:
+            output.append("📊 该期刊分区稳定，属于中等水平")
+    
+    return "\n".join(output)
 
 
 @app.tool()
-async def get_partition_trends(journal_name: str) -> str:
+async def get_partition_trends(journal_name: str, format: str = "text") -> str:
     """
     获取期刊分区变化趋势
     
     Args:
         journal_name: 期刊名称
+        format: 输出格式，text（默认）或 json（返回趋势文档：years、impact_factors、partitions）
     
     Returns:
-        期刊历年分区变化趋势分析
+        期刊历年影响因子变化、中科院/JCR分区升降及预警记录的趋势分析
     """
     try:
-        database = get_db()
-        results = database.search_journal(journal_name)
-        
-        if not results:
-            return f"未找到期刊 '{journal_name}' 的相关信息"
-        
-        # 提取分区信息
-        partition_data = []
-        for result in results:
-            if result.partition and result.year:
-                partition_data.append((result.year, result.partition, result.journal_name))
-        
-        if not partition_data:
-            return f"未找到期刊 '{journal_name}' 的分区信息"
-        
-        # 按年份排序
-        partition_data.sort(key=lambda x: x[0])
-        
-        output = [f"📈 期刊分区变化趋势分析"]
-        output.append("=" * 40)
-        
-        for year, partition, journal in partition_data:
-            output.append(f"{year}年: {partition}")
+        return await get_executor().run(_render_get_partition_trends, journal_name, format)
+    except Exception as e:
+        return _format_error(format, "分析出错", e)
+
+
+def _render_check_warning_journals(
+    keywords: Optional[str] = None,
+    limit: int = 50,
+    cursor: Optional[str] = None,
+    output_format: str = "text",
+) -> str:
+    """check_warning_journals 的阻塞实现（在数据库线程池中执行）"""
+    output_format = check_format(output_format)
+    limit = _page_size(limit, MAX_WARNING_PAGE)
+    scope = ("check_warning_journals", normalize_name(keywords))
+    offset = decode_cursor(cursor, *scope)
+    database = get_db()
+    
+    # 从表结构目录获取预警名单年份
+    warning_years = database.get_catalog().years("GJQKYJMD")
+    
+    if not warning_years:
+        return "未找到预警期刊数据表"
+    
+    page = database.search_warning_journals(keywords, limit=limit, offset=offset)
+    warnings = database.get_warning_index()
+    
+    if output_format == FORMAT_JSON:
+        shown = len(page.journals)
+        return dumps({
+            "years": warning_years,
+            "total": page.total,
+            "offset": offset,
+            "records": [warning_entry(info, warnings.reason_of(info)) for info in page.journals],
+            "next_cursor": encode_cursor(offset + shown, *scope) if shown and offset + shown < page.total else None,
+        })
+    
+    by_year = {}
+    for result in page.journals:
+        by_year.setdefault(result.year, []).append(result)
+    
+    output = ["🚨 国际期刊预警名单查询结果"]
+    output.append("=" * 40)
+    
+    shown = len(page.journals)
+    if shown:
+        output.append(f"📄 共 {page.total} 条预警记录，当前显示第 {offset + 1}-{offset + shown} 条")
+    elif offset:
+        output.append(f"没有更多预警记录（共 {page.total} 条）")
+        return "\n".join(output)
+    
+    for year in warning_years:
+        infos = by_year.get(str(year))
+        # 分页时只列出本页包含的年份
+        if not infos and page.total:
+            continue
         
-        # 简单趋势分析
-        if len(partition_data) > 1:
-            output.append("\n📊 趋势分析:")
-            first_partition = partition_data[0][1]
-            last_partition = partition_data[-1][1]
-            
-            if "1区" in last_partition or "Q1" in last_partition:
-                output.append("✅ 该期刊保持在顶级分区")
-            elif "4区" in last_partition or "Q4" in last_partition:
-                output.append("⚠️ 该期刊分区较低，发表需谨慎")
+        output.append(f"\n📅 {year}年预警名单:")
+        if infos:
+            for info in infos:
+                # 预警名单提供预警原因时附在预警等级之后
+                detail = info.warning_status or ""
+                reason = warnings.reason_of(info)
+                if reason:
+                    detail = f"{detail}（原因: {reason}）" if detail else reason
+                output.append(f"  • {info.journal_name}: {detail or '未知原因'}")
+        else:
+            if keywords:
+                output.append(f"  无匹配 '{keywords}' 的预警期刊")
             else:
-                output.append("📊 该期刊分区稳定，属于中等水平")
-        
-        return "\n".join(output)
+                output.append("  该年度无预警期刊数据")
     
-    except Exception as e:
-        return f"分析出错: {str(e)}"
+    if offset + shown < page.total:
+        next_cursor = encode_cursor(offset + shown, *scope)
+        output.append(f"\n➡️ 还有 {page.total - offset - shown} 条未显示，传入 cursor=\"{next_cursor}\" 获取下一页")
+    
+    return "\n".join(output)
 
 
 @app.tool()
-async def check_warning_journals(keywords: Optional[str] = None) -> str:
+async def check_warning_journals(
+    keywords: Optional[str] = None,
+    limit: int = 50,
+    cursor: Optional[str] = None,
+    format: str = "text",
+) -> str:
     """
     查询国际期刊预警名单
     
     Args:
         keywords: 关键词（可选，用于筛选特定期刊）
+        limit: 每页最多返回的预警记录数（默认50，最大200）
+        cursor: 分页游标（可选，取自上一页结果末尾的提示或 JSON 中的 next_cursor）
+        format: 输出格式，text（默认）或 json（紧凑的结构化记录）
     
     Returns:
-        预警期刊列表及其预警原因
+        预警期刊列表及其预警原因，以及记录总数和下一页游标
     """
     try:
-        database = get_db()
-        conn = sqlite3.connect(database.db_path)
-        cursor = conn.cursor()
-        
-        # 获取预警表
-        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name LIKE 'GJQKYJMD%'")
-        warning_tables = [table[0] for table in cursor.fetchall()]
+        return await get_executor().run(_render_check_warning_journals, keywords, limit, cursor, format)
+    except Exception as e:
+        return _format_error(format, "查询预警期刊出错", e)
+
+
+def _render_query_journals(
+    filters: str,
+    sort: Optional[str] = None,
+    limit: int = 20,
+    year: Optional[str] = "latest",
+    cursor: Optional[str] = None,
+) -> str:
+    """query_journals 的阻塞实现（在数据库线程池中执行）"""
+    limit = _page_size(limit, MAX_QUERY_PAGE)
+    scope = ("query_journals", (filters or "").strip(), sort, year)
+    offset = decode_cursor(cursor, *scope)
+    
+    database = get_db()
+    page = database.query_journals(filters, sort=sort, limit=limit, offset=offset, year=year)
+    
+    output = ["🧭 期刊条件查询结果"]
+    output.append("=" * 40)
+    output.append(f"🔍 过滤条件: {filters}")
+    
+    if not page.total:
+        output.append("\n未找到符合全部条件的期刊")
+        return "\n".join(output)
+    
+    shown = len({info.journal_id for info in page.journals})
+    if not shown:
+        output.append(f"\n没有更多结果（共 {page.total} 个期刊）")
+        return "\n".join(output)
+    
+    output.append(f"📄 共 {page.total} 个期刊符合条件，当前显示第 {offset + 1}-{offset + shown} 个")
+    output.extend(format_journal_records(page.journals, database.get_warning_index()))
+    
+    if offset + shown < page.total:
+        next_cursor = encode_cursor(offset + shown, *scope)
+        output.append(f"\n➡️ 还有 {page.total - offset - shown} 个期刊未显示，传入 cursor=\"{next_cursor}\" 获取下一页")
+    
+    return "\n".join(output)
+
+
+@app.tool()
+async def query_journals(
+    filters: str,
+    sort: Optional[str] = None,
+    limit: int = 20,
+    year: Optional[str] = "latest",
+    cursor: Optional[str] = None,
+) -> str:
+    """
+    按学科、分区、影响因子、预警状态、CCF等级等条件筛选期刊
+    
+    Args:
+        filters: 过滤条件，多个条件用分号分隔，如"category=计算机科学; partition=1区; if>5; warning=none"。
+            字段: category（学科）、partition（分区，如1区、Q1）、if（影响因子）、warning（预警等级）、ccf（CCF等级）、
+            top（中科院Top期刊，top=yes/no）；运算符: = != > >= < <= ~（~ 表示包含）；
+            partition=1区 只匹配中科院分区，partition=Q1 只匹配JCR分区，partition=1 按分区等级匹配两者，
+            partition<=2 表示1区或2区（Q1/Q2）；warning=none 表示不在预警名单中
+        sort: 排序方式，if（影响因子降序，默认）或 name（名称升序），前加 - 或后加 desc/asc 指定方向
+        limit: 每页最多返回的期刊数（默认20，最大50）
+        year: 条件匹配的年份（默认latest，即各来源的最新年份；也支持如2024、2022-2024）
+        cursor: 分页游标（可选，取自上一页结果末尾的提示）
+    
+    Returns:
+        符合全部条件的期刊及其在该年份范围内的分区、影响因子等数据，以及命中总数和下一页游标
+    """
+    try:
+        return await get_executor().run(_render_query_journals, filters, sort, limit, year, cursor)
+    except Exception as e:
+        return f"条件查询出错: {str(e)}"
+
+
+def _render_top_journals(category: str, year: Optional[str] = "latest", n: int = 20) -> str:
+    """top_journals 的阻塞实现（在数据库线程池中执行）"""
+    ranking = get_db().top_journals(category, year, _page_size(n, MAX_TOP_JOURNALS))
+    
+    output = [f"🏅 {ranking.category}（{ranking.year}年）影响因子排名"]
+    output.append("=" * 40)
+    output.append(f"📄 共 {ranking.total} 个期刊参与排名，显示前 {len(ranking.journals)} 个")
+    output.append("")
+    for item in ranking.journals:
+        line = f"{item.rank:>3}. {item.journal_name}  📊 IF {item.impact_factor}"
+        if item.if_year != ranking.year:
+            line += f"（{item.if_year}年）"
+        if item.partition:
+            line += f" | 🏆 {item.partition}"
+        output.append(line)
+    
+    return "\n".join(output)
+
+
+@app.tool()
+async def top_journals(category: str, year: Optional[str] = "latest", n: int = 20) -> str:
+    """
+    查询某一学科内影响因子排名前 n 的期刊
+    
+    Args:
+        category: 学科名称，JCR学科（如"MULTIDISCIPLINARY SCIENCES"）或中科院分区表大类（如"计算机科学"），
+            忽略大小写，可只写名称中能唯一确定学科的一部分
+        year: 排名年份（默认latest，即该学科的最新年份）
+        n: 返回的期刊数（默认20，最大100）
+    
+    Returns:
+        按影响因子降序排列的期刊名次、影响因子和分区；中科院学科的影响因子取不晚于该年份的最近一年JCR数据
+    """
+    try:
+        return await get_executor().run(_render_top_journals, category, year, n)
+    except Exception as e:
+        return f"排名查询出错: {str(e)}"
+
+
+def _render_compare_journals(journal_list: str, output_format: str = "text") -> str:
+    """compare_journals 的阻塞实现（在数据库线程池中执行）"""
+    output_format = check_format(output_format)
+    journals = [j.strip() for j in journal_list.split(',')]
+    
+    if len(journals) < 2:
+        message = "请至少提供2个期刊名称进行比较"
+        return dumps({"error": message}) if output_format == FORMAT_JSON else message
+    
+    # 一次批量查询匹配所有期刊，最新影响因子与分区取自同步时生成的趋势文档（分区等级已解析为数值），
+    # 预警状态从预警名单成员索引中查找
+    database = get_db()
+    all_results = database.search_many(journals)
+    warnings = database.get_warning_index()
+    warned = {
+        journal: any(warnings.levels_of(result) for result in results)
+        for journal, results in all_results.items()
+    }
+    found = [journal for journal, results in all_results.items() if results]
+    trends = dict(zip(found, database.partition_trends_many(all_results[journal][0] for journal in found)))
+    latest = {
+        journal: latest_partition(trend) if trend else None for journal, trend in trends.items()
+    }
+    
+    if output_format == FORMAT_JSON:
+        entries = []
+        for journal, results in all_results.items():
+            entry = {"query": journal, "found": bool(results)}
+            if results:
+                trend = trends[journal]
+                impact_factors = trend["impact_factors"] if trend else []
+                partition = latest[journal]
+                if partition:
+                    partition = dict(zip(("year", "partition", "category", "move", "rank", "top"), partition))
+                levels = {}
+                for result in results:
+                    levels.update(warnings.levels_of(result))
+                entry.update(
+                    journal_id=results[0].journal_id,
+                    journal_name=trend["journal_name"] if trend else results[0].journal_name,
+                    impact_factor=impact_factors[-1][1] if impact_factors else None,
+                    if_year=impact_factors[-1][0] if impact_factors else None,
+                    partition=partition,
+                    warning_levels=warning_levels(levels),
+                    recommendation=recommendation(latest[journal], warned[journal]),
+                )
+            entries.append(entry)
+        return dumps({"journals": entries})
+    
+    output = ["📊 期刊对比分析结果"]
+    output.append("=" * 50)
+    
+    # 生成对比表格
+    output.append(f"\n{'期刊名称':<30} {'最新影响因子':<15} {'最新分区':<15} {'预警状态':<15}")
+    output.append("-" * 80)
+    
+    for journal, results in all_results.items():
+        if not results:
+            output.append(f"{journal:<30} {'无数据':<15} {'无数据':<15} {'无数据':<15}")
+            continue
         
-        if not warning_tables:
-            return "未找到预警期刊数据表"
+        # 获取最新数据
+        trend = trends[journal]
+        latest_if = "无数据"
+        partition_text = "无数据"
+        warning_status = "⚠️预警" if warned[journal] else "正常"
         
-        output = ["🚨 国际期刊预警名单查询结果"]
-        output.append("=" * 40)
+        if trend and trend["impact_factors"]:
+            latest_if = str(trend["impact_factors"][-1][1])
+        partition = latest[journal]
+        if partition:
+            partition_text = partition[1] + (" Top" if partition[5] and "top" not in partition[1].casefold() else "")
         
-        for table in sorted(warning_tables, reverse=True):
-            year = table.replace('GJQKYJMD', '')
-            output.append(f"\n📅 {year}年预警名单:")
-            
-            query = f"SELECT * FROM {table}"
-            params = []
-            
-            if keywords:
-                query += " WHERE Journal LIKE ? COLLATE NOCASE"
-                params.append(f"%{keywords}%")
-            
-            cursor.execute(query, params)
-            rows = cursor.fetchall()
-            column_names = [description[0] for description in cursor.description]
-            
-            if rows:
-                for row in rows:
-                    row_dict = dict(zip(column_names, row))
-                    journal_name = row_dict.get('Journal', '未知期刊')
-                    warning_reason = row_dict.get('预警原因', row_dict.get('预警等级', '未知原因'))
-                    output.append(f"  • {journal_name}: {warning_reason}")
+        output.append(f"{journal:<30} {latest_if:<15} {partition_text:<15} {warning_status:<15}")
+    
+    # 推荐建议（按分区等级与Top标记判断）
+    output.append("\n💡 投稿建议:")
+    for journal, results in all_results.items():
+        if results:
+            advice = recommendation(latest[journal], warned[journal])
+            if advice == RECOMMEND_AVOID:
+                output.append(f"  ❌ {journal}: 该期刊在预警名单中，不建议投稿")
+            elif advice == RECOMMEND_TOP:
+                output.append(f"  ⭐ {journal}: 顶级期刊，强烈推荐")
+            elif advice == RECOMMEND_GOOD:
+                output.append(f"  ✅ {journal}: 优质期刊，推荐投稿")
             else:
-                if keywords:
-                    output.append(f"  无匹配 '{keywords}' 的预警期刊")
-                else:
-                    output.append("  该年度无预警期刊数据")
-        
-        conn.close()
-        return "\n".join(output)
+                output.append(f"  📝 {journal}: 可考虑投稿")
     
-    except Exception as e:
-        return f"查询预警期刊出错: {str(e)}"
+    return "\n".join(output)
 
 
 @app.tool()
-async def compare_journals(journal_list: str) -> str:
+async def compare_journals(journal_list: str, format: str = "text") -> str:
     """
     比较多个期刊的综合信息
     
     Args:
         journal_list: 期刊名称列表，用逗号分隔，如"Nature,Science,Cell"
+        format: 输出格式，text（默认）或 json（每个期刊的最新影响因子、分区、预警等级与投稿建议代码
+            top/good/consider/avoid）
     
     Returns:
         多个期刊的对比分析结果
     """
     try:
-        journals = [j.strip() for j in journal_list.split(',')]
-        
-        if len(journals) < 2:
-            return "请至少提供2个期刊名称进行比较"
-        
-        output = ["📊 期刊对比分析结果"]
-        output.append("=" * 50)
-        
-        database = get_db()
-        all_results = {}
-        for journal in journals:
-            results = database.search_journal(journal)
-            all_results[journal] = results
-        
-        # 生成对比表格
-        output.append(f"\n{'期刊名称':<30} {'最新影响因子':<15} {'最新分区':<15} {'预警状态':<15}")
-        output.append("-" * 80)
-        
-        for journal, results in all_results.items():
-            if not results:
-                output.append(f"{journal:<30} {'无数据':<15} {'无数据':<15} {'无数据':<15}")
-                continue
-            
-            # 获取最新数据
-            latest_if = "无数据"
-            latest_partition = "无数据"
-            warning_status = "正常"
-            
-            for result in results:
-                if result.impact_factor:
-                    latest_if = str(result.impact_factor)
-                if result.partition:
-                    latest_partition = result.partition
-                if result.warning_status:
-                    warning_status = "⚠️预警"
-                    break
-            
-            output.append(f"{journal:<30} {latest_if:<15} {latest_partition:<15} {warning_status:<15}")
-        
-        # 推荐建议
-        output.append("\n💡 投稿建议:")
-        for journal, results in all_results.items():
-            if results:
-                has_warning = any(r.warning_status for r in results)
-                if has_warning:
-                    output.append(f"  ❌ {journal}: 该期刊在预警名单中，不建议投稿")
-                else:
-                    latest_partition = None
-                    for result in results:
-                        if result.partition:
-                            latest_partition = result.partition
-                            break
-                    
-                    if latest_partition and ("1区" in latest_partition or "Q1" in latest_partition):
-                        output.append(f"  ⭐ {journal}: 顶级期刊，强烈推荐")
-                    elif latest_partition and ("2区" in latest_partition or "Q2" in latest_partition):
-                        output.append(f"  ✅ {journal}: 优质期刊，推荐投稿")
-                    else:
-                        output.append(f"  📝 {journal}: 可考虑投稿")
-        
-        return "\n".join(output)
-    
+        return await get_executor().run(_render_compare_journals, journal_list, format)
     except Exception as e:
-        return f"比较分析出错: {str(e)}"
+        return _format_error(format, "比较分析出错", e)
+
+
+def _render_get_database_info(verify: bool = False) -> str:
+    """get_database_info 的阻塞实现（在数据库线程池中执行）"""
+    summary = get_db().database_info(verify=verify)
+    
+    info = ["📊 JCR分区表数据库信息"]
+    info.append("=" * 30)
+    info.append(f"数据库路径: {summary.db_path}")
+    info.append(f"数据库大小: {summary.size_bytes / 1024 / 1024:.1f} MB")
+    if summary.last_updated:
+        info.append(f"最后同步时间: {summary.last_updated[:19].replace('T', ' ')}")
+    info.append(f"数据表数量: {len(summary.tables)}")
+    
+    if summary.source_years:
+        info.append("\n📅 数据来源年份:")
+        for source, years in sorted(summary.source_years.items()):
+            info.append(f"  • {source}: {', '.join(str(year) for year in years)}")
+    
+    info.append("\n📋 可用数据表:")
+    for table in summary.tables:
+        if table.counted is not None and table.record_count is None:
+            info.append(f"  • {table.name}: {table.counted} 条记录（同步元数据未记录）")
+        elif table.counted is not None and table.counted != table.record_count:
+            info.append(f"  • {table.name}: {table.counted} 条记录（⚠️ 同步元数据为 {table.record_count} 条）")
+        elif table.record_count is not None:
+            verified = " ✅" if table.counted is not None else ""
+            info.append(f"  • {table.name}: {table.record_count} 条记录{verified}")
+        else:
+            info.append(f"  • {table.name}: 未记录")
+    
+    if not summary.verified:
+        info.append("\n💡 记录数取自同步元数据，读取 jcr://database-info/verify 可逐表重新统计")
+    
+    return "\n".join(info)
 
 
 @app.resource("jcr://database-info")
 async def get_database_info() -> str:
-    """获取数据库基本信息"""
+    """获取数据库基本信息（记录数取自同步元数据，按数据代次缓存）"""
     try:
-        database = get_db()
-        conn = sqlite3.connect(database.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
-        tables = [table[0] for table in cursor.fetchall()]
-        
-        info = ["📊 JCR分区表数据库信息"]
-        info.append("=" * 30)
-        info.append(f"数据库路径: {database.db_path}")
-        info.append(f"数据表数量: {len(tables)}")
-        info.append("\n📋 可用数据表:")
-        
-        for table in sorted(tables):
-            cursor.execute(f"SELECT COUNT(*) FROM {table}")
-            count = cursor.fetchone()[0]
-            info.append(f"  • {table}: {count} 条记录")
-        
-        conn.close()
-        return "\n".join(info)
-    
+        return await get_executor().run(_render_get_database_info)
+    except Exception as e:
+        return f"获取数据库信息出错: {str(e)}"
+
+
+@app.resource("jcr://database-info/verify")
+async def verify_database_info() -> str:
+    """获取数据库基本信息并逐表重新统计记录数（全表扫描，开销较大）"""
+    try:
+        return await get_executor().run(_render_get_database_info, True)
     except Exception as e:
         return f"获取数据库信息出错: {str(e)}"
 
@@ -329,51 +785,198 @@ async def journal_analysis_prompt(journal_name: str) -> str:
 """
 
 
-@app.resource("jcr://health")
-async def health_check() -> str:
-    """健康检查端点"""
+@app.resource("jcr://stats")
+async def get_runtime_stats() -> str:
+    """获取服务器运行统计信息"""
     try:
         database = get_db()
-        # 简单检查数据库是否可访问，使用 context manager
-        with sqlite3.connect(database.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT name FROM sqlite_master WHERE type='table' LIMIT 1")
-            cursor.fetchone()
+        pool = database.pool_stats()
+        
+        info = ["📈 JCR服务器运行统计"]
+        info.append("=" * 30)
+        info.append("🔌 连接池:")
+        info.append(f"  • 命中: {pool['hits']}")
+        info.append(f"  • 未命中: {pool['misses']}")
+        info.append(f"  • 空闲连接: {pool['idle']}")
+        info.append(f"  • 使用中连接: {pool['in_use']}")
+        info.append(f"  • 已丢弃连接: {pool['discarded']}")
         
-        return "OK"
+        matches = database.match_stats()
+        info.append("\n🔎 查询匹配路径:")
+        info.append(f"  • 精确匹配: {matches['exact']}")
+        info.append(f"  • 子串匹配: {matches['substring']}")
+        
+        cache = database.cache_stats()
+        info.append("\n🗃️ 查询结果缓存:")
+        info.append(f"  • 缓存条目: {cache['entries']}")
+        info.append(f"  • 估算占用: {cache['bytes'] / 1024:.1f} KiB")
+        info.append(f"  • 命中: {cache['hits']}")
+        info.append(f"  • 未命中: {cache['misses']}")
+        info.append(f"  • LRU淘汰: {cache['evictions']}")
+        info.append(f"  • 过期: {cache['expirations']}")
+        info.append(f"  • 数据更新失效: {cache['invalidations']}")
+        
+        tasks = get_executor().stats()
+        info.append("\n🧵 数据库线程池:")
+        info.append(f"  • 工作线程: {tasks['workers']}")
+        info.append(f"  • 执行中: {tasks['active']}")
+        info.append(f"  • 排队中: {tasks['queued']}（峰值 {tasks['max_queued']}）")
+        info.append(f"  • 已完成: {tasks['completed']}（失败 {tasks['failed']}）")
+        info.append(f"  • 平均等待: {tasks['avg_wait_ms']:.2f} ms")
+        info.append(f"  • 最长等待: {tasks['max_wait_ms']:.2f} ms")
+        
+        return "\n".join(info)
+    
+    except Exception as e:
+        return f"获取运行统计出错: {str(e)}"
+
+
+async def _readiness() -> dict:
+    """
+    获取就绪状态
+    
+    缓存期内直接返回；需要重新检查时在默认线程池中执行，
+    不在数据库线程池中排队，负载高时探测也能及时返回。
+    """
+    health = get_monitor()
+    report = health.cached_readiness()
+    if report is None:
+        report = await asyncio.to_thread(health.readiness)
+    return report
+
+
+@app.resource("jcr://health")
+async def health_check() -> str:
+    """健康检查端点（就绪时返回 OK）"""
+    try:
+        report = await _readiness()
+        if report["status"] == STATUS_READY:
+            return "OK"
+        return f"ERROR: {'; '.join(report['problems'])}"
     except Exception as e:
         return f"ERROR: {str(e)}"
 
 
+@app.resource("jcr://health/live", mime_type="application/json")
+async def liveness_probe() -> str:
+    """存活探针：只报告进程信息与运行时长，不访问数据库"""
+    return json.dumps(get_monitor().liveness(), ensure_ascii=False)
+
+
+@app.resource("jcr://health/ready", mime_type="application/json")
+async def readiness_probe() -> str:
+    """就绪探针：数据代次、数据新鲜度、连接池与数据库线程池状态（结果短暂缓存）"""
+    try:
+        return json.dumps(await _readiness(), ensure_ascii=False)
+    except Exception as e:
+        return json.dumps({"status": "not_ready", "problems": [str(e)]}, ensure_ascii=False)
+
+
+def _start_probe_server(probe_monitor=None):
+    """启动本地探针HTTP端点（端口被占用时只打印警告，不影响MCP服务）"""
+    global probe_server
+    try:
+        probe_server = start_probe_server(probe_monitor or get_monitor(), PROBE_HOST, PROBE_PORT)
+    except OSError as e:
+        print(f"⚠️ 探针端点 {PROBE_HOST}:{PROBE_PORT} 启动失败: {e}")
+
+
+def _reset_after_fork():
+    """工作进程中丢弃从主进程继承的数据库实例与线程池，首次使用时按本进程重新创建"""
+    global db, executor, monitor, probe_server, _init_lock
+    db = None
+    executor = None
+    monitor = None
+    _init_lock = threading.Lock()
+    if probe_server is not None:
+        # 探针端点只由主进程提供，关闭继承来的监听套接字（服务线程没有随 fork 复制）
+        probe_server.socket.close()
+        probe_server = None
+
+
+def _stateless_http_app():
+    """多进程模式下的 streamable-http 应用（无状态，任一工作进程都能处理任一请求）"""
+    app.settings.stateless_http = True
+    return app.streamable_http_app()
+
+
 def main():
     """主函数 - 作为命令行入口点"""
+    import argparse
     import sys
     
+    parser = argparse.ArgumentParser(description="JCR分区表MCP服务器")
+    parser.add_argument(
+        "transport", nargs="?", default=DEFAULT_TRANSPORT,
+        choices=["stdio", "sse", "streamable-http"], help="传输方式（默认读取 JCR_MCP_TRANSPORT）"
+    )
+    parser.add_argument(
+        "--workers", type=int, default=DEFAULT_WORKERS,
+        help="HTTP工作进程数（仅 streamable-http，默认读取 JCR_MCP_WORKERS）"
+    )
+    args = parser.parse_args()
+    transport = args.transport
+    workers = max(1, args.workers)
+    
+    if workers > 1 and transport != "streamable-http":
+        # SSE 会话的事件流与消息请求必须由同一进程处理，共享套接字无法保证这一点
+        print(f"❌ --workers 仅支持 streamable-http 传输，当前传输方式: {transport}")
+        sys.exit(1)
+    
     # 初始化数据库
     database = get_db()
     
-    # 从命令行参数或环境变量获取传输方式
-    transport = DEFAULT_TRANSPORT
-    if len(sys.argv) > 1 and sys.argv[1] in ["stdio", "sse", "streamable-http"]:
-        transport = sys.argv[1]
-    
     print("🚀 启动JCR分区表MCP服务器...")
     print(f"📊 数据库路径: {database.db_path}")
+    print(f"⚙️ 查询引擎: {database.engine}")
+    if database.immutable:
+        print("🔒 只读不可变模式: 已启用（同步数据后需重启服务）")
+    print(f"🧵 数据库线程数: {get_executor().max_workers}")
     print(f"🌐 传输方式: {transport}")
     
     if transport in ["sse", "streamable-http"]:
         print(f"🔌 监听地址: {DEFAULT_HOST}:{DEFAULT_PORT}")
         print(f"📍 访问地址: http://{DEFAULT_HOST}:{DEFAULT_PORT}")
+    if workers > 1:
+        print(f"👥 工作进程数: {workers}（无状态 streamable-http，kill -HUP 主进程可平滑重启）")
+        print("⚠️ 无状态模式下客户端没有会话，每个请求开销更大；未在本机实测吞吐量提升前请使用单进程（见 DEPLOYMENT.md）")
+    
+    # stdio 模式下只有显式配置端口时才启动探针端点
+    probes = PROBE_PORT > 0 and (transport != "stdio" or "JCR_MCP_PROBE_PORT" in os.environ)
+    if probes:
+        print(f"🩺 探针端点: http://{PROBE_HOST}:{PROBE_PORT}/livez, /readyz")
     
     print("🔧 可用工具:")
     print("  • search_journal - 搜索期刊信息")
+    print("  • search_by_issn - 按ISSN查询期刊")
+    print("  • autocomplete_journal - 按名称开头补全期刊")
     print("  • get_partition_trends - 获取分区趋势")
     print("  • check_warning_journals - 查询预警期刊")
+    print("  • query_journals - 按条件筛选期刊")
+    print("  • top_journals - 学科影响因子排名")
     print("  • compare_journals - 对比期刊")
     print("💡 提示词模板: journal_analysis_prompt")
-    print("📋 资源: jcr://database-info")
+    print("📋 资源: jcr://database-info, jcr://database-info/verify, jcr://stats, jcr://health/live, jcr://health/ready")
     print("\n⚡ 服务器启动中...")
     
+    if workers > 1:
+        from .workers import WorkerSupervisor, bind_socket
+        
+        # 主进程只监听端口并监控工作进程，不处理请求
+        database.close()
+        sock = bind_socket(DEFAULT_HOST, DEFAULT_PORT)
+        supervisor = WorkerSupervisor(
+            _stateless_http_app, sock, workers,
+            on_fork=_reset_after_fork, log_level=app.settings.log_level,
+        )
+        if probes:
+            # 探针端点只在主进程中绑定一次：数据库检查由主进程完成，并汇总各工作进程的状态
+            _start_probe_server(SupervisorMonitor(HealthMonitor(get_db, None), supervisor.status))
+        sys.exit(supervisor.run())
+    
+    if probes:
+        _start_probe_server()
+    
     # 运行MCP服务器
     app.run(transport=transport)
 
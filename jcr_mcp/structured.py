@@ -0,0 +1,122 @@
+"""
+结构化输出模块
+
+工具以 format="json" 调用时，直接把查询层返回的记录转换为紧凑的 JSON 对象，
+不生成带表情符号的文本，下游程序无需再解析文本。
+取值为空的字段一律省略；年份为整数，影响因子保持库中的原始取值（数值或如 "<0.1" 的文本）。
+"""
+import json
+from typing import Dict, List, Optional
+
+from .models import JournalInfo
+from .normalize import normalize_name
+from .warning_index import WarningIndex
+
+FORMAT_TEXT = "text"
+FORMAT_JSON = "json"
+OUTPUT_FORMATS = (FORMAT_TEXT, FORMAT_JSON)
+
+# 投稿建议代码（compare_journals）
+RECOMMEND_TOP = "top"
+RECOMMEND_GOOD = "good"
+RECOMMEND_CONSIDER = "consider"
+RECOMMEND_AVOID = "avoid"
+
+
+def check_format(output_format: Optional[str]) -> str:
+    """
+    校验输出格式参数
+
+    Raises:
+        ValueError: 不支持的输出格式
+    """
+    text = (output_format or FORMAT_TEXT).strip().lower()
+    if text not in OUTPUT_FORMATS:
+        raise ValueError(f"不支持的输出格式 '{output_format}'，可选值: {', '.join(OUTPUT_FORMATS)}")
+    return text
+
+
+def dumps(data) -> str:
+    """序列化为紧凑的 JSON 文本（不转义中文）"""
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+
+
+def _year(value: Optional[str]):
+    """JournalInfo 中文本形式的年份转换为整数"""
+    return int(value) if value and str(value).isdigit() else value
+
+
+def _compact(entry: Dict) -> Dict:
+    """省略取值为空的字段"""
+    return {key: value for key, value in entry.items() if value is not None and value != ""}
+
+
+def group_journal_records(results: List[JournalInfo]) -> List[List[JournalInfo]]:
+    """按期刊（统一表中按 journal_id，否则按规范化名称）分组，组内按年份降序排列"""
+    grouped: Dict = {}
+    for result in results:
+        key = result.journal_id if result.journal_id is not None else normalize_name(result.journal_name)
+        grouped.setdefault(key, []).append(result)
+    for infos in grouped.values():
+        infos.sort(key=lambda x: x.year or "0000", reverse=True)
+    return list(grouped.values())
+
+
+def warning_levels(levels: Dict[int, str]) -> Dict[str, str]:
+    """{年份: 预警等级} 转换为以文本年份为键（JSON对象键只能是字符串）、按年份降序排列"""
+    return {str(year): level for year, level in sorted(levels.items(), reverse=True)}
+
+
+def record_entry(info: JournalInfo) -> Dict:
+    """单条期刊记录（不含期刊名称与编号，由所属期刊给出）"""
+    return _compact({
+        "year": _year(info.year),
+        "impact_factor": info.impact_factor,
+        "partition": info.partition,
+        "category": info.category,
+        "warning": info.warning_status,
+        "ccf_level": info.ccf_level,
+    })
+
+
+def journal_entries(results: List[JournalInfo], warnings: Optional[WarningIndex] = None) -> List[Dict]:
+    """期刊记录按期刊分组，每个期刊附带其所在的预警名单年份与等级"""
+    entries = []
+    for infos in group_journal_records(results):
+        levels = warnings.levels_of(infos[0]) if warnings is not None else None
+        entries.append(_compact({
+            "journal_id": infos[0].journal_id,
+            "journal_name": infos[0].journal_name,
+            "warning_levels": warning_levels(levels) if levels else None,
+            "records": [record_entry(info) for info in infos],
+        }))
+    return entries
+
+
+def warning_entry(info: JournalInfo, reason: Optional[str] = None) -> Dict:
+    """单条预警名单记录（附带预警原因）"""
+    return _compact({
+        "journal_id": info.journal_id,
+        "journal_name": info.journal_name,
+        "year": _year(info.year),
+        "level": info.warning_status,
+        "reason": reason,
+    })
+
+
+def recommendation(latest: Optional[list], warned: bool) -> str:
+    """
+    按最新分区与预警状态给出投稿建议代码
+
+    Args:
+        latest: 趋势文档中的最新分区 [年份, 分区, 学科, 升降, 分区等级, 是否Top]
+        warned: 是否在预警名单中
+    """
+    if warned:
+        return RECOMMEND_AVOID
+    rank = latest[4] if latest else None
+    if rank == 1 or (latest and latest[5]):
+        return RECOMMEND_TOP
+    if rank == 2:
+        return RECOMMEND_GOOD
+    return RECOMMEND_CONSIDER
@@ -6,6 +6,7 @@ JCR分区表数据同步模块
 
 import asyncio
 import httpx
+import json
 import sqlite3
 import os
 import pandas as pd
@@ -13,8 +14,19 @@ from pathlib import Path
 import logging
 from typing import Dict, List, Optional
 from datetime import datetime
+from itertools import groupby
+from operator import itemgetter
 
+from .catalog import (
+    FTS_TABLE, ISSN_TABLE, RANKINGS_TABLE, RECORDS_TABLE, TRENDS_TABLE, SchemaCatalog, TableSchema,
+    parse_table_name,
+)
 from .config import get_database_path, get_data_dir
+from .normalize import (
+    is_top_partition, name_key, normalize_name, parse_impact_factor, partition_rank, quartile_code,
+    split_issns,
+)
+from .trends import build_trend
 
 
 # 配置日志
@@ -43,6 +55,100 @@ def setup_logger():
 logger = setup_logger()
 
 
+# 统一长表结构：每行对应一个来源、一个年份下的一条期刊记录
+# impact_factor/partition 保留原始取值用于展示；导入时另行解析出类型化列：
+# if_value（数值型影响因子，"<0.1" 等为NULL）、partition_rank（分区等级1-4）、
+# is_top（Top期刊标记）、quartile（规范化分区代码，JCR为Q1-Q4，中科院为1区-4区）
+RECORDS_SCHEMA = f"""
+CREATE TABLE {RECORDS_TABLE} (
+    journal_id INTEGER NOT NULL,
+    source TEXT NOT NULL,
+    year INTEGER NOT NULL,
+    journal_name TEXT NOT NULL,
+    normalized_name TEXT NOT NULL,
+    name_key TEXT NOT NULL,
+    impact_factor REAL,
+    partition TEXT,
+    category TEXT,
+    warning TEXT,
+    ccf_level TEXT,
+    if_value REAL,
+    partition_rank INTEGER,
+    is_top INTEGER NOT NULL DEFAULT 0,
+    quartile TEXT,
+    warning_reason TEXT
+)
+"""
+
+RECORDS_INDEXES = (
+    f"CREATE INDEX idx_{RECORDS_TABLE}_name ON {RECORDS_TABLE}(normalized_name)",
+    f"CREATE INDEX idx_{RECORDS_TABLE}_key ON {RECORDS_TABLE}(name_key)",
+    f"CREATE INDEX idx_{RECORDS_TABLE}_journal ON {RECORDS_TABLE}(journal_id)",
+    f"CREATE INDEX idx_{RECORDS_TABLE}_source_year ON {RECORDS_TABLE}(source, year)",
+    f"CREATE INDEX idx_{RECORDS_TABLE}_year_name ON {RECORDS_TABLE}(year, normalized_name)",
+    # 条件查询（query_journals）用的覆盖索引：按条件列定位后直接从索引中判断年份并取出 journal_id
+    f"CREATE INDEX idx_{RECORDS_TABLE}_category ON {RECORDS_TABLE}(category, source, year, journal_id)",
+    f"CREATE INDEX idx_{RECORDS_TABLE}_partition ON {RECORDS_TABLE}(partition, source, year, journal_id)",
+    f"CREATE INDEX idx_{RECORDS_TABLE}_if ON {RECORDS_TABLE}(if_value, source, year, journal_id)",
+    f"CREATE INDEX idx_{RECORDS_TABLE}_rank ON {RECORDS_TABLE}(partition_rank, source, year, journal_id)",
+    f"CREATE INDEX idx_{RECORDS_TABLE}_top ON {RECORDS_TABLE}(is_top, source, year, journal_id)",
+    f"CREATE INDEX idx_{RECORDS_TABLE}_quartile ON {RECORDS_TABLE}(quartile, source, year, journal_id)",
+    f"CREATE INDEX idx_{RECORDS_TABLE}_warning ON {RECORDS_TABLE}(warning, source, year, journal_id)",
+    f"CREATE INDEX idx_{RECORDS_TABLE}_ccf ON {RECORDS_TABLE}(ccf_level, source, year, journal_id)",
+)
+
+# 期刊名称三元组全文索引（外部内容表，内容取自统一表）
+FTS_SCHEMA = f"""
+CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(
+    normalized_name,
+    content='{RECORDS_TABLE}',
+    content_rowid='rowid',
+    tokenize='trigram'
+)
+"""
+
+# ISSN/eISSN 索引表：规范化ISSN（去连字符、大写） -> journal_id
+ISSN_SCHEMA = f"""
+CREATE TABLE {ISSN_TABLE} (
+    issn TEXT NOT NULL,
+    journal_id INTEGER NOT NULL,
+    PRIMARY KEY (issn, journal_id)
+) WITHOUT ROWID
+"""
+
+# 学科影响因子排名表：每个 (学科, 年份) 下的期刊按影响因子降序预先编号，
+# 取前 n 名只需沿主键读取 n 行
+RANKINGS_SCHEMA = f"""
+CREATE TABLE {RANKINGS_TABLE} (
+    category TEXT NOT NULL,
+    year INTEGER NOT NULL,
+    rank INTEGER NOT NULL,
+    journal_id INTEGER NOT NULL,
+    source TEXT NOT NULL,
+    journal_name TEXT NOT NULL,
+    impact_factor REAL NOT NULL,
+    if_year INTEGER NOT NULL,
+    partition TEXT,
+    PRIMARY KEY (category, year, rank)
+) WITHOUT ROWID
+"""
+
+# 期刊趋势文档表：每个期刊一行，document 为按年份汇总的分区/影响因子及预先计算的变化（JSON）
+TRENDS_SCHEMA = f"""
+CREATE TABLE {TRENDS_TABLE} (
+    journal_id INTEGER PRIMARY KEY,
+    journal_name TEXT NOT NULL,
+    document TEXT NOT NULL
+)
+"""
+
+# 从原始数据表中读取的字段（顺序即读取结果中的列顺序）
+_RECORD_FIELDS = (
+    "journal_name", "impact_factor", "partition", "category",
+    "warning_status", "ccf_level", "issn", "eissn", "is_top", "warning_reason",
+)
+
+
 class DataSyncer:
     """数据同步器类"""
     
@@ -184,6 +290,244 @@ class DataSyncer:
             logger.error(f"导入CSV失败 {csv_path}: {e}")
             return False
     
+    def _collect_records(self, conn: sqlite3.Connection, schema: TableSchema) -> List[list]:
+        """按列映射读取一张原始数据表，返回待写入统一表的记录"""
+        rows = conn.execute(
+            f'SELECT {schema.select_list(_RECORD_FIELDS)} FROM "{schema.name}"'
+        ).fetchall()
+        
+        records = []
+        for name, impact_factor, partition, category, warning, ccf_level, issn, eissn, top, reason in rows:
+            normalized = normalize_name(name)
+            if not normalized:
+                continue
+            issns = split_issns(issn)
+            issns += [x for x in split_issns(eissn) if x not in issns]
+            rank = partition_rank(partition)
+            records.append([
+                schema.source, schema.year, str(name).strip(), normalized, name_key(name),
+                impact_factor, partition, category, warning, ccf_level, issns,
+                parse_impact_factor(impact_factor), rank, int(is_top_partition(partition, top)),
+                quartile_code(schema.source, rank), reason,
+            ])
+        return records
+    
+    @staticmethod
+    def _resolve_journal_ids(records: List[list]) -> List[int]:
+        """
+        实体解析：为同一期刊的各来源记录分配统一的 journal_id
+        
+        名称匹配键相同或共享ISSN的记录视为同一期刊。同一张表中对应多个
+        不同名称的ISSN视为脏数据，不参与关联。
+        """
+        issn_names: Dict[tuple, set] = {}
+        for record in records:
+            source, year, key, issns = record[0], record[1], record[4], record[10]
+            for issn in issns:
+                issn_names.setdefault((source, year, issn), set()).add(key)
+        ambiguous = {key[2] for key, names in issn_names.items() if len(names) > 1}
+        
+        parent = list(range(len(records)))
+        
+        def find(i: int) -> int:
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+        
+        first_seen: Dict[tuple, int] = {}
+        for i, record in enumerate(records):
+            keys = [("name", record[4])]
+            keys.extend(("issn", issn) for issn in record[10] if issn not in ambiguous)
+            for key in keys:
+                j = first_seen.setdefault(key, i)
+                root_i, root_j = find(i), find(j)
+                if root_i != root_j:
+                    parent[root_i] = root_j
+        
+        # 按规范化名称排序分配编号，保证多次同步结果稳定
+        components: Dict[int, str] = {}
+        for i, record in enumerate(records):
+            root = find(i)
+            if root not in components or record[3] < components[root]:
+                components[root] = record[3]
+        ordered = sorted(components, key=lambda root: (components[root], root))
+        root_ids = {root: journal_id for journal_id, root in enumerate(ordered, start=1)}
+        
+        return [root_ids[find(i)] for i in range(len(records))]
+    
+    @staticmethod
+    def _build_name_fts(conn: sqlite3.Connection) -> bool:
+        """
+        为统一表的规范化名称构建FTS5三元组索引
+        
+        需要 SQLite 3.34+ 的 trigram 分词器，不支持时跳过，查询回退到LIKE。
+        """
+        try:
+            conn.execute(FTS_SCHEMA)
+        except sqlite3.OperationalError as e:
+            logger.warning(f"当前SQLite不支持FTS5 trigram分词器，跳过全文索引: {e}")
+            return False
+        
+        conn.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+        return True
+    
+    @staticmethod
+    def _build_category_rankings(conn: sqlite3.Connection) -> int:
+        """
+        根据统一表构建学科影响因子排名表
+        
+        JCR 学科按当年影响因子排名；中科院分区表（FQBJCR）学科取该期刊不晚于
+        该年份的最近一年JCR影响因子排名。没有数值型影响因子的期刊不参与排名，
+        同一期刊在同一学科、年份下只保留一条记录。
+        
+        Returns:
+            写入的排名记录数
+        """
+        impact_factors: Dict[int, Dict[int, float]] = {}
+        for journal_id, year, impact_factor in conn.execute(f"""
+            SELECT journal_id, year, MAX(if_value) FROM {RECORDS_TABLE}
+            WHERE source = 'JCR' AND if_value IS NOT NULL
+            GROUP BY journal_id, year
+        """):
+            impact_factors.setdefault(journal_id, {})[year] = impact_factor
+        
+        groups: Dict[tuple, Dict[int, tuple]] = {}
+        cursor = conn.execute(f"""
+            SELECT journal_id, source, year, journal_name, normalized_name, partition, category
+            FROM {RECORDS_TABLE}
+            WHERE source IN ('JCR', 'FQBJCR') AND category IS NOT NULL
+        """)
+        for journal_id, source, year, journal_name, normalized, partition, category in cursor:
+            by_year = impact_factors.get(journal_id)
+            category = str(category).strip()
+            if not by_year or not category:
+                continue
+            if_year = max((y for y in by_year if y <= year), default=None)
+            if if_year is None:
+                continue
+            # 排序键：影响因子降序、规范化名称、journal_id
+            impact_factor = by_year[if_year]
+            entry = (-impact_factor, normalized, journal_id, source, journal_name, impact_factor, if_year, partition)
+            members = groups.setdefault((category, year), {})
+            if journal_id not in members or entry < members[journal_id]:
+                members[journal_id] = entry
+        
+        conn.execute(RANKINGS_SCHEMA)
+        rows = [
+            (category, year, rank, journal_id, source, journal_name, impact_factor, if_year, partition)
+            for (category, year), members in groups.items()
+            for rank, (_, _, journal_id, source, journal_name, impact_factor, if_year, partition)
+            in enumerate(sorted(members.values()), start=1)
+        ]
+        conn.executemany(f"INSERT INTO {RANKINGS_TABLE} VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+        return len(rows)
+    
+    @staticmethod
+    def _build_journal_trends(conn: sqlite3.Connection) -> int:
+        """
+        根据统一表为每个期刊生成趋势文档
+        
+        Returns:
+            写入的期刊数
+        """
+        rows = conn.execute(f"""
+            SELECT journal_id, source, year, journal_name, partition, category, warning, ccf_level,
+                   if_value, partition_rank, is_top
+            FROM {RECORDS_TABLE} ORDER BY journal_id
+        """).fetchall()
+        
+        conn.execute(TRENDS_SCHEMA)
+        documents = []
+        for journal_id, group in groupby(rows, key=itemgetter(0)):
+            trend = build_trend(journal_id, (row[1:] for row in group))
+            documents.append((
+                journal_id, trend["journal_name"],
+                json.dumps(trend, ensure_ascii=False, separators=(",", ":")),
+            ))
+        conn.executemany(f"INSERT INTO {TRENDS_TABLE} VALUES (?, ?, ?)", documents)
+        return len(documents)
+    
+    def build_journal_records(self) -> int:
+        """
+        根据原始数据表构建统一的 journal_records 长表
+        
+        所有来源、年份的记录合并到一张带B树索引的表中，并通过实体解析
+        为同一期刊分配统一的 journal_id，查询时只需一次索引查询。
+        同时重建期刊名称的FTS5三元组索引（用于子串搜索）、ISSN索引表、学科影响因子排名表和期刊趋势文档表。
+        
+        整个重建在一个显式事务中完成（sqlite3 模块不会为 DROP/CREATE 自动开启事务），
+        服务器的读连接在提交前始终看到旧的完整派生表，不会读到缺失或为空的表；失败时全部回滚。
+        
+        Returns:
+            写入的记录数
+        """
+        conn = sqlite3.connect(self.db_path, isolation_level=None)
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            catalog = SchemaCatalog.load(conn)
+            records = []
+            for schema in catalog.journal_tables():
+                records.extend(self._collect_records(conn, schema))
+            
+            journal_ids = self._resolve_journal_ids(records)
+            
+            conn.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+            conn.execute(f"DROP TABLE IF EXISTS {ISSN_TABLE}")
+            conn.execute(f"DROP TABLE IF EXISTS {RANKINGS_TABLE}")
+            conn.execute(f"DROP TABLE IF EXISTS {TRENDS_TABLE}")
+            conn.execute(f"DROP TABLE IF EXISTS {RECORDS_TABLE}")
+            conn.execute(RECORDS_SCHEMA)
+            conn.executemany(
+                f"INSERT INTO {RECORDS_TABLE} VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    [journal_id] + record[:10] + record[11:]
+                    for journal_id, record in zip(journal_ids, records)
+                ),
+            )
+            for statement in RECORDS_INDEXES:
+                conn.execute(statement)
+            self._build_name_fts(conn)
+            
+            conn.execute(ISSN_SCHEMA)
+            issns = conn.executemany(
+                f"INSERT OR IGNORE INTO {ISSN_TABLE} VALUES (?, ?)",
+                (
+                    (issn, journal_id)
+                    for journal_id, record in zip(journal_ids, records)
+                    for issn in record[10]
+                ),
+            ).rowcount
+            rankings = self._build_category_rankings(conn)
+            trends = self._build_journal_trends(conn)
+            
+            # 派生表的记录数同样写入元数据，数据库信息无需逐表 COUNT(*)
+            current_time = datetime.now().isoformat()
+            conn.executemany("""
+            INSERT OR REPLACE INTO sync_metadata 
+            (table_name, last_updated, record_count, file_hash)
+            VALUES (?, ?, ?, ?)
+            """, [
+                (RECORDS_TABLE, current_time, len(records), ""),
+                (ISSN_TABLE, current_time, issns, ""),
+                (RANKINGS_TABLE, current_time, rankings, ""),
+                (TRENDS_TABLE, current_time, trends, ""),
+            ])
+            
+            conn.execute("COMMIT")
+        except BaseException:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+        
+        logger.info(
+            f"统一表 {RECORDS_TABLE} 已构建: {len(records)} 条记录, "
+            f"{len(set(journal_ids))} 个期刊, {rankings} 条学科排名"
+        )
+        return len(records)
+    
     async def sync_all_data(self, force_download: bool = False) -> Dict[str, bool]:
         """同步所有数据"""
         results = {}
@@ -231,6 +575,13 @@ class DataSyncer:
                 # 目录不为空或其他IO错误时忽略
                 pass
         
+        # 构建统一索引表
+        if any(results.values()):
+            try:
+                self.build_journal_records()
+            except Exception as e:
+                logger.error(f"构建统一表 {RECORDS_TABLE} 失败: {e}")
+        
         return results
     
     def get_sync_status(self) -> Dict[str, any]:
@@ -279,7 +630,8 @@ class DataSyncer:
             }
             
             for table in tables:
-                if table == 'sync_metadata':
+                # 元数据表与派生表不参与校验
+                if parse_table_name(table) is None:
                     continue
                 
                 try:
@@ -325,9 +677,10 @@ async def run_sync():
         print("1. 同步所有数据")
         print("2. 查看同步状态")
         print("3. 验证数据完整性")
-        print("4. 退出")
+        print("4. 重建统一索引表")
+        print("5. 退出")
         
-        choice = input("\n请选择操作 (1-4): ").strip()
+        choice = input("\n请选择操作 (1-5): ").strip()
         
         if choice == "1":
             print("\n🚀 开始同步数据...")
@@ -368,6 +721,14 @@ async def run_sync():
                 print("✅ 数据完整性验证通过")
         
         elif choice == "4":
+            print("\n🔧 重建统一索引表...")
+            try:
+                count = syncer.build_journal_records()
+                print(f"✅ 重建完成: {count} 条记录")
+            except Exception as e:
+                print(f"❌ 重建失败: {e}")
+        
+        elif choice == "5":
             print("👋 再见！")
             break
         
@@ -0,0 +1,96 @@
+"""
+期刊趋势文档模块
+
+同步时为每个期刊生成一份趋势文档（按年份汇总分区、影响因子、学科、预警等级，
+并预先计算影响因子的逐年变化和分区升降），写入 journal_trends 表；
+get_partition_trends 查询时只需按 journal_id 读取一行。
+未建立统一表的旧数据库在查询时用同一函数现场生成。
+"""
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+# 趋势文档格式版本，文档结构变化时递增；旧版本同步生成的文档不再使用，查询时从原始数据表现场生成
+TREND_VERSION = 2
+
+# 参与分区趋势的来源及展示名称
+PARTITION_SOURCES = {"FQBJCR": "中科院分区", "JCR": "JCR分区"}
+
+# 趋势记录: (来源, 年份, 期刊名称, 分区, 学科, 预警等级, CCF等级, 数值型影响因子, 分区等级, 是否Top)
+TrendRecord = Tuple[
+    str, int, str, Optional[str], Optional[str], Optional[str], Optional[str],
+    Optional[float], Optional[int], int,
+]
+
+
+def build_trend(journal_id: Optional[int], records: Iterable[TrendRecord]) -> Optional[dict]:
+    """
+    汇总一个期刊的全部记录生成趋势文档
+
+    同一来源、年份有多条记录（如JCR多个学科）时，分区取最高的一条，影响因子取最大值。
+
+    Returns:
+        {"version", "journal_id", "journal_name", "years": {年份: {...}},
+         "impact_factors": [[年份, 影响因子, 较上一年变化]],
+         "partitions": {来源: [[年份, 分区, 学科, 较上一年升降的区数, 分区等级, 是否Top]]}}；
+        没有记录时返回None
+    """
+    records = sorted(records, key=lambda record: (-record[1], record[0]))
+    if not records:
+        return None
+
+    years: Dict[int, dict] = {}
+    best: Dict[Tuple[str, int], tuple] = {}
+    for source, year, _, partition, category, warning, ccf_level, if_value, rank, top in records:
+        entry = years.setdefault(year, {})
+        if source == "JCR" and if_value is not None and if_value > entry.get("impact_factor", -1.0):
+            entry["impact_factor"] = if_value
+        if source in PARTITION_SOURCES and partition not in (None, ""):
+            current = best.get((source, year))
+            # 同一年份取等级最高的分区，等级相同时优先Top
+            order = (rank or 5, -top)
+            if current is None or order < current[0]:
+                best[(source, year)] = (order, str(partition), category, rank, bool(top))
+        if warning:
+            entry["warning"] = warning
+        if ccf_level:
+            entry["ccf_level"] = ccf_level
+
+    partitions: Dict[str, List[list]] = {}
+    for (source, year), (_, partition, category, rank, top) in sorted(
+        best.items(), key=lambda item: item[0][1]
+    ):
+        years[year][source] = {"partition": partition, "category": category, "rank": rank, "top": top}
+        series = partitions.setdefault(source, [])
+        previous = series[-1][4] if series else None
+        move = previous - rank if previous is not None and rank is not None else None
+        series.append([year, partition, category, move, rank, top])
+
+    impact_factors: List[list] = []
+    for year in sorted(years):
+        value = years[year].get("impact_factor")
+        if value is None:
+            continue
+        delta = round(value - impact_factors[-1][1], 3) if impact_factors else None
+        impact_factors.append([year, value, delta])
+
+    # 期刊名称取最新一年的记录（同一年份优先JCR）
+    latest = min(records, key=lambda record: (-record[1], record[0] != "JCR"))
+    return {
+        "version": TREND_VERSION,
+        "journal_id": journal_id,
+        "journal_name": str(latest[2]).strip(),
+        "years": {str(year): years[year] for year in sorted(years, reverse=True)},
+        "impact_factors": impact_factors,
+        "partitions": partitions,
+    }
+
+
+def latest_partition(trend: dict) -> Optional[list]:
+    """
+    趋势文档中的最新分区（优先中科院分区）
+
+    Returns:
+        [年份, 分区, 学科, 较上一年升降的区数, 分区等级, 是否Top]，没有分区时返回None
+    """
+    partitions = trend["partitions"]
+    return next((partitions[source][-1] for source in PARTITION_SOURCES if partitions.get(source)), None)
@@ -0,0 +1,141 @@
+"""
+预警名单成员索引模块
+
+每个数据代次构建一次：按名称匹配键、ISSN 和 journal_id 建立到各年份预警等级的哈希表，
+判断期刊是否在预警名单中只需一次字典查找；预警记录本身按年份降序、名称排列保存，
+预警名单查询在内存中过滤分页，不再访问数据库。
+"""
+from typing import Dict, Hashable, Iterable, List, Optional, Set, Tuple, Union
+
+from .models import JournalInfo, SearchResult
+from .normalize import name_key, normalize_issn, normalize_name
+
+
+class WarningIndex:
+    """预警名单成员索引（只读，按数据代次整体替换）"""
+
+    def __init__(
+        self,
+        records: Iterable[JournalInfo],
+        issns: Iterable[Tuple[str, Hashable]] = (),
+        aliases: Iterable[Tuple[str, Hashable]] = (),
+        generation: Tuple = (),
+        reasons: Iterable[Tuple[Hashable, int, str]] = (),
+    ):
+        """
+        构建索引
+
+        Args:
+            records: 预警名单记录；有 journal_id 的记录按 journal_id 归并，否则按名称匹配键归并
+            issns: (规范化ISSN, 期刊标识)，期刊标识为 journal_id 或名称匹配键
+            aliases: (名称匹配键, journal_id)，同一期刊在其他来源中的名称
+            generation: 数据代次标识
+            reasons: (期刊标识, 年份, 预警原因)，预警名单提供预警原因列时给出
+        """
+        self.generation = generation
+        # 期刊标识 -> {年份: 预警等级}
+        self.levels: Dict[Hashable, Dict[int, str]] = {}
+        self.by_name: Dict[str, Set[Hashable]] = {}
+        self.by_issn: Dict[str, Set[Hashable]] = {}
+        # (期刊标识, 年份) -> 预警原因
+        self.reasons: Dict[Tuple[Hashable, int], str] = {
+            (group, int(year)): reason for group, year, reason in reasons if reason
+        }
+
+        self.records = sorted(records, key=lambda info: (-int(info.year), info.journal_name))
+        for info in self.records:
+            key = name_key(info.journal_name)
+            group = info.journal_id if info.journal_id is not None else key
+            self.levels.setdefault(group, {})[int(info.year)] = info.warning_status or ""
+            self.by_name.setdefault(key, set()).add(group)
+        for key, group in aliases:
+            if group in self.levels:
+                self.by_name.setdefault(key, set()).add(group)
+        for issn, group in issns:
+            if group in self.levels:
+                self.by_issn.setdefault(issn, set()).add(group)
+
+        self.years: List[int] = sorted({int(info.year) for info in self.records}, reverse=True)
+        self._normalized = [normalize_name(info.journal_name) for info in self.records]
+
+    def __len__(self) -> int:
+        return len(self.levels)
+
+    def _groups(self, name_or_issn: str) -> Set[Hashable]:
+        """按ISSN或名称匹配键查找期刊标识"""
+        issn = normalize_issn(name_or_issn)
+        if issn is not None:
+            return self.by_issn.get(issn, set())
+        return self.by_name.get(name_key(name_or_issn), set())
+
+    def lookup(self, name_or_issn: str) -> Dict[int, str]:
+        """
+        查询期刊在各年份预警名单中的等级
+
+        Args:
+            name_or_issn: 期刊名称（按名称匹配键精确匹配）或ISSN/eISSN
+
+        Returns:
+            {年份: 预警等级}，不在任何预警名单中时为空
+        """
+        groups = self._groups(name_or_issn)
+        if len(groups) == 1:
+            return self.levels[next(iter(groups))]
+        merged: Dict[int, str] = {}
+        for group in groups:
+            merged.update(self.levels[group])
+        return merged
+
+    def levels_of(self, info: JournalInfo) -> Dict[int, str]:
+        """查询某条期刊记录对应期刊的预警等级（优先按 journal_id）"""
+        if info.journal_id is not None:
+            return self.levels.get(info.journal_id, {})
+        return self.lookup(info.journal_name)
+
+    def reason_of(self, info: JournalInfo) -> Optional[str]:
+        """查询某条预警记录的预警原因（预警名单未提供预警原因时返回None）"""
+        group = info.journal_id if info.journal_id is not None else name_key(info.journal_name)
+        return self.reasons.get((group, int(info.year)))
+
+    def is_warned(self, name_or_issn: str, year: Union[int, str, None] = None) -> bool:
+        """
+        判断期刊是否在预警名单中
+
+        Args:
+            name_or_issn: 期刊名称或ISSN/eISSN
+            year: 预警名单年份，为None时不限年份，"latest" 表示最新一年的名单
+        """
+        levels = self.lookup(name_or_issn)
+        if year is None or not levels:
+            return bool(levels)
+        if str(year).strip().lower() == "latest":
+            return bool(self.years) and self.years[0] in levels
+        return int(year) in levels
+
+    def search(
+        self, keywords: Optional[str] = None, limit: Optional[int] = None, offset: int = 0
+    ) -> SearchResult:
+        """
+        分页列出预警记录（按年份降序、名称排列）
+
+        在构建索引时预先排好序的记录列表上过滤并切片，不访问数据库
+        （取代了原先 search_warning_journals 中的 SQL LIMIT/OFFSET 分页）。
+
+        Args:
+            keywords: 关键词（可选）：ISSN 按期刊精确匹配，其他按规范化名称子串匹配
+            limit: 最多返回的预警记录数，为None时不限制
+            offset: 跳过的预警记录数
+        """
+        if keywords and normalize_issn(keywords) is not None:
+            groups = self._groups(keywords)
+            selected = [
+                info for info in self.records
+                if (info.journal_id if info.journal_id is not None else name_key(info.journal_name)) in groups
+            ]
+        elif keywords:
+            needle = normalize_name(keywords)
+            selected = [info for info, name in zip(self.records, self._normalized) if needle in name]
+        else:
+            selected = self.records
+        end = None if limit is None else offset + limit
+        return SearchResult(selected[offset:end], total=len(selected))
@@ -0,0 +1,173 @@
+"""
+多进程HTTP服务模块
+
+主进程绑定监听套接字后 fork 出 N 个工作进程，各工作进程共享该套接字 accept 连接，
+并各自创建 JCRDatabase 与数据库线程池（连接同一个只读数据库文件）。
+主进程只负责监控：工作进程异常退出时重新拉起，收到 SIGHUP 时逐个平滑重启，
+收到 SIGTERM/SIGINT 时通知所有工作进程处理完进行中的请求后退出。
+探针端点由主进程提供，通过 status() 汇总工作进程的运行情况。
+"""
+import os
+import signal
+import socket
+import sys
+import time
+import traceback
+from typing import Any, Callable, Dict, Optional, Set
+
+
+# 工作进程启动后存活不足该时长（秒）即退出，视为启动失败，重启前等待 restart_delay
+MIN_UPTIME = 5.0
+
+
+def bind_socket(host: str, port: int, backlog: int = 2048) -> socket.socket:
+    """创建供所有工作进程共享的监听套接字"""
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    # 显式指定 IPPROTO_TCP，asyncio 才会为接受的连接设置 TCP_NODELAY（否则小响应会被 Nagle 算法延迟约40ms）
+    sock = socket.socket(family, socket.SOCK_STREAM, socket.IPPROTO_TCP)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+class WorkerSupervisor:
+    """预派生工作进程的监控器（仅支持提供 os.fork 的平台）"""
+
+    def __init__(
+        self,
+        app_factory: Callable[[], Any],
+        sock: socket.socket,
+        workers: int,
+        on_fork: Optional[Callable[[], None]] = None,
+        log_level: str = "info",
+        restart_delay: float = 1.0,
+    ):
+        """
+        初始化监控器
+
+        Args:
+            app_factory: 在工作进程中调用，返回 ASGI 应用
+            sock: 共享的监听套接字
+            workers: 工作进程数
+            on_fork: 在工作进程中、创建应用之前调用，用于丢弃从主进程继承的全局状态
+            log_level: uvicorn 日志级别
+            restart_delay: 工作进程启动失败后的重启间隔（秒）
+        """
+        self.app_factory = app_factory
+        self.sock = sock
+        self.workers = max(1, workers)
+        self.on_fork = on_fork
+        self.log_level = log_level
+        self.restart_delay = restart_delay
+
+        # pid -> (工作进程编号, 启动时间)
+        self.children: Dict[int, tuple] = {}
+        # 平滑重启中等待替换的工作进程，每次只让一个退出，补位后再处理下一个
+        self.retiring: Set[int] = set()
+        self.stopping = False
+        self.restarts = 0
+
+    def status(self) -> Dict:
+        """工作进程的运行情况（供主进程中的探针线程读取）"""
+        pids = sorted(self.children)
+        return {
+            "expected": self.workers,
+            "running": len(pids),
+            "pids": pids,
+            "restarts": self.restarts,
+            "reloading": bool(self.retiring),
+            "stopping": self.stopping,
+        }
+
+    def _spawn(self, index: int):
+        """派生一个工作进程"""
+        pid = os.fork()
+        if pid == 0:
+            code = 0
+            try:
+                self._run_worker()
+            except BaseException:
+                traceback.print_exc()
+                code = 1
+            finally:
+                os._exit(code)
+        self.children[pid] = (index, time.monotonic())
+
+    def _run_worker(self):
+        """工作进程主体：恢复默认信号处理后在共享套接字上运行 uvicorn"""
+        import uvicorn
+
+        for signum in (signal.SIGTERM, signal.SIGINT, signal.SIGHUP):
+            signal.signal(signum, signal.SIG_DFL)
+        if self.on_fork is not None:
+            self.on_fork()
+
+        config = uvicorn.Config(self.app_factory(), log_level=self.log_level.lower())
+        uvicorn.Server(config).run(sockets=[self.sock])
+
+    def _signal_children(self, signum: int, pids=None):
+        """向工作进程发送信号（忽略已退出的进程）"""
+        for pid in list(self.children if pids is None else pids):
+            try:
+                os.kill(pid, signum)
+            except ProcessLookupError:
+                pass
+
+    def _handle_stop(self, signum, frame):
+        """SIGTERM/SIGINT：通知所有工作进程优雅退出"""
+        self.stopping = True
+        self._signal_children(signal.SIGTERM)
+
+    def _handle_reload(self, signum, frame):
+        """SIGHUP：逐个平滑重启工作进程，其余工作进程照常处理请求"""
+        if self.stopping or self.retiring:
+            return
+        self.retiring = set(self.children)
+        self._retire_next()
+
+    def _retire_next(self):
+        """通知下一个待替换的工作进程处理完进行中的请求后退出"""
+        pending = [pid for pid in self.children if pid in self.retiring]
+        if pending:
+            self._signal_children(signal.SIGTERM, pending[:1])
+
+    def run(self) -> int:
+        """启动全部工作进程并监控，直到收到停止信号且所有工作进程退出"""
+        signal.signal(signal.SIGTERM, self._handle_stop)
+        signal.signal(signal.SIGINT, self._handle_stop)
+        signal.signal(signal.SIGHUP, self._handle_reload)
+
+        for index in range(self.workers):
+            self._spawn(index)
+
+        while self.children:
+            try:
+                pid, status = os.wait()
+            except ChildProcessError:
+                break
+
+            entry = self.children.pop(pid, None)
+            if entry is None:
+                continue
+            index, started = entry
+            retired = pid in self.retiring
+            self.retiring.discard(pid)
+            if self.stopping:
+                continue
+
+            if not retired:
+                code = os.WEXITSTATUS(status) if os.WIFEXITED(status) else -os.WTERMSIG(status)
+                print(f"⚠️ 工作进程 {pid} 意外退出（退出码 {code}），正在重启", file=sys.stderr)
+                if time.monotonic() - started < MIN_UPTIME:
+                    time.sleep(self.restart_delay)
+                if self.stopping:
+                    continue
+            self.restarts += 1
+            self._spawn(index)
+            if retired:
+                self._retire_next()
+
+        self.sock.close()
+        return 0
@@ -95,17 +95,18 @@ class JCRDatabase:
             year = None
             
             # 解析年份
-            if 'JCR' in table_name:
+            # FQBJCR 表名同样包含 "JCR"，需先于 JCR 判断并按前缀匹配
+            if table_name.startswith('FQBJCR'):
+                year = table_name.replace('FQBJCR', '')
+                partition = row_dict.get('大类分区', row_dict.get('Partition'))
+                category = row_dict.get('学科', row_dict.get('Subject'))
+            
+            elif table_name.startswith('JCR'):
                 year = table_name.replace('JCR', '')
                 impact_factor = row_dict.get('IF', row_dict.get('Impact Factor'))
                 partition = row_dict.get('Quartile', row_dict.get('分区'))
                 category = row_dict.get('Category', row_dict.get('类别'))
             
-            elif 'FQBJCR' in table_name:
-                year = table_name.replace('FQBJCR', '')
-                partition = row_dict.get('大类分区', row_dict.get('Partition'))
-                category = row_dict.get('学科', row_dict.get('Subject'))
-            
             elif 'GJQKYJMD' in table_name:
                 year = table_name.replace('GJQKYJMD', '')
                 warning_status = row_dict.get('预警等级', row_dict.get('Warning Level'))
@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+"""
+多进程模式下主进程探针状态的汇总测试
+"""
+import socket
+
+from jcr_mcp.health import STATUS_NOT_READY, STATUS_READY, HealthMonitor, SupervisorMonitor
+from jcr_mcp.workers import WorkerSupervisor
+
+
+def test_supervisor_readiness(database):
+    with socket.socket() as sock:
+        supervisor = WorkerSupervisor(lambda: None, sock, workers=2)
+        probe = SupervisorMonitor(HealthMonitor(lambda: database, None, ttl=60), supervisor.status)
+
+        # 没有运行中的工作进程时未就绪，数据库检查本身通过
+        report = probe.readiness()
+        assert report["status"] == STATUS_NOT_READY
+        assert report["problems"] == ["没有运行中的工作进程"]
+        assert "executor" not in report
+
+        supervisor.children = {101: (0, 0.0), 102: (1, 0.0)}
+        report = probe.readiness()
+        assert report["status"] == STATUS_READY
+        assert report["workers"]["pids"] == [101, 102]
+
+        # 平滑重启期间暂时少一个工作进程仍视为就绪
+        supervisor.children, supervisor.retiring = {102: (1, 0.0)}, {101}
+        assert probe.readiness()["status"] == STATUS_READY
+
+        supervisor.stopping = True
+        assert probe.readiness()["problems"] == ["服务正在停止"]
+        assert probe.liveness()["workers"]["stopping"]
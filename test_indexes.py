@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+查询结果缓存、名称模糊匹配与前缀补全索引测试
+"""
+import time
+
+from jcr_mcp.cache import ResultCache
+from jcr_mcp.completion import CompletionIndex
+from jcr_mcp import fuzzy
+from jcr_mcp.fuzzy import FuzzyIndex, jaro_winkler
+from jcr_mcp.models import JournalInfo
+from jcr_mcp.normalize import name_key
+
+
+def test_cache_hit_and_lru_eviction():
+    cache = ResultCache(max_entries=2)
+    cache.put("a", 1, (1,))
+    cache.put("b", 2, (1,))
+    assert cache.get("a", (1,)) == (True, 1)
+    cache.put("c", 3, (1,))
+    
+    # "b" 最久未使用，被淘汰
+    assert cache.get("b", (1,)) == (False, None)
+    assert cache.get("a", (1,)) == (True, 1)
+    assert cache.get("c", (1,)) == (True, 3)
+    assert cache.stats()["evictions"] == 1
+
+
+def test_cache_invalidated_by_generation():
+    cache = ResultCache()
+    cache.put("a", 1, (1,))
+    assert cache.get("a", (2,)) == (False, None)
+    assert cache.stats()["invalidations"] == 1
+    assert cache.stats()["entries"] == 0
+
+
+def test_cache_byte_limit_and_ttl():
+    cache = ResultCache(max_bytes=1000, ttl=0.01)
+    cache.put("big", "x" * 2000, (1,))
+    assert cache.get("big", (1,)) == (False, None)
+    cache.put("a", 1, (1,))
+    time.sleep(0.02)
+    assert cache.get("a", (1,)) == (False, None)
+    assert cache.stats()["expirations"] == 1
+
+
+def test_cache_disabled():
+    cache = ResultCache(max_entries=0)
+    cache.put("a", 1, (1,))
+    assert not cache.enabled
+    assert cache.get("a", (1,)) == (False, None)
+
+
+def test_jaro_winkler():
+    assert jaro_winkler("nature", "nature") == 1.0
+    assert jaro_winkler("", "nature") == 0.0
+    assert jaro_winkler("martha", "marhta") > jaro_winkler("martha", "mahtra") > 0.5
+
+
+def test_fuzzy_suggestions():
+    index = FuzzyIndex(
+        ["Nature", "Nature Physics", "The Nature", "Cell", "Physical Review Letters"], generation=(1,),
+    )
+    # 名称匹配键相同的写法只保留首次出现的
+    assert len(index) == 4
+    suggestions = index.suggest("Natrue Physcs", min_score=0.8)
+    assert suggestions[0][0] == "Nature Physics"
+    assert all(score >= 0.8 for _, score in suggestions)
+    assert index.suggest("Physical Review Leters", limit=1)[0][0] == "Physical Review Letters"
+    assert index.suggest("zzzz") == []
+    assert index.suggest("  ") == []
+
+
+def test_fuzzy_pool_started_lazily(monkeypatch):
+    """构建索引不创建进程池；首次超过并行阈值的查询才在后台启动，本次仍串行打分"""
+    started = []
+    
+    class FakeExecutor:
+        def submit(self, *args):
+            started.append(args)
+    
+    monkeypatch.setattr(fuzzy, "_workers", 2)
+    monkeypatch.setattr(fuzzy, "_executor", None)
+    monkeypatch.setattr(fuzzy, "_get_executor", lambda: started.append("create") or FakeExecutor())
+    monkeypatch.setattr(FuzzyIndex, "parallel_threshold", 2)
+    
+    index = FuzzyIndex(["Nature Physics", "Nature Physics A", "Nature Physics B", "Nature Physics C"])
+    assert started == []
+    assert index.suggest("Natrue Physics", limit=1)[0][0] == "Nature Physics"
+    assert started[0] == "create"
+
+
+def test_completion_prefers_latest_values():
+    records = [
+        JournalInfo("Nature Physics", 20.5, "Q1", year="2024", journal_id=1),
+        JournalInfo("Nature Physics", None, "1区", year="2025", journal_id=1),
+        JournalInfo("Nature", 50.0, "Q1", year="2024", journal_id=2),
+        JournalInfo("The Natural History", 1.0, "Q3", year="2023"),
+        JournalInfo("Cell", 40.0, "Q1", year="2024", journal_id=3),
+    ]
+    # 记录须按年份降序排列
+    records.sort(key=lambda info: info.year, reverse=True)
+    index = CompletionIndex(((name_key(info.journal_name), info) for info in records), generation=(1,))
+    
+    completions = index.complete("nat")
+    # 按名称匹配键的字典序排列（"natural history" < "nature"）
+    assert [entry.journal_name for entry in completions] == ["The Natural History", "Nature", "Nature Physics"]
+    physics = completions[2]
+    assert (physics.partition, physics.partition_year) == ("1区", "2025")
+    assert (physics.impact_factor, physics.impact_factor_year) == (20.5, "2024")
+    assert [entry.journal_name for entry in index.complete("the nature", limit=1)] == ["Nature"]
+    assert index.complete("nat", limit=0) == []
+    assert index.complete("xyz") == []
+
+
+def test_database_suggest_and_autocomplete(database):
+    assert database.suggest("Alpah Journal")[0][0] == "Alpha Journal"
+    completions = database.autocomplete("be")
+    assert [entry.journal_name for entry in completions] == ["Beta Letters"]
+    assert completions[0].partition == "2 [10/45]"
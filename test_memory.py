@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+内存列式快照引擎测试
+"""
+import pytest
+
+from jcr_mcp import server
+from jcr_mcp.database import ENGINE_MEMORY, JCRDatabase
+
+
+@pytest.fixture
+def memory_database(db_path):
+    database = JCRDatabase(db_path, engine=ENGINE_MEMORY, cache_size=0)
+    yield database
+    database.close()
+
+
+def test_memory_engine_matches_sqlite(memory_database, database):
+    for name in ("Alpha Journal", "beta", "Gamma Reviews"):
+        assert memory_database.search_journal(name) == database.search_journal(name)
+        assert memory_database.partition_trend(name) == database.partition_trend(name)
+    assert memory_database.get_warning_index().is_warned("Gamma Reviews")
+
+
+def test_memory_engine_serves_hot_paths_without_connections(memory_database):
+    """快照加载后，趋势、对比、预警与表结构目录的查询不再借用连接"""
+    def run():
+        memory_database.partition_trend("Alpha Journal")
+        memory_database.get_warning_index().search("gamma")
+        memory_database.get_catalog().years("GJQKYJMD")
+        server._render_compare_journals("Alpha Journal, Beta Letters, Gamma Reviews")
+    
+    server.db = memory_database
+    try:
+        run()
+        borrowed = memory_database.pool_stats()["hits"] + memory_database.pool_stats()["misses"]
+        run()
+        assert memory_database.pool_stats()["hits"] + memory_database.pool_stats()["misses"] == borrowed
+    finally:
+        server.db = None
+
+
+def test_trend_documents_are_independent_copies(memory_database):
+    trend = memory_database.partition_trend("Alpha Journal")
+    trend["partitions"].clear()
+    assert memory_database.partition_trend("Alpha Journal")["partitions"]
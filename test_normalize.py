@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+名称与标识规范化测试
+"""
+import pytest
+
+from jcr_mcp.models import MATCH_EXACT, MATCH_SUBSTRING
+from jcr_mcp.normalize import (
+    is_top_partition, match_rank, name_key, normalize_issn, normalize_name,
+    parse_impact_factor, partition_rank, quartile_code, split_issns,
+)
+
+
+def test_normalize_name():
+    assert normalize_name("  Nature   Communications ") == "nature communications"
+    assert normalize_name("ÉCOLE\tNormale") == "école normale"
+    assert normalize_name(None) == ""
+
+
+@pytest.mark.parametrize("name, key", [
+    ("The Journal of Physical Chemistry. A", "journal of physical chemistry a"),
+    ("Science & Engineering", "science and engineering"),
+    ("Science and Engineering", "science and engineering"),
+    ("IEEE Trans. on Pattern-Analysis", "ieee trans on pattern analysis"),
+    ("Theoretical Biology", "theoretical biology"),
+    ("  ", ""),
+    (None, ""),
+])
+def test_name_key(name, key):
+    assert name_key(name) == key
+
+
+def test_match_rank():
+    assert match_rank("nature", "nature") == 0
+    assert match_rank("nature physics", "nature") == 1
+    assert match_rank("cell nature", "nature") == 2
+
+
+@pytest.mark.parametrize("value, issn", [
+    ("0028-0836", "00280836"),
+    (" 1476 4687 ", "14764687"),
+    ("0036-807x", "0036807X"),
+    ("0028-083", None),
+    ("N/A", None),
+    ("", None),
+    (None, None),
+])
+def test_normalize_issn(value, issn):
+    assert normalize_issn(value) == issn
+
+
+def test_split_issns():
+    assert split_issns("0028-0836/1476-4687") == ["00280836", "14764687"]
+    assert split_issns("0028-0836; 0028-0836, bad") == ["00280836"]
+    assert split_issns(None) == []
+
+
+@pytest.mark.parametrize("value, number", [
+    (12.5, 12.5),
+    (3, 3.0),
+    (" 3.25 ", 3.25),
+    ("<0.1", None),
+    ("N/A", None),
+    (float("nan"), None),
+    (True, None),
+    (None, None),
+])
+def test_parse_impact_factor(value, number):
+    assert parse_impact_factor(value) == number
+
+
+@pytest.mark.parametrize("partition, rank", [
+    ("Q1", 1),
+    ("q 2", 2),
+    ("1区", 1),
+    ("2区 Top", 2),
+    ("1 [3/45]", 1),
+    ("4", 4),
+    ("5", None),
+    ("12", None),
+    ("N/A", None),
+    (None, None),
+])
+def test_partition_rank(partition, rank):
+    assert partition_rank(partition) == rank
+
+
+def test_is_top_partition():
+    assert is_top_partition("1区", "是")
+    assert is_top_partition("1区 Top")
+    assert not is_top_partition("1区", "否")
+    assert not is_top_partition(None)
+
+
+def test_quartile_code():
+    assert quartile_code("JCR", 1) == "Q1"
+    assert quartile_code("FQBJCR", 2) == "2区"
+    assert quartile_code("JCR", None) is None
+
+
+@pytest.mark.parametrize("query", ["Alpha Journal", "the alpha-journal", "ALPHA  JOURNAL."])
+def test_exact_match_uses_name_key(database, query):
+    result = database.search(query)
+    assert result.match_type == MATCH_EXACT
+    assert {info.journal_name for info in result.journals} == {"Alpha Journal"}
+
+
+def test_search_falls_back_to_substring(database):
+    result = database.search("alpha")
+    assert result.match_type == MATCH_SUBSTRING
+    assert result.total == 1
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+query_journals 条件查询测试
+
+在临时数据库（见 conftest.py）中验证过滤条件的解析与执行
+（分区条件须同时匹配JCR的 "Q1" 与中科院分区表的 "1 [3/45]"、"1区" 等存储格式）。
+"""
+import pytest
+
+from jcr_mcp.query import Condition, FilterStats, RowCondition, normalize_value, parse_sort, split_filters
+
+
+@pytest.fixture
+def stats():
+    """统计信息：文本字段各取值的记录数与类型化数值字段的取值"""
+    return FilterStats(
+        value_counts={
+            "category": {"COMPUTER SCIENCE": 5, "计算机科学": 3, "CHEMISTRY": 2},
+            "partition": {"Q1": 2, "1区": 1, "1 [3/45]": 1},
+            "warning": {"高": 1},
+        },
+        numeric_values={"if_value": [0.5, 1.0, 3.2, 12.5], "partition_rank": [1, 1, 1, 2, 4], "is_top": [0, 1]},
+        total=10,
+    )
+
+
+def matched(database, filters, **kwargs):
+    """执行条件查询，返回命中的期刊名称集合"""
+    page = database.query_journals(filters, **kwargs)
+    return {info.journal_name for info in page.journals}
+
+
+@pytest.mark.parametrize("filters", ["partition=1区", "分区=1 区"])
+def test_cas_partition_matches_every_cas_format(database, filters):
+    """N区 只匹配中科院分区，与存储格式（"1 [3/45]"、"1区"）无关；Omega CS 是JCR Q1、中科院2区"""
+    assert matched(database, filters) == {"Alpha Journal", "Delta Acta"}
+
+
+def test_partition_quartile_matches_jcr_only(database):
+    assert matched(database, "partition=Q1") == {"Alpha Journal", "Omega CS"}
+    assert matched(database, "partition=q2") == {"Beta Letters"}
+
+
+def test_bare_partition_rank_matches_every_source(database):
+    assert matched(database, "partition=1") == {"Alpha Journal", "Delta Acta", "Omega CS"}
+    assert matched(database, "partition=2") == {"Beta Letters", "Omega CS"}
+
+
+def test_partition_not_equal(database):
+    assert matched(database, "partition!=1") == {"Beta Letters", "Gamma Reviews"}
+    assert matched(database, "partition!=1区") == {"Beta Letters", "Gamma Reviews", "Omega CS"}
+    assert matched(database, "partition!=Q4") == {"Alpha Journal", "Beta Letters", "Delta Acta", "Omega CS"}
+
+
+def test_partition_range(database):
+    assert matched(database, "partition<=2") == {"Alpha Journal", "Beta Letters", "Delta Acta", "Omega CS"}
+    assert matched(database, "partition>2") == {"Alpha Journal", "Gamma Reviews"}
+
+
+def test_combined_conditions(database):
+    assert matched(database, "category=计算机科学; partition=1区; if>5") == {"Alpha Journal"}
+    assert matched(database, "category=COMPUTER SCIENCE; partition=Q1; if>5") == {"Alpha Journal"}
+    assert matched(database, "partition<=2; top=yes") == {"Alpha Journal"}
+    assert matched(database, "warning=none; if<5") == {"Beta Letters"}
+
+
+def test_cas_partition_within_category(database):
+    """中科院计算机科学1区：学科与分区须出自同一条记录（Omega CS 在计算机科学为2区，只在JCR其他学科为Q1）"""
+    assert matched(database, "category=计算机科学; partition=1区") == {"Alpha Journal"}
+    assert matched(database, "category=计算机科学; partition=1") == {"Alpha Journal"}
+    assert matched(database, "category=计算机科学; partition=2区") == {"Beta Letters", "Omega CS"}
+    assert matched(database, "学科=计算机科学; top=yes") == {"Alpha Journal"}
+
+
+def test_jcr_quartile_within_category(database):
+    """Alpha Journal 在 COMPUTER SCIENCE 为Q1，只在 MATHEMATICS 为Q3"""
+    assert matched(database, "category=COMPUTER SCIENCE; partition=Q3") == set()
+    assert matched(database, "category=MATHEMATICS; partition=Q3") == {"Alpha Journal"}
+    # 排除条件与按期刊汇总的条件仍按期刊判断
+    assert matched(database, "category=COMPUTER SCIENCE; partition!=Q3") == {"Beta Letters"}
+    assert matched(database, "category=ENGINEERING; partition=Q1; if>5; warning=none") == {"Omega CS"}
+
+
+def test_non_numeric_impact_factor_never_matches(database):
+    """"<0.1" 等无法比较的影响因子解析为NULL，不满足任何数值条件"""
+    assert "Gamma Reviews" not in matched(database, "if<1")
+
+
+def test_invalid_filters(database):
+    with pytest.raises(ValueError):
+        database.query_journals("partition=abc")
+    with pytest.raises(ValueError):
+        database.query_journals("foo=1")
+    with pytest.raises(ValueError):
+        database.query_journals("if>abc")
+
+
+def test_split_filters():
+    assert split_filters("category=计算机科学; if>5；top=yes\nwarning=none") == [
+        "category=计算机科学", "if>5", "top=yes", "warning=none",
+    ]
+    assert split_filters("if>5 AND partition=1 && ccf=A") == ["if>5", "partition=1", "ccf=A"]
+    assert split_filters("category=Physics, Applied") == ["category=Physics, Applied"]
+    assert split_filters("") == []
+
+
+def test_normalize_value():
+    assert normalize_value(" 1 区") == normalize_value("1") == "1"
+    assert normalize_value("Q1") == "q1"
+    assert normalize_value("A类") == "a"
+
+
+def test_parse_partition_formats(stats):
+    (rank,) = stats.parse("partition=1")
+    assert (rank.column, rank.low, rank.high, rank.negate) == ("partition_rank", 1, 1, False)
+    (cas,) = stats.parse("partition=1 区")
+    assert (cas.column, cas.values, cas.negate) == ("quartile", ("1区",), False)
+    (quartile,) = stats.parse("分区!=q 2")
+    assert (quartile.column, quartile.values, quartile.negate) == ("quartile", ("Q2",), True)
+    (below,) = stats.parse("partition<=2")
+    assert (below.column, below.low, below.high, below.include_high) == ("partition_rank", None, 2, True)
+    (substring,) = stats.parse("partition~[3/45]")
+    assert (substring.column, substring.values) == ("partition", ("1 [3/45]",))
+    (missing,) = stats.parse("partition=none")
+    assert (missing.column, missing.values, missing.negate) == ("partition", None, True)
+
+
+def test_parse_resolves_stored_values(stats):
+    (category,) = stats.parse("学科='computer science'")
+    assert category.values == ("COMPUTER SCIENCE",)
+    (category,) = stats.parse("category=物理")
+    assert category.values == ()
+    (category,) = stats.parse("category~科学")
+    assert category.values == ("计算机科学",)
+    (warning,) = stats.parse("warning=any")
+    assert (warning.values, warning.negate) == (None, False)
+
+
+def test_parse_numeric_and_top(stats):
+    greater, equal, top, not_top = stats.parse("if>5; 影响因子=3.2; top=是; top=no")
+    assert (greater.low, greater.include_low, greater.high) == (5, False, None)
+    assert (equal.low, equal.high, equal.negate) == (3.2, 3.2, False)
+    assert (top.column, top.low, top.negate) == ("is_top", 1, False)
+    assert not_top.negate
+
+
+@pytest.mark.parametrize("filters", [
+    "partition=5区", "partition~", "if~5", "if>high", "top>1", "top=maybe", "category>a", "foo=1", "if 5",
+])
+def test_parse_invalid(stats, filters):
+    with pytest.raises(ValueError):
+        stats.parse(filters)
+
+
+def test_condition_sql():
+    assert Condition("if_value", ">", "if>5", low=5, include_low=False).sql() == ("if_value > ?", [5])
+    assert Condition("if_value", "=", "if=5", low=5, high=5).sql(indexed=False) == (
+        "+if_value >= ? AND +if_value <= ?", [5, 5],
+    )
+    assert Condition("quartile", "=", "", values=("Q1",)).sql() == ("quartile IN (?)", ["Q1"])
+    assert Condition("warning", "=", "").sql() == ("warning IS NOT NULL", [])
+    assert Condition("category", "=", "", values=()).sql() == ("0", [])
+
+
+def test_estimate_and_plan(stats):
+    category, partition, high_if, no_warning = stats.parse("category=计算机科学; partition<=2; if>=3; warning=none")
+    assert stats.estimate(category) == 3
+    assert stats.estimate(partition) == 4
+    assert stats.estimate(high_if) == 2
+    assert stats.estimate(no_warning) == 1
+    # 学科与分区合并为同一条记录上的条件（估算数取较小值）；正向条件按估算数升序，排除条件排在最后
+    assert stats.plan([category, partition, high_if, no_warning]) == [
+        (high_if, 2), (RowCondition((category, partition)), 3), (no_warning, 1),
+    ]
+    assert RowCondition((category, partition)).sql() == (
+        "(category IN (?)) AND (partition_rank <= ?)", ["计算机科学", 2],
+    )
+    # 单个记录条件不合并
+    assert stats.plan([category, high_if]) == [(high_if, 2), (category, 3)]
+
+
+@pytest.mark.parametrize("sort, expected", [
+    (None, ("if_value", True)),
+    ("if", ("if_value", True)),
+    ("if asc", ("if_value", False)),
+    ("-name", ("name", True)),
+    ("名称", ("name", False)),
+    ("Name DESC", ("name", True)),
+])
+def test_parse_sort(sort, expected):
+    assert parse_sort(sort) == expected
+
+
+def test_parse_sort_invalid():
+    with pytest.raises(ValueError):
+        parse_sort("year")
+
+
+def test_query_sort_and_paging(database):
+    def ordered(page):
+        return list(dict.fromkeys(info.journal_name for info in page.journals))
+    
+    # 没有影响因子的期刊排在最后
+    assert ordered(database.query_journals("partition<=2", sort="if")) == [
+        "Alpha Journal", "Omega CS", "Beta Letters", "Delta Acta",
+    ]
+    by_name = database.query_journals("partition<=2", sort="-name", limit=2)
+    assert by_name.total == 4
+    assert ordered(by_name) == ["Omega CS", "Delta Acta"]
+    assert ordered(database.query_journals("partition<=2", sort="-name", limit=2, offset=2)) == [
+        "Beta Letters", "Alpha Journal",
+    ]
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+期刊名称子串搜索、年份过滤与分页测试
+"""
+import re
+import shutil
+import sqlite3
+
+import pytest
+
+from jcr_mcp import server
+from jcr_mcp.catalog import RECORDS_TABLE, YearFilter
+from jcr_mcp.database import JCRDatabase
+from jcr_mcp.paging import decode_cursor, encode_cursor
+
+
+def names(result):
+    """按出现顺序列出搜索结果中的期刊名称（去重）"""
+    return list(dict.fromkeys(info.journal_name for info in result.journals))
+
+
+@pytest.fixture(params=["records", "tables"])
+def any_database(request, db_path, tmp_path):
+    """已同步的数据库（统一表 + FTS5 三元组索引），以及只有原始数据表的数据库"""
+    if request.param == "records":
+        database = JCRDatabase(db_path, cache_size=0)
+    else:
+        path = str(tmp_path / "jcr.db")
+        shutil.copy(db_path, path)
+        with sqlite3.connect(path) as conn:
+            conn.execute(f"DROP TABLE {RECORDS_TABLE}")
+        database = JCRDatabase(path, cache_size=0)
+    yield database
+    database.close()
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("lett", ["Beta Letters"]),
+    # 少于3个字符时三元组索引无法使用，退化为逐行匹配
+    ("ta", ["Beta Letters", "Delta Acta"]),
+    ("REVIEW", ["Gamma Reviews"]),
+    ("no such", []),
+])
+def test_substring_search(any_database, query, expected):
+    assert names(any_database.search(query)) == expected
+
+
+def test_search_matches_normalized_name(any_database):
+    """大小写与空白不同的输入共用同一缓存键，两条路径都按规范化名称匹配"""
+    for query in ("  beta   LETTERS ", "Beta\tLett"):
+        assert names(any_database.search(query)) == ["Beta Letters"]
+        assert [info.journal_name for info in any_database.search_many([query])[query]] == [
+            info.journal_name for info in any_database.search("Beta Letters").journals
+        ]
+
+
+def test_substring_results_ranked_and_paged(any_database):
+    """前缀匹配排在子串匹配之前，同等级按名称排序；limit/offset 按期刊分页"""
+    result = any_database.search("a")
+    assert result.total == 5
+    assert names(result) == ["Alpha Journal", "Beta Letters", "Delta Acta", "Gamma Reviews", "Omega CS"]
+    assert names(any_database.search("a", limit=2, offset=2)) == ["Delta Acta", "Gamma Reviews"]
+    assert names(any_database.search("a", limit=2, offset=4)) == ["Omega CS"]
+    assert any_database.search("a", limit=2, offset=5).journals == []
+
+
+def test_search_year_filter(any_database):
+    def years(year):
+        return sorted(info.year for info in any_database.search("Alpha Journal", year=year).journals)
+    
+    # 2024年JCR中有两个学科的记录
+    assert years(None) == ["2023", "2024", "2024", "2025"]
+    assert years("2024") == ["2024", "2024"]
+    assert years("2023-2024") == ["2023", "2024", "2024"]
+    # 各来源的最新年份：JCR 2024、中科院分区表 2025
+    assert years("latest") == ["2024", "2024", "2025"]
+    with pytest.raises(ValueError):
+        any_database.search("Alpha Journal", year="24")
+
+
+@pytest.mark.parametrize("year, expected", [
+    (None, None),
+    ("", None),
+    ("  ", None),
+    ("latest", YearFilter(latest=True)),
+    (" LATEST ", YearFilter(latest=True)),
+    ("2024", YearFilter(2024, 2024)),
+    (2024, YearFilter(2024, 2024)),
+    ("2022-2024", YearFilter(2022, 2024)),
+    ("2024 ~ 2022", YearFilter(2022, 2024)),
+    ("2022至2024", YearFilter(2022, 2024)),
+])
+def test_year_filter_parse(year, expected):
+    assert YearFilter.parse(year) == expected
+
+
+@pytest.mark.parametrize("year", ["24", "2024-", "2022-2024-2025", "last"])
+def test_year_filter_parse_invalid(year):
+    with pytest.raises(ValueError):
+        YearFilter.parse(year)
+
+
+def test_year_filter_matches_and_sql():
+    latest = {"JCR": 2024, "FQBJCR": 2025}
+    assert YearFilter.parse("latest").matches("FQBJCR", 2025, latest)
+    assert not YearFilter.parse("latest").matches("JCR", 2023, latest)
+    assert YearFilter.parse("2022-2024").matches("JCR", 2023, latest)
+    assert YearFilter.parse("2022-2024").sql(latest) == ("year BETWEEN ? AND ?", [2022, 2024])
+    assert YearFilter.parse("latest").sql(latest, "r.") == (
+        "((r.source = ? AND r.year = ?) OR (r.source = ? AND r.year = ?))",
+        ["FQBJCR", 2025, "JCR", 2024],
+    )
+    assert YearFilter.parse("latest").sql({}) == ("0", [])
+
+
+def test_cursor_round_trip():
+    scope = ("search_journal", "nature", None)
+    assert decode_cursor(encode_cursor(20, *scope), *scope) == 20
+    assert decode_cursor(None, *scope) == 0
+    assert decode_cursor("", *scope) == 0
+
+
+@pytest.mark.parametrize("cursor", [
+    encode_cursor(20, "search_journal", "science", None),
+    encode_cursor(20, "search_journal", "nature", "2024"),
+    encode_cursor(-1, "search_journal", "nature", None),
+    "not-a-cursor",
+    "e30",
+])
+def test_cursor_rejected_for_other_queries(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor, "search_journal", "nature", None)
+
+
+def test_search_journal_pages_with_cursor(database):
+    server.db = database
+    try:
+        first = server._render_search_journal("a", limit=2)
+        assert "当前显示第 1-2 个" in first
+        cursor = re.search(r'cursor="([^"]+)"', first).group(1)
+        
+        second = server._render_search_journal("a", limit=2, cursor=cursor)
+        assert "当前显示第 3-4 个" in second
+        assert "Delta Acta" in second and "Alpha Journal" not in second
+        cursor = re.search(r'cursor="([^"]+)"', second).group(1)
+        
+        last = server._render_search_journal("a", limit=2, cursor=cursor)
+        assert "当前显示第 5-5 个" in last and "Omega CS" in last
+        assert "cursor=" not in last
+        
+        with pytest.raises(ValueError):
+            server._render_search_journal("alpha", limit=2, cursor=cursor)
+    finally:
+        server.db = None
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+统一表重建测试
+"""
+import shutil
+import sqlite3
+
+import pytest
+
+from jcr_mcp.catalog import RECORDS_TABLE, TRENDS_TABLE
+from jcr_mcp.sync import DataSyncer
+
+
+def _counts(path):
+    with sqlite3.connect(path) as conn:
+        return tuple(
+            conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+            for table in (RECORDS_TABLE, TRENDS_TABLE)
+        )
+
+
+def test_rebuild_is_atomic(db_path, tmp_path, monkeypatch):
+    """重建过程中其他连接始终读到旧的完整派生表，重建失败时全部回滚"""
+    path = str(tmp_path / "jcr.db")
+    shutil.copy(db_path, path)
+    before = _counts(path)
+    seen = []
+    
+    def failing_trends(self, conn):
+        seen.append(_counts(path))
+        raise RuntimeError("中途失败")
+    
+    monkeypatch.setattr(DataSyncer, "_build_journal_trends", failing_trends)
+    with pytest.raises(RuntimeError):
+        DataSyncer(path).build_journal_records()
+    
+    assert seen == [before]
+    assert _counts(path) == before
+
+
+def test_rebuild_replaces_derived_tables(db_path, tmp_path):
+    path = str(tmp_path / "jcr.db")
+    shutil.copy(db_path, path)
+    with sqlite3.connect(path) as conn:
+        conn.execute('INSERT INTO "JCR2024" VALUES (?, ?, ?, ?, ?)', ("Epsilon Notes", 1.0, "Q3", "MATHEMATICS", None))
+    
+    written = DataSyncer(path).build_journal_records()
+    
+    assert written == 13
+    assert _counts(path)[0] == 13
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+期刊趋势文档测试
+"""
+import json
+import shutil
+import sqlite3
+
+from jcr_mcp import server
+from jcr_mcp.catalog import TRENDS_TABLE
+from jcr_mcp.database import JCRDatabase
+from jcr_mcp.trends import TREND_VERSION, build_trend, latest_partition
+
+
+def test_build_trend_picks_best_partition_per_year():
+    records = [
+        ("JCR", 2023, "Alpha", "Q3", "CHEMISTRY", None, None, 4.0, 3, 0),
+        ("JCR", 2023, "Alpha", "Q2", "PHYSICS", None, None, 4.5, 2, 0),
+        ("JCR", 2024, "Alpha", "Q1", "PHYSICS", None, None, 6.0, 1, 0),
+        ("FQBJCR", 2024, "Alpha", "2区", "物理", None, None, None, 2, 1),
+    ]
+    trend = build_trend(7, records)
+    
+    assert trend["version"] == TREND_VERSION
+    assert trend["impact_factors"] == [[2023, 4.5, None], [2024, 6.0, 1.5]]
+    # 同一年份取等级最高的分区，升降按分区等级计算
+    assert trend["partitions"]["JCR"] == [
+        [2023, "Q2", "PHYSICS", None, 2, False],
+        [2024, "Q1", "PHYSICS", 1, 1, False],
+    ]
+    # 最新分区优先取中科院分区
+    assert latest_partition(trend) == [2024, "2区", "物理", None, 2, True]
+
+
+def test_build_trend_without_records():
+    assert build_trend(1, []) is None
+
+
+def test_partition_trend_reads_synced_document(database):
+    trend = database.partition_trend("alpha journal")
+    
+    assert trend["version"] == TREND_VERSION
+    assert trend["journal_name"] == "Alpha Journal"
+    assert [entry[:2] for entry in trend["partitions"]["JCR"]] == [[2023, "Q2"], [2024, "Q1"]]
+    assert trend["partitions"]["JCR"][-1][3] == 1
+    assert trend["partitions"]["FQBJCR"] == [[2025, "1 [3/45]", "计算机科学", None, 1, True]]
+    assert database.partition_trend("No Such Journal") is None
+
+
+def test_partition_trends_many_matches_single_lookups(database):
+    journals = database.search_many(["Alpha Journal", "Beta Letters", "Delta Acta"])
+    firsts = [results[0] for results in journals.values()]
+    
+    trends = database.partition_trends_many(firsts)
+    
+    assert [trend["journal_name"] for trend in trends] == [info.journal_name for info in firsts]
+    assert trends == [database.partition_trend(info.journal_name) for info in firsts]
+    assert database.partition_trends_many([]) == []
+
+
+def test_stale_trend_documents_fall_back_to_raw_tables(db_path, tmp_path):
+    """旧版本同步生成的趋势文档（分区序列只有4列、没有版本号）不再使用，改为现场生成"""
+    stale_path = str(tmp_path / "stale.db")
+    shutil.copy(db_path, stale_path)
+    old_document = {
+        "journal_id": 1,
+        "journal_name": "Alpha Journal",
+        "years": {},
+        "impact_factors": [[2024, 12.5, None]],
+        "partitions": {"JCR": [[2024, "Q1", "COMPUTER SCIENCE", None]]},
+    }
+    with sqlite3.connect(stale_path) as conn:
+        conn.execute(f"UPDATE {TRENDS_TABLE} SET document = ?", (json.dumps(old_document),))
+    
+    database = JCRDatabase(stale_path, cache_size=0)
+    try:
+        assert not database.get_catalog().has_trends
+        trend = database.partition_trend("Alpha Journal")
+        assert trend["version"] == TREND_VERSION
+        assert trend["partitions"]["JCR"][-1] == [2024, "Q1", "COMPUTER SCIENCE", 1, 1, False]
+        
+        server.db = database
+        output = server._render_compare_journals("Alpha Journal, Beta Letters")
+        assert "Alpha Journal" in output and "Beta Letters" in output
+        assert "顶级期刊" in output
+    finally:
+        server.db = None
+        database.close()
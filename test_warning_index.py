@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+预警名单成员索引测试
+"""
+import json
+import shutil
+import sqlite3
+
+import pytest
+
+from jcr_mcp import server
+from jcr_mcp.catalog import RECORDS_TABLE
+from jcr_mcp.database import JCRDatabase
+from jcr_mcp.models import JournalInfo
+from jcr_mcp.warning_index import WarningIndex
+
+
+def test_warning_index_lookup():
+    records = [
+        JournalInfo("Gamma Reviews", warning_status="高", year="2024", journal_id=3),
+        JournalInfo("Gamma Reviews", warning_status="中", year="2023", journal_id=3),
+        JournalInfo("Omega Letters", warning_status="低", year="2023"),
+    ]
+    index = WarningIndex(
+        records,
+        issns=[("33333333", 3)],
+        aliases=[("gamma rev", 3)],
+        reasons=[(3, 2024, "论文工厂"), ("omega letters", 2023, "")],
+    )
+    
+    assert len(index) == 2
+    assert index.lookup("gamma reviews") == {2024: "高", 2023: "中"}
+    assert index.lookup("3333-3333") == {2024: "高", 2023: "中"}
+    assert index.is_warned("Gamma Rev", "latest")
+    assert not index.is_warned("Omega Letters", "latest")
+    assert index.is_warned("Omega Letters", 2023)
+    assert index.years == [2024, 2023]
+    assert index.reason_of(records[0]) == "论文工厂"
+    assert index.reason_of(records[1]) is None
+    assert index.reason_of(records[2]) is None
+    
+    page = index.search("review", limit=1)
+    assert page.total == 2 and page.journals == records[:1]
+
+
+@pytest.fixture(params=["records", "tables"])
+def warning_database(request, db_path, tmp_path):
+    """已同步的数据库，以及只有原始数据表的数据库"""
+    path = str(tmp_path / "jcr.db")
+    shutil.copy(db_path, path)
+    if request.param == "tables":
+        with sqlite3.connect(path) as conn:
+            conn.execute(f"DROP TABLE {RECORDS_TABLE}")
+    database = JCRDatabase(path, cache_size=0)
+    server.db = database
+    yield database
+    server.db = None
+    database.close()
+
+
+def test_check_warning_journals_shows_reason(warning_database):
+    text = server._render_check_warning_journals("gamma")
+    assert "Gamma Reviews: 高（原因: 论文工厂）" in text
+    
+    records = json.loads(server._render_check_warning_journals("gamma", output_format="json"))["records"]
+    assert records[0]["level"] == "高"
+    assert records[0]["reason"] == "论文工厂"